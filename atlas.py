@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Atlas des images de cartes (UI).
+
+Toutes les images PNG de DOSSIER_IMAGES sont décodées, redimensionnées à la
+taille de zone_carte (ratio conservé) et rangées dans une seule surface.
+L'atlas est sauvegardé dans DOSSIER_CACHE : en-tête JSON + pixels RGBA bruts,
+relus en une seule lecture. Il est reconstruit si une image, la liste des
+images ou la taille cible change.
+
+- au lancement : AtlasCartes(...).prechauffer() construit / recharge l'atlas
+  dans un thread, la première partie ne décode donc plus aucune image ;
+- hors ligne :
+
+    python atlas.py
+    python atlas.py --largeur 310 --hauteur 320
+"""
+
+import argparse
+import json
+import math
+import os
+import struct
+import threading
+
+import pygame
+
+from catalogue import DOSSIER_IMAGES
+
+DOSSIER_CACHE = "assets/cache/"
+
+_MAGIQUE = b"ATLS"
+_VERSION = 1
+_ENTETE = struct.Struct("<4sII")  # magique, version, taille de l'en-tête JSON
+
+
+def _sources(dossier):
+    """{chemin: [mtime_ns, taille]} des PNG du dossier, triés par nom."""
+    sources = {}
+    try:
+        noms = sorted(os.listdir(dossier))
+    except OSError:
+        return sources
+    for nom in noms:
+        if nom.lower().endswith(".png"):
+            chemin = os.path.join(dossier, nom)
+            st = os.stat(chemin)
+            sources[os.path.normpath(chemin)] = [st.st_mtime_ns, st.st_size]
+    return sources
+
+
+def _redimensionner(img, target_w, target_h):
+    """Même calcul que charger_image_carte : tenir dans la cible en gardant le ratio."""
+    iw, ih = img.get_width(), img.get_height()
+    scale = min(target_w / iw, target_h / ih)
+    return pygame.transform.smoothscale(img, (max(1, int(iw * scale)), max(1, int(ih * scale))))
+
+
+class AtlasCartes:
+    """
+    Images de cartes d'une taille cible, rangées dans une surface unique.
+    image(path) ne bloque jamais : None tant que l'atlas n'est pas prêt
+    (l'appelant retombe alors sur le chargement direct).
+    """
+    def __init__(self, taille, dossier=DOSSIER_IMAGES, dossier_cache=DOSSIER_CACHE):
+        self.taille = tuple(taille)
+        self.dossier = dossier
+        w, h = self.taille
+        self.fichier = os.path.join(dossier_cache, f"atlas_{w}x{h}.bin")
+        self.surface = None
+        self.regions = {}
+        self.pret = threading.Event()
+        self.erreur = None
+        self._sous_surfaces = None
+        self._thread = None
+
+    # -----------------------------
+    # construction
+    # -----------------------------
+
+    def construire(self):
+        """Décode et range toutes les images (sans affichage : utilisable hors ligne)."""
+        sources = _sources(self.dossier)
+        images = {}
+        for chemin in sources:
+            try:
+                img = pygame.image.load(chemin)
+            except Exception:
+                continue
+            if img.get_width() > 0 and img.get_height() > 0:
+                images[chemin] = _redimensionner(img, *self.taille)
+
+        # rangement en étagères, sur une largeur d'environ sqrt(n) cartes
+        w_max = max((i.get_width() for i in images.values()), default=1)
+        largeur = w_max * max(1, math.ceil(math.sqrt(len(images))))
+        regions = {}
+        x = y = h_ligne = 0
+        for chemin, img in sorted(images.items(), key=lambda e: -e[1].get_height()):
+            iw, ih = img.get_size()
+            if x + iw > largeur:
+                x, y, h_ligne = 0, y + h_ligne, 0
+            regions[chemin] = (x, y, iw, ih)
+            x += iw
+            h_ligne = max(h_ligne, ih)
+
+        surface = pygame.Surface((largeur, max(1, y + h_ligne)), pygame.SRCALPHA)
+        for chemin, (x, y, _, _) in regions.items():
+            surface.blit(images[chemin], (x, y))
+
+        self._publier(surface, regions)
+        return sources
+
+    def sauvegarder(self, sources):
+        entete = json.dumps({
+            "taille": list(self.taille),
+            "dimensions": list(self.surface.get_size()),
+            "sources": sources,
+            "regions": self.regions,
+        }).encode("utf-8")
+        os.makedirs(os.path.dirname(self.fichier), exist_ok=True)
+        tmp = self.fichier + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_ENTETE.pack(_MAGIQUE, _VERSION, len(entete)))
+            f.write(entete)
+            f.write(pygame.image.tobytes(self.surface, "RGBA"))
+        os.replace(tmp, self.fichier)
+
+    def recharger(self):
+        """Relit l'atlas du disque s'il correspond aux images actuelles. True si réussi."""
+        try:
+            with open(self.fichier, "rb") as f:
+                donnees = f.read()
+            magique, version, n = _ENTETE.unpack_from(donnees)
+            if magique != _MAGIQUE or version != _VERSION:
+                return False
+            debut = _ENTETE.size
+            entete = json.loads(donnees[debut:debut + n].decode("utf-8"))
+            if tuple(entete["taille"]) != self.taille or entete["sources"] != _sources(self.dossier):
+                return False
+            dims = tuple(entete["dimensions"])
+            surface = pygame.image.frombuffer(memoryview(donnees)[debut + n:], dims, "RGBA")
+        except (OSError, ValueError, KeyError, struct.error):
+            return False
+        self._publier(surface, {k: tuple(v) for k, v in entete["regions"].items()})
+        return True
+
+    def charger_ou_construire(self):
+        try:
+            if not self.recharger():
+                self.sauvegarder(self.construire())
+        except Exception as e:
+            # un cache illisible ou non inscriptible ne doit pas bloquer le jeu
+            self.erreur = e
+        finally:
+            self.pret.set()
+
+    def prechauffer(self):
+        """Lance charger_ou_construire dans un thread (une seule fois)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.charger_ou_construire, name="atlas", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def _publier(self, surface, regions):
+        self.regions = regions
+        self.surface = surface
+        self._sous_surfaces = None
+
+    # -----------------------------
+    # lecture (thread de l'UI)
+    # -----------------------------
+
+    def image(self, path):
+        """Surface de la carte `path`, ou None (atlas pas prêt / image absente)."""
+        if not self.pret.is_set() or self.surface is None:
+            return None
+        if self._sous_surfaces is None:
+            # conversion au format de l'écran : une seule fois, dans le thread de l'UI
+            if pygame.display.get_surface() is not None:
+                self.surface = self.surface.convert_alpha()
+            self._sous_surfaces = {k: self.surface.subsurface(r) for k, r in self.regions.items()}
+        return self._sous_surfaces.get(os.path.normpath(path))
+
+
+def main(argv=None):
+    from main import zone_carte
+
+    parser = argparse.ArgumentParser(description="Construit l'atlas des images de cartes")
+    parser.add_argument("--largeur", type=int, default=zone_carte.width)
+    parser.add_argument("--hauteur", type=int, default=zone_carte.height)
+    parser.add_argument("--dossier", default=DOSSIER_IMAGES)
+    args = parser.parse_args(argv)
+
+    atlas = AtlasCartes((args.largeur, args.hauteur), args.dossier)
+    sources = atlas.construire()
+    atlas.sauvegarder(sources)
+    w, h = atlas.surface.get_size()
+    print(f"{len(atlas.regions)} images -> {atlas.fichier} ({w}x{h})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Gestionnaire des sons de l'interface.
+
+- tous les sons de DOSSIER_SONS sont chargés dans un thread au lancement
+  (un son pas encore prêt est simplement ignoré : jamais d'attente dans la boucle) ;
+- lecture sur un groupe de canaux réservés (pygame.mixer.Channel), chacun avec
+  son volume : le volume des Sound partagés n'est jamais modifié ;
+- le volume global s'applique au volume de chaque canal, y compris aux sons
+  déjà en cours de lecture.
+"""
+
+import os
+import threading
+
+import pygame
+
+DOSSIER_SONS = "assets/sounds/"
+EXTENSIONS_SONS = (".wav", ".ogg")
+
+
+class GestionnaireAudio:
+    """Sons désignés par le nom de leur fichier sans extension ("click", "victory"...)."""
+    def __init__(self, dossier=DOSSIER_SONS, n_canaux=8, volume_global=0.8):
+        self.dossier = dossier
+        self.n_canaux = n_canaux
+        self.volume_global = volume_global
+        self.sons = {}
+        self.pret = threading.Event()
+        self.actif = False
+        self._canaux = []
+        self._volumes = []  # volume demandé par canal (avant le volume global)
+        self._suivant = 0
+        self._thread = None
+
+    def demarrer(self):
+        """À appeler après pygame.mixer.init : réserve les canaux et lance le préchargement."""
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), self.n_canaux))
+            pygame.mixer.set_reserved(self.n_canaux)
+            self._canaux = [pygame.mixer.Channel(i) for i in range(self.n_canaux)]
+        except Exception:
+            # pas de sortie audio : le jeu reste muet
+            self.pret.set()
+            return
+        self._volumes = [0.0] * self.n_canaux
+        self.actif = True
+        self._thread = threading.Thread(target=self._precharger, name="audio", daemon=True)
+        self._thread.start()
+
+    def _precharger(self):
+        try:
+            noms = sorted(os.listdir(self.dossier))
+        except OSError:
+            noms = []
+        for nom in noms:
+            base, ext = os.path.splitext(nom)
+            if ext.lower() in EXTENSIONS_SONS:
+                try:
+                    self.sons[base] = pygame.mixer.Sound(os.path.join(self.dossier, nom))
+                except Exception:
+                    pass
+        self.pret.set()
+
+    def _canal_libre(self):
+        """Premier canal réservé libre ; sinon on coupe le plus ancien (tourniquet)."""
+        for i in range(self.n_canaux):
+            j = (self._suivant + i) % self.n_canaux
+            if not self._canaux[j].get_busy():
+                self._suivant = (j + 1) % self.n_canaux
+                return j
+        j = self._suivant
+        self._suivant = (j + 1) % self.n_canaux
+        return j
+
+    def jouer(self, nom, volume=0.8):
+        son = self.sons.get(nom)
+        if not self.actif or son is None:
+            return
+        try:
+            i = self._canal_libre()
+            self._volumes[i] = max(0.0, min(1.0, float(volume)))
+            canal = self._canaux[i]
+            canal.set_volume(self._volumes[i] * self.volume_global)
+            canal.play(son)
+        except Exception:
+            pass
+
+    def regler_volume(self, volume_global):
+        """Nouveau volume global, appliqué aussi aux canaux en cours de lecture."""
+        self.volume_global = max(0.0, min(1.0, float(volume_global)))
+        for canal, v in zip(self._canaux, self._volumes):
+            canal.set_volume(v * self.volume_global)
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Banc d'essai : moteur objet (GameState) contre moteur vectoriel (moteur_vectoriel.py).
+
+Mesure le temps par partie de simulate() sur un seul processus, pour chaque
+paire de robots ; le moteur vectoriel joue un seul grand lot.
+
+    python bench_moteur_vectoriel.py
+    python bench_moteur_vectoriel.py --modes II --parties 1000000 --parties-objet 2000
+"""
+
+import argparse
+
+from simulation import simulate
+
+
+def mesurer(n_parties, modes, moteur, graine, repetitions):
+    """Meilleur temps moyen (µs) par partie sur `repetitions` séries."""
+    durees = [simulate(n_parties, *modes, seed=graine, processus=1, moteur=moteur)["duree_s"]
+              for _ in range(repetitions)]
+    return min(durees) / n_parties * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Moteur objet contre moteur vectoriel")
+    parser.add_argument("--modes", nargs="+", default=["AA", "IA", "II"])
+    parser.add_argument("--parties", type=int, default=100000, help="parties du moteur vectoriel")
+    parser.add_argument("--parties-objet", type=int, default=1000)
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--graine", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'robots':>8} {'objet (µs)':>12} {'vectoriel (µs)':>16} {'gain':>8}")
+    for modes in args.modes:
+        t_objet = mesurer(args.parties_objet, modes, "objet", args.graine, args.repetitions)
+        t_vect = mesurer(args.parties, modes, "vectoriel", args.graine, args.repetitions)
+        print(f"{modes[0] + '-' + modes[1]:>8} {t_objet:>12.1f} {t_vect:>16.2f} {t_objet / t_vect:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+Banc d'essai : liste Python contre Paquet (paquet.py) pour les paquets de Joueur.
+
+Mesure le motif d'une manche (pop du sommet + réinsertion aléatoire)
+sur des paquets de 10^3 à 10^6 cartes.
+
+    python bench_paquet.py
+    python bench_paquet.py --tailles 1000 1000000 --operations 50000
+"""
+
+import argparse
+import random
+import time
+
+from paquet import Paquet
+
+
+def mesurer(pile, operations, rng):
+    """Temps moyen (µs) d'un pop + insert à position aléatoire."""
+    debut = time.perf_counter()
+    for _ in range(operations):
+        carte = pile.pop()
+        pile.insert(rng.randint(0, len(pile)), carte)
+    return (time.perf_counter() - debut) / operations * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Liste contre Paquet")
+    parser.add_argument("--tailles", type=int, nargs="+", default=[10**3, 10**4, 10**5, 10**6])
+    parser.add_argument("--operations", type=int, default=20000)
+    parser.add_argument("--graine", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'cartes':>10} {'liste (µs)':>12} {'Paquet (µs)':>12} {'gain':>8}")
+    for n in args.tailles:
+        t_liste = mesurer(list(range(n)), args.operations, random.Random(args.graine))
+        t_paquet = mesurer(Paquet(range(n)), args.operations, random.Random(args.graine))
+        print(f"{n:>10} {t_liste:>12.2f} {t_paquet:>12.2f} {t_liste / t_paquet:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
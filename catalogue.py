@@ -0,0 +1,554 @@
+# -*- coding: utf-8 -*-
+"""
+Catalogue des espèces en colonnes (struct of arrays), sans dépendance.
+
+Une carte est un simple entier : son indice dans le catalogue.
+Les paquets des joueurs sont donc des listes d'entiers, faciles à copier,
+comparer, hacher et envoyer à un autre processus.
+Animaux n'est qu'une vue légère (catalogue, indice) pour l'affichage et les robots.
+
+charger_csv lit un CSV (nom, poids, longueur, longevite) en une passe et garde
+à côté un cache binaire (colonnes float64 + table des noms), relu directement
+tant que le CSV n'a changé ni de date ni de taille.
+
+Le cache est projeté en mémoire (mmap) : les colonnes sont des memoryview sur
+le fichier et les noms ne sont décodés qu'à la lecture d'une carte. Un
+catalogue d'un million d'espèces ne charge donc en RAM que les pages touchées,
+et les processus qui ouvrent le même cache partagent ces pages.
+
+SurveillantCSV recharge le CSV à chaud quand sa date ou sa taille change et
+fournit le DiffCatalogue (ajouts / retraits / modifications par nom).
+"""
+
+import csv
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from collections import namedtuple
+from collections.abc import Sequence
+
+DOSSIER_IMAGES = "assets/images/animaux/"
+
+
+class Animaux:
+    """Carte Animal : nom + 3 caractéristiques. + lien du fichier image (vue sur le catalogue)"""
+    __slots__ = ("catalogue", "index")
+
+    def __init__(self, catalogue, index):
+        self.catalogue = catalogue
+        self.index = index
+
+    @property
+    def nom(self):
+        return self.catalogue.noms[self.index]
+
+    @property
+    def poids(self):
+        return self.catalogue.poids[self.index]
+
+    @property
+    def longueur(self):
+        return self.catalogue.longueur[self.index]
+
+    @property
+    def longevite(self):
+        return self.catalogue.longevite[self.index]
+
+    @property
+    def path_image(self):
+        return self.catalogue.chemin_image(self.index)
+
+    def __eq__(self, autre):
+        return (isinstance(autre, Animaux) and self.index == autre.index
+                and self.catalogue is autre.catalogue)
+
+    def __hash__(self):
+        return hash((id(self.catalogue), self.index))
+
+    def __repr__(self):
+        return f"Animaux({self.nom!r}, #{self.index})"
+
+
+class NomsProjetes(Sequence):
+    """Noms d'un cache projeté : séquence en lecture seule, chaque nom décodé à la demande."""
+    __slots__ = ("_fins", "_blob")
+
+    def __init__(self, fins, blob):
+        self._fins = fins  # position de fin de chaque nom dans blob (les noms sont séparés par "\n")
+        self._blob = blob
+
+    def __len__(self):
+        return len(self._fins)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("indice de nom hors limites")
+        fin = self._fins[i]
+        debut = self._fins[i - 1] + 1 if i else 0
+        return str(self._blob[debut:fin], "utf-8")
+
+
+def _colonne(valeurs):
+    """Colonne float64 : un array("d") ou une memoryview "d" est gardé tel quel (pas de copie)."""
+    if isinstance(valeurs, memoryview) and valeurs.format == "d":
+        return valeurs
+    if isinstance(valeurs, array) and valeurs.typecode == "d":
+        return valeurs
+    return array("d", valeurs)
+
+
+class Catalogue:
+    """
+    Colonnes : noms, poids, longueur, longevite (+ images optionnelles,
+    sinon le chemin est déduit du nom). Un catalogue n'est jamais modifié :
+    un rechargement crée un nouveau catalogue. Les colonnes peuvent être
+    des memoryview sur un cache projeté en mémoire (cf. charger_csv).
+    """
+    def __init__(self, noms, poids, longueur, longevite, images=None):
+        self.noms = noms if isinstance(noms, NomsProjetes) else list(noms)
+        self.poids = _colonne(poids)
+        self.longueur = _colonne(longueur)
+        self.longevite = _colonne(longevite)
+        self.images = list(images) if images is not None else None
+        self._domaines = {}
+        # catalogue projeté : (chemin du CSV, mtime_ns, taille) du CSV dont il lit le cache
+        self.source = None
+
+        n = len(self.noms)
+        if not (len(self.poids) == len(self.longueur) == len(self.longevite) == n):
+            raise ValueError("Colonnes du catalogue de tailles différentes")
+
+    @classmethod
+    def depuis_lignes(cls, lignes):
+        """Construit un catalogue depuis des tuples (nom, poids, longueur, longevite)."""
+        noms, poids, longueur, longevite = [], [], [], []
+        for nom, p, l, v in lignes:
+            noms.append(nom)
+            poids.append(p)
+            longueur.append(l)
+            longevite.append(v)
+        return cls(noms, poids, longueur, longevite)
+
+    @property
+    def projete(self):
+        """True si les colonnes sont lues directement dans le fichier cache (mmap)."""
+        return isinstance(self.poids, memoryview)
+
+    def __reduce__(self):
+        # une memoryview ne se sérialise pas : on envoie des colonnes ordinaires
+        colonnes = [array("d", c) for c in (self.poids, self.longueur, self.longevite)]
+        return Catalogue, (list(self.noms), *colonnes, self.images)
+
+    def __len__(self):
+        return len(self.noms)
+
+    def __getitem__(self, i):
+        if not -len(self) <= i < len(self):
+            raise IndexError("carte hors du catalogue")
+        return Animaux(self, i % len(self))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield Animaux(self, i)
+
+    def colonne(self, caracteristique):
+        """Colonne des valeurs d'une caractéristique ("poids", "longueur", "longevite")."""
+        return getattr(self, caracteristique)
+
+    def _domaine(self, caracteristique):
+        domaine = self._domaines.get(caracteristique)
+        if domaine is None:
+            comptes = {}
+            for v in self.colonne(caracteristique):
+                comptes[v] = comptes.get(v, 0) + 1
+            valeurs = array("d", sorted(comptes))
+            domaine = self._domaines[caracteristique] = (valeurs, array("Q", (comptes[v] for v in valeurs)))
+        return domaine
+
+    def valeurs_triees(self, caracteristique):
+        """Valeurs distinctes triées d'une caractéristique (calculées une fois par catalogue)."""
+        return self._domaine(caracteristique)[0]
+
+    def comptes_valeurs(self, caracteristique):
+        """Nombre de cartes ayant chaque valeur de valeurs_triees(caracteristique)."""
+        return self._domaine(caracteristique)[1]
+
+    def chemin_image(self, i):
+        if self.images is not None:
+            return self.images[i]
+        return DOSSIER_IMAGES + self.noms[i] + ".png"
+
+
+# ============================================================
+# ================= CHARGEMENT CSV + CACHE ===================
+# ============================================================
+
+COLONNES_CSV = ("nom", "poids", "longueur", "longevite")
+DELIMITEURS_CSV = (";", ",", "\t")
+
+# magique, version, n, mtime_ns du CSV, taille du CSV, lignes lues, lignes rejetées
+_ENTETE_CACHE = struct.Struct("<4sIQqQQQ")
+_MAGIQUE_CACHE = b"CATA"
+_VERSION_CACHE = 1
+# ce que _lire_cache compare d'un os.stat du CSV
+_SignatureCSV = namedtuple("_SignatureCSV", "st_mtime_ns st_size")
+
+
+class RapportChargement:
+    """Bilan d'un chargement : lignes lues, acceptées, rejetées (par motif + exemples)."""
+    MAX_EXEMPLES = 20
+
+    def __init__(self, chemin):
+        self.chemin = str(chemin)
+        self.delimiteur = None
+        self.depuis_cache = False
+        self.lignes_lues = 0
+        self.acceptees = 0
+        self.rejets = {}    # motif -> nombre
+        self.exemples = []  # (numéro de ligne, motif), les premiers seulement
+
+    @property
+    def rejetees(self):
+        return sum(self.rejets.values())
+
+    def rejeter(self, numero, motif):
+        self.rejets[motif] = self.rejets.get(motif, 0) + 1
+        if len(self.exemples) < self.MAX_EXEMPLES:
+            self.exemples.append((numero, motif))
+
+    def __str__(self):
+        source = "cache" if self.depuis_cache else f"délimiteur {self.delimiteur!r}"
+        texte = f"{self.chemin} ({source}) : {self.acceptees}/{self.lignes_lues} lignes acceptées"
+        if self.rejets:
+            detail = ", ".join(f"{motif} : {n}" for motif, n in sorted(self.rejets.items()))
+            texte += f", {self.rejetees} rejetées ({detail})"
+        return texte
+
+
+def _nombre(texte):
+    try:
+        return float(texte)
+    except ValueError:
+        # virgule décimale (export tableur français)
+        return float(texte.strip().replace(",", "."))
+
+
+def _detecter_delimiteur(entete):
+    """Premier délimiteur qui donne toutes les colonnes attendues dans l'en-tête."""
+    for delim in DELIMITEURS_CSV:
+        champs = [c.strip().lower() for c in next(csv.reader([entete], delimiter=delim))]
+        if all(c in champs for c in COLONNES_CSV):
+            return delim, [champs.index(c) for c in COLONNES_CSV]
+    return None, None
+
+
+def _lire_csv(chemin, rapport):
+    """Lecture en flux du CSV ; renvoie les 4 colonnes (noms, poids, longueur, longevite)."""
+    noms, poids, longueur, longevite = [], array("d"), array("d"), array("d")
+    with open(chemin, encoding="utf-8-sig", newline="") as f:
+        entete = f.readline()
+        delim, indices = _detecter_delimiteur(entete)
+        if delim is None:
+            rapport.rejeter(1, "en-tête sans nom;poids;longueur;longevite")
+            return noms, poids, longueur, longevite
+        rapport.delimiteur = delim
+        i_nom, i_poids, i_longueur, i_longevite = indices
+        n_min = max(indices) + 1
+
+        for numero, ligne in enumerate(csv.reader(f, delimiter=delim), start=2):
+            if not ligne or not any(c.strip() for c in ligne):
+                continue  # ligne vide
+            rapport.lignes_lues += 1
+            if len(ligne) < n_min:
+                rapport.rejeter(numero, "colonnes manquantes")
+                continue
+            nom = ligne[i_nom].strip()
+            if not nom:
+                rapport.rejeter(numero, "nom vide")
+                continue
+            try:
+                p, l, v = _nombre(ligne[i_poids]), _nombre(ligne[i_longueur]), _nombre(ligne[i_longevite])
+            except ValueError:
+                rapport.rejeter(numero, "valeur non numérique")
+                continue
+            noms.append(nom)
+            poids.append(p)
+            longueur.append(l)
+            longevite.append(v)
+    rapport.acceptees = len(noms)
+    return noms, poids, longueur, longevite
+
+
+def chemin_cache(chemin_csv):
+    return str(chemin_csv) + ".bin"
+
+
+def _ecrire_cache(chemin, st, rapport, noms, poids, longueur, longevite):
+    """
+    Écrit le cache dans un fichier temporaire propre à cet appel, puis le renomme.
+    Renvoie False (cache non écrit, fichier temporaire supprimé) si l'écriture ou le
+    renommage échoue : dossier en lecture seule, disque plein, cible verrouillée...
+    """
+    blob = "\n".join(noms).encode("utf-8")
+    fins = array("Q")
+    pos = 0
+    for nom in noms:
+        pos += len(nom.encode("utf-8"))
+        fins.append(pos)
+        pos += 1  # séparateur
+    dossier, nom = os.path.split(chemin)
+    tmp = None
+    ecrit = False
+    try:
+        # nom unique : deux processus qui réécrivent le même cache ne se marchent pas dessus
+        with tempfile.NamedTemporaryFile("wb", dir=dossier or ".", prefix=nom + ".",
+                                         suffix=".tmp", delete=False) as f:
+            tmp = f.name
+            f.write(_ENTETE_CACHE.pack(_MAGIQUE_CACHE, _VERSION_CACHE, len(noms), st.st_mtime_ns,
+                                       st.st_size, rapport.lignes_lues, rapport.rejetees))
+            for colonne in (poids, longueur, longevite):
+                if sys.byteorder != "little":
+                    colonne = array("d", colonne)
+                    colonne.byteswap()
+                f.write(colonne.tobytes())
+            f.write(fins.tobytes())
+            f.write(blob)
+        os.replace(tmp, chemin)
+        ecrit = True
+    except OSError:
+        pass
+    finally:
+        if tmp is not None and not ecrit:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+    return ecrit
+
+
+def _lire_cache(chemin, st, projeter=True):
+    """
+    Colonnes du cache, ou None s'il est absent, d'un autre format ou périmé.
+    Avec projeter=True (machine petit-boutiste), le fichier est projeté en mémoire
+    au lieu d'être lu : colonnes en memoryview, noms en NomsProjetes.
+    """
+    projeter = projeter and sys.byteorder == "little"
+    try:
+        with open(chemin, "rb") as f:
+            donnees = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if projeter else f.read()
+        magique, version, n, mtime_ns, taille, lues, rejetees = _ENTETE_CACHE.unpack_from(donnees)
+    except (OSError, ValueError, struct.error):
+        return None
+    if (magique, version, mtime_ns, taille) != (_MAGIQUE_CACHE, _VERSION_CACHE, st.st_mtime_ns, st.st_size):
+        return None
+    if len(donnees) < _ENTETE_CACHE.size + 32 * n:
+        return None  # fichier tronqué
+
+    # l'en-tête fait 48 octets : les colonnes restent alignées sur 8 octets
+    vue = memoryview(donnees)
+    pos = _ENTETE_CACHE.size
+    colonnes = []
+    for code in ("d", "d", "d", "Q"):
+        tranche = vue[pos:pos + 8 * n]
+        if projeter:
+            colonne = tranche.cast(code)
+        else:
+            colonne = array(code)
+            colonne.frombytes(tranche)
+            if sys.byteorder != "little":
+                colonne.byteswap()
+        colonnes.append(colonne)
+        pos += 8 * n
+    *colonnes, fins = colonnes
+    blob = vue[pos:]
+
+    if projeter:
+        noms = NomsProjetes(fins, blob)
+    else:
+        noms = str(blob, "utf-8").split("\n") if n else []
+        if len(noms) != n:
+            # un nom contient un saut de ligne : découpage par les positions de fin
+            debuts = [0] + [fin + 1 for fin in fins[:-1]]
+            noms = [str(blob[d:fin], "utf-8") for d, fin in zip(debuts, fins)]
+    return (noms, *colonnes), lues, rejetees
+
+
+def charger_csv(chemin_csv, cache=True, projeter=True):
+    """
+    Charge un Catalogue depuis un CSV (en-tête nom, poids, longueur, longevite ;
+    délimiteur ';', ',' ou tabulation détecté sur l'en-tête ; virgule décimale acceptée).
+    Renvoie (catalogue ou None si le fichier est absent / illisible, RapportChargement).
+    Avec cache=True, le cache binaire voisin est relu s'il est à jour, sinon réécrit ;
+    avec projeter=True, le catalogue renvoyé lit ses colonnes dans ce cache (mmap).
+    """
+    rapport = RapportChargement(chemin_csv)
+    try:
+        st = os.stat(chemin_csv)
+    except OSError:
+        return None, rapport
+
+    fichier_cache = chemin_cache(chemin_csv)
+    if cache:
+        lu = _lire_cache(fichier_cache, st, projeter)
+        if lu is not None:
+            colonnes, rapport.lignes_lues, n_rejets = lu
+            rapport.depuis_cache = True
+            rapport.acceptees = len(colonnes[0])
+            if n_rejets:
+                rapport.rejets["voir le CSV"] = n_rejets
+            return _catalogue_lu(colonnes, chemin_csv, st), rapport
+
+    try:
+        colonnes = _lire_csv(chemin_csv, rapport)
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        rapport.rejeter(0, f"fichier illisible ({e.__class__.__name__})")
+        return None, rapport
+
+    # cache non écrit (dossier en lecture seule...) : on relira le CSV la prochaine fois
+    if cache and colonnes[0] and _ecrire_cache(fichier_cache, st, rapport, *colonnes):
+        lu = _lire_cache(fichier_cache, st, projeter) if projeter else None
+        if lu is not None:
+            # le cache tout juste écrit remplace les colonnes lues (pages partagées)
+            return _catalogue_lu(lu[0], chemin_csv, st), rapport
+    return Catalogue(*colonnes), rapport
+
+
+def _catalogue_lu(colonnes, chemin_csv, st):
+    catalogue = Catalogue(*colonnes)
+    if catalogue.projete:
+        catalogue.source = (str(chemin_csv), st.st_mtime_ns, st.st_size)
+    return catalogue
+
+
+def projeter_cache(source):
+    """
+    Catalogue.source -> catalogue projeté sur le même cache, sans relire le CSV
+    (autre processus : pages partagées plutôt qu'une copie sérialisée).
+    None si le cache a été remplacé ou supprimé depuis.
+    """
+    chemin_csv, mtime_ns, taille = source
+    st = _SignatureCSV(mtime_ns, taille)
+    lu = _lire_cache(chemin_cache(chemin_csv), st)
+    return _catalogue_lu(lu[0], chemin_csv, st) if lu is not None else None
+
+
+# ============================================================
+# ================= RECHARGEMENT À CHAUD =====================
+# ============================================================
+
+class DiffCatalogue:
+    """Différences entre deux catalogues, par nom d'espèce."""
+    def __init__(self, ajoutes, retires, modifies, chemins_images):
+        self.ajoutes = ajoutes
+        self.retires = retires
+        self.modifies = modifies  # même nom, caractéristiques différentes
+        self.chemins_images = chemins_images  # images des espèces concernées
+
+    def __bool__(self):
+        return bool(self.ajoutes or self.retires or self.modifies)
+
+    def __str__(self):
+        return f"{len(self.ajoutes)} ajoutées, {len(self.retires)} retirées, {len(self.modifies)} modifiées"
+
+
+def comparer_catalogues(ancien, nouveau):
+    """DiffCatalogue de ancien vers nouveau (un nom en double : la dernière ligne compte)."""
+    def index(catalogue):
+        lignes = zip(catalogue.noms, catalogue.poids, catalogue.longueur, catalogue.longevite)
+        return {nom: (i, (p, l, v)) for i, (nom, p, l, v) in enumerate(lignes)}
+
+    avant, apres = index(ancien), index(nouveau)
+    ajoutes = [nom for nom in apres if nom not in avant]
+    retires = [nom for nom in avant if nom not in apres]
+    modifies = [nom for nom, (_, valeurs) in apres.items() if nom in avant and avant[nom][1] != valeurs]
+
+    chemins = {ancien.chemin_image(avant[nom][0]) for nom in retires + modifies}
+    chemins.update(nouveau.chemin_image(apres[nom][0]) for nom in ajoutes + modifies)
+    return DiffCatalogue(ajoutes, retires, modifies, chemins)
+
+
+def _signature(chemin):
+    try:
+        st = os.stat(chemin)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class SurveillantCSV:
+    """
+    Surveille un CSV par scrutation (date + taille, au plus une fois par période)
+    et le recharge quand il change. Un fichier supprimé, illisible ou vide est
+    ignoré : le dernier catalogue valide reste en place.
+
+    - sans thread : verifier() fait la scrutation elle-même ;
+    - avec demarrer() : un thread scrute et recharge, verifier() ne fait que
+      récupérer le résultat (aucune lecture de fichier dans la boucle de l'UI).
+    """
+    def __init__(self, chemin, catalogue, periode=1.0, horloge=time.monotonic):
+        self.chemin = str(chemin)
+        self.periode = periode
+        self.horloge = horloge
+        self.rapport = None  # RapportChargement du dernier rechargement
+        self._signature = _signature(self.chemin)
+        self._prochaine = horloge() + periode
+        self._publie = catalogue  # catalogue déjà remis à l'appelant
+        self._attente = None      # (catalogue, rapport, diff) pas encore récupéré
+        self._verrou = threading.Lock()
+        self._arret = threading.Event()
+        self._thread = None
+
+    def _recharger_si_modifie(self):
+        signature = _signature(self.chemin)
+        if signature is None or signature == self._signature:
+            return
+        self._signature = signature
+        catalogue, rapport = charger_csv(self.chemin)
+        self.rapport = rapport
+        if not catalogue:
+            return  # fichier en cours d'écriture ou vidé : on garde l'actuel
+        while True:
+            with self._verrou:
+                base = self._publie
+            diff = comparer_catalogues(base, catalogue)
+            with self._verrou:
+                if self._publie is base:  # sinon verifier() est passé entre-temps : on recompare
+                    self._attente = (catalogue, rapport, diff) if diff else None
+                    return
+
+    def verifier(self):
+        """(nouveau catalogue, rapport, DiffCatalogue) si le CSV a changé, sinon None."""
+        if self._thread is None and self.horloge() >= self._prochaine:
+            self._prochaine = self.horloge() + self.periode
+            self._recharger_si_modifie()
+        with self._verrou:
+            resultat, self._attente = self._attente, None
+            if resultat is not None:
+                self._publie = resultat[0]
+        return resultat
+
+    def _boucle(self):
+        while not self._arret.wait(self.periode):
+            try:
+                self._recharger_si_modifie()
+            except Exception:
+                pass  # une erreur de lecture ne doit pas arrêter la surveillance
+
+    def demarrer(self):
+        """Lance la scrutation dans un thread (une seule fois)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._boucle, name="surveillance-csv", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def arreter(self):
+        self._arret.set()
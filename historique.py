@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Historique compact des manches (moteur, sans dépendance).
+
+Chaque manche tient sur 10 octets : indices des deux cartes jouées,
+code de la caractéristique et un octet de drapeaux (joueur actif, gagnant).
+Les valeurs et les noms sont retrouvés à la lecture.
+
+- retention=None : tout est gardé en mémoire (tableaux en ajout seul) ;
+- retention=N : tampon circulaire des N dernières manches ;
+- fichier=... : les manches qui sortent du tampon sont écrites sur disque,
+  ce qui garde un replay complet (rejouer()) sans tout garder en RAM.
+"""
+
+import struct
+from array import array
+
+_ENREGISTREMENT = struct.Struct("<iiBB")
+BLOC_REJEU = 4096  # manches lues à la fois dans le fichier de débordement
+
+
+class HistoriqueManches:
+    """
+    Historique des manches d'une partie.
+    len() = nombre total de manches jouées ; h[i] / h[-5:] renvoient des dicts
+    (actif, passif, carac, v_actif, v_passif, gagnant) pour les manches encore en mémoire.
+    """
+    def __init__(self, noms, cartes, caracteristiques, retention=None, fichier=None):
+        self.noms = tuple(noms)
+        self.cartes = cartes
+        self.caracteristiques = tuple(caracteristiques)
+        self.retention = retention
+        self.fichier = fichier
+        self._flux = None
+        self._mode_fichier = "wb"
+        self.total = 0
+
+        taille = 0 if retention is None else max(0, int(retention))
+        self.carte_actif = array("i", [0] * taille)
+        self.carte_passif = array("i", [0] * taille)
+        self.carac = array("B", [0] * taille)
+        # bit 0 : index du joueur actif, bit 1 : index du gagnant
+        self.drapeaux = array("B", [0] * taille)
+
+    def __len__(self):
+        return self.total
+
+    # -----------------------------
+    # écriture
+    # -----------------------------
+
+    def ajouter(self, i_carte_actif, i_carte_passif, i_carac, i_actif, i_gagnant):
+        drapeaux = i_actif | (i_gagnant << 1)
+
+        if self.retention is None:
+            self.carte_actif.append(i_carte_actif)
+            self.carte_passif.append(i_carte_passif)
+            self.carac.append(i_carac)
+            self.drapeaux.append(drapeaux)
+            self.total += 1
+            return
+
+        taille = len(self.carac)
+        if taille:
+            pos = self.total % taille
+            if self.total >= taille and self.fichier is not None:
+                self._deverser(pos)
+            self.carte_actif[pos] = i_carte_actif
+            self.carte_passif[pos] = i_carte_passif
+            self.carac[pos] = i_carac
+            self.drapeaux[pos] = drapeaux
+        elif self.fichier is not None:
+            self._ecrire(i_carte_actif, i_carte_passif, i_carac, drapeaux)
+        self.total += 1
+
+    def _deverser(self, pos):
+        self._ecrire(self.carte_actif[pos], self.carte_passif[pos], self.carac[pos], self.drapeaux[pos])
+
+    def _ecrire(self, ia, ip, c, d):
+        if self._flux is None:
+            # premier débordement : le fichier est recréé, ensuite on ajoute
+            self._flux = open(self.fichier, self._mode_fichier)
+            self._mode_fichier = "ab"
+        self._flux.write(_ENREGISTREMENT.pack(ia, ip, c, d))
+
+    def fermer(self):
+        if self._flux is not None:
+            self._flux.close()
+            self._flux = None
+
+    # -----------------------------
+    # lecture
+    # -----------------------------
+
+    def retenues(self):
+        """Nombre de manches encore en mémoire."""
+        if self.retention is None:
+            return self.total
+        return min(self.total, len(self.carac))
+
+    def brut(self, i):
+        """Manche i (index absolu) : (carte actif, carte passif, carac, actif, gagnant)."""
+        if i < 0:
+            i += self.total
+        if not (self.total - self.retenues() <= i < self.total):
+            raise IndexError("manche hors de l'historique en mémoire")
+        pos = i if self.retention is None else i % len(self.carac)
+        d = self.drapeaux[pos]
+        return self.carte_actif[pos], self.carte_passif[pos], self.carac[pos], d & 1, d >> 1
+
+    def _entree(self, ia, ip, c, a, g):
+        carac = self.caracteristiques[c]
+        return {
+            "actif": self.noms[a],
+            "passif": self.noms[1 - a],
+            "carac": carac,
+            "v_actif": getattr(self.cartes[ia], carac),
+            "v_passif": getattr(self.cartes[ip], carac),
+            "gagnant": self.noms[g],
+        }
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            debut = self.total - self.retenues()
+            return [self._entree(*self.brut(k)) for k in range(*i.indices(self.total)) if k >= debut]
+        return self._entree(*self.brut(i))
+
+    def __iter__(self):
+        debut = self.total - self.retenues()
+        for k in range(debut, self.total):
+            yield self._entree(*self.brut(k))
+
+    def rejouer(self):
+        """
+        Toutes les manches depuis le début : fichier de débordement (lu par blocs
+        de BLOC_REJEU manches, la mémoire ne dépend pas de sa taille) puis mémoire.
+        """
+        debut = self.total - self.retenues()
+        if debut and self.fichier is not None:
+            if self._flux is not None:
+                self._flux.flush()
+            with open(self.fichier, "rb") as f:
+                reste = debut
+                while reste:
+                    donnees = f.read(min(reste, BLOC_REJEU) * _ENREGISTREMENT.size)
+                    if not donnees:
+                        break
+                    reste -= len(donnees) // _ENREGISTREMENT.size
+                    for ia, ip, c, d in _ENREGISTREMENT.iter_unpack(donnees):
+                        yield self._entree(ia, ip, c, d & 1, d >> 1)
+        yield from self
+
+    def __getstate__(self):
+        # une copie (pickle) garde le tampon en mémoire mais n'écrit pas
+        # dans le fichier de l'original
+        etat = self.__dict__.copy()
+        etat["_flux"] = None
+        etat["fichier"] = None
+        return etat
@@ -8,326 +8,29 @@ Architecture :
 - Le "cerveau" (règles) est séparé de l'interface Pygame.
 - L'UI affiche l'état du jeu et traduit les clics en actions.
 - Cela rend le projet plus robuste et facile à faire évoluer (sons, animations, etc.).
+- Le moteur est dans moteur.py (sans Pygame) ; ce fichier ne contient que l'UI.
+- Rien n'est initialisé à l'import : la fenêtre s'ouvre dans main().
 """
 
+import os
 import pygame
 import sys
-import random
-import numpy as np
-
-# AJOUT (cerveau / données) : CSV animaux
-import csv
-from pathlib import Path
-
-pygame.init()
-
-# ============================================================
-# ======================= CERVEAU DU JEU ======================
-# ============================================================
-
-class Animaux:
-    """Carte Animal : nom + 3 caractéristiques. + lien du fichier image"""
-    def __init__(self, nom, poids, longueur, longevite):
-        self.nom = nom
-        self.poids = poids
-        self.longueur = longueur
-        self.longevite = longevite
-        self.path_image = "assets/images/animaux/" + self.nom + ".png"
-
-
-class Joueur:
-    """Joueur : nom + pile de cartes (la carte visible est la dernière)."""
-    def __init__(self, nom, cartes):
-        self.nom = nom
-        self.cartes = cartes
-
-    def carte_visible(self):
-        # Sécurité : évite tout crash si le joueur n'a plus de cartes
-        if not self.cartes:
-            return None
-        return self.cartes[-1]
-
-    def enlever_carte(self):
-        return self.cartes.pop()
-
-    def ajouter_carte(self, carte):
-        # Réinsertion aléatoire
-        self.cartes.insert(random.randint(0, len(self.cartes)), carte)
-
-    def est_vaincu(self):
-        return len(self.cartes) == 0
-
-
-def distribuer_cartes(liste):
-    """Mélange puis distribue la moitié des cartes à chaque joueur."""
-    cartes = liste.copy()
-    random.shuffle(cartes)
-    milieu = len(cartes) // 2
-    return cartes[:milieu], cartes[milieu:]
-
-
-def choix_robot_aleatoire():
-    """Robot A : choix d'une caractéristique au hasard."""
-    return random.choice(["poids", "longueur", "longevite"])
-
-
-def choix_robot_intelligent(carte, historique):
-    """
-    Robot I : compare sa carte à une valeur de référence (médiane) issue
-    des cartes déjà jouées, et choisit la caractéristique la plus "forte" relativement.
-    """
-    if not historique:
-        return choix_robot_aleatoire()
-
-    poids_m = np.median([c.poids for c in historique])
-    longueur_m = np.median([c.longueur for c in historique])
-    longevite_m = np.median([c.longevite for c in historique])
-
-    scores = {
-        "poids": carte.poids / poids_m if poids_m > 0 else 0,
-        "longueur": carte.longueur / longueur_m if longueur_m > 0 else 0,
-        "longevite": carte.longevite / longevite_m if longevite_m > 0 else 0
-    }
-    return max(scores, key=scores.get)
-
-
-class GameState:
-    """
-    Moteur du jeu (aucun affichage ici).
-
-    Règles :
-    - Deux joueurs possèdent chacun un ensemble de cartes (Animal).
-    - À chaque manche, le joueur actif choisit une caractéristique.
-    - La valeur strictement la plus élevée gagne la manche.
-    - En cas d'égalité, le joueur actif perd (règle strict >).
-    - Le gagnant récupère la carte adverse et les cartes sont réinsérées aléatoirement.
-    - La partie se termine lorsqu'un joueur n'a plus de cartes.
-
-    Invariant :
-    - Aucune carte ne doit être perdue ou dupliquée (vérification interne).
-    """
-    def __init__(self, joueur1, joueur2, mode_robot=None):
-        self.joueurs = [joueur1, joueur2]
-        self.joueur_actif = joueur1
-        self.joueur_passif = joueur2
-
-        # None (PVP), "A" (robot aléatoire), "I" (robot intelligent)
-        self.mode_robot = mode_robot
-
-        self.historique_cartes = []
-        self.cartes_initiales = joueur1.cartes + joueur2.cartes
-
-        self.terminee = False
-        self.gagnant = None
-
-        # infos de manche (pour UI)
-        self.derniere_carac = None
-        self.derniere_val_actif = None
-        self.derniere_val_passif = None
-        self.dernier_gagnant = None
-
-        # AJOUT : historique des manches (moteur)
-        # Chaque entrée: dict(actif, passif, carac, v_actif, v_passif, gagnant)
-        self.historique_manches = []
-
-    def actif_est_robot(self):
-        return self.mode_robot is not None and self.joueur_actif.nom == "Robot"
-
-    def appliquer_manche(self, caracteristique):
-        if self.terminee:
-            return
-
-        carte_active = self.joueur_actif.carte_visible()
-        carte_adverse = self.joueur_passif.carte_visible()
-
-        # sécurité
-        if carte_active is None or carte_adverse is None:
-            return
-
-        v1 = getattr(carte_active, caracteristique)
-        v2 = getattr(carte_adverse, caracteristique)
-
-        # règle : strictement supérieur pour gagner, sinon actif perd
-        if v1 > v2:
-            gagnant, perdant = self.joueur_actif, self.joueur_passif
-        else:
-            gagnant, perdant = self.joueur_passif, self.joueur_actif
-
-        # transfert + réinsertion aléatoire
-        carte_perdue = perdant.enlever_carte()
-        gagnant.ajouter_carte(carte_perdue)
-
-        carte_jouee = gagnant.enlever_carte()
-        gagnant.ajouter_carte(carte_jouee)
-
-        self.historique_cartes.extend([carte_active, carte_adverse])
-        self._verifier_invariants()
-
-        self.derniere_carac = caracteristique
-        self.derniere_val_actif = v1
-        self.derniere_val_passif = v2
-        self.dernier_gagnant = gagnant
-
-        # AJOUT : log de manche (avant le swap de tour)
-        try:
-            self.historique_manches.append({
-                "actif": self.joueur_actif.nom,
-                "passif": self.joueur_passif.nom,
-                "carac": caracteristique,
-                "v_actif": v1,
-                "v_passif": v2,
-                "gagnant": gagnant.nom
-            })
-        except Exception:
-            pass
-
-        if perdant.est_vaincu():
-            self.terminee = True
-            self.gagnant = gagnant
-            return
-
-        # on change le tour du joueur
-        self.joueur_actif, self.joueur_passif = self.joueur_passif, self.joueur_actif
-
-    def _verifier_invariants(self):
-        toutes = []
-        for j in self.joueurs:
-            toutes.extend(j.cartes)
-
-        assert len(toutes) == len(self.cartes_initiales), "ERREUR: nombre total de cartes a changé"
-        assert len(set(id(c) for c in toutes)) == len(toutes), "ERREUR: duplication de cartes détectée"
-        assert set(id(c) for c in toutes) == set(id(c) for c in self.cartes_initiales), (
-            "ERREUR: carte disparue ou carte inconnue apparue"
-        )
-
-
-# -------------------------------------------------------------------
-# AJOUT (cerveau / données) : chargement CSV robuste + fallback
-# -------------------------------------------------------------------
-
-def _trouver_racine_projet():
-    """
-    Retourne un Path de base pour retrouver /data même si on exécute depuis ailleurs.
-    - si __file__ existe : dossier du script
-    - sinon : dossier courant
-    """
-    try:
-        return Path(__file__).resolve().parent
-    except Exception:
-        return Path.cwd()
-
-
-def charger_animaux_csv(path_csv):
-    """
-    Charge des animaux depuis un CSV.
-    - Supporte délimiteur ';' ou ',' (auto: essaie ';' puis ',').
-    - Supporte en-tête: nom, poids, longueur, longevite.
-    - Ignore les lignes invalides (robustesse).
-    Retourne une liste (peut être vide si échec).
-    """
-    p = Path(path_csv)
-    if not p.exists():
-        return []
-
-    try:
-        contenu = p.read_text(encoding="utf-8").splitlines()
-    except Exception:
-        return []
-
-    if not contenu:
-        return []
-
-    def _parse_with_delim(delim):
-        animaux = []
-        try:
-            reader = csv.DictReader(contenu, delimiter=delim)
-        except Exception:
-            return []
-
-        champs = set([c.strip().lower() for c in (reader.fieldnames or [])])
-        attendus = {"nom", "poids", "longueur", "longevite"}
-        if not attendus.issubset(champs):
-            return []
-
-        for row in reader:
-            try:
-                nom = (row.get("nom") or "").strip()
-                if not nom:
-                    continue
-                poids = float(str(row.get("poids")).replace(",", "."))
-                longueur = float(str(row.get("longueur")).replace(",", "."))
-                longevite = float(str(row.get("longevite")).replace(",", "."))
-                animaux.append(Animaux(nom, poids, longueur, longevite))
-            except Exception:
-                continue
-
-        return animaux
-
-    animaux = _parse_with_delim(";")
-    if animaux:
-        return animaux
-
-    animaux = _parse_with_delim(",")
-    return animaux
-
-
-LISTE_ANIMAUX = [
-    Animaux("aigle_royal", 4.8, 84, 25),
-    Animaux("cobra_royal", 10, 400, 22),
-    Animaux("corail_rouge", 2, 40, 60),
-    Animaux("dragon_de_komodo", 165, 310, 53),
-    Animaux("elephant_d_afrique", 5000, 600, 65),
-    Animaux("lion_d_afrique", 189, 210, 18),
-    Animaux("loup_rouge", 25, 110, 13),
-    Animaux("merou_golfe", 90, 198, 48),
-    Animaux("panda_geant", 97, 170, 22),
-    Animaux("panda_roux", 5, 57, 10),
-    Animaux("protee_anguillard", 0.02, 25, 69),
-    Animaux("raie_manta", 1500, 550, 19),
-    Animaux("requin_marteau_halicorne", 152, 330, 35),
-    Animaux("tapir", 200, 212, 30),
-    Animaux("tigre_de_siberie", 300, 230, 17),
-    Animaux("tortue_verte", 175, 100, 70),
-]
-
-_RACINE = _trouver_racine_projet()
-_CSV_PATH = _RACINE / "data" / "animaux.csv"
-_animaux_csv = charger_animaux_csv(_CSV_PATH)
-if _animaux_csv:
-    LISTE_ANIMAUX = _animaux_csv
-
-
-def creer_partie(mode, prenom="Humain"):
-    c1, c2 = distribuer_cartes(LISTE_ANIMAUX)
-
-    if mode == "PVP":
-        j1 = Joueur("Joueur 1", c1)
-        j2 = Joueur("Joueur 2", c2)
-        return GameState(j1, j2, mode_robot=None)
-
-    nom_humain = prenom.strip() if prenom.strip() else "Humain"
-
-    if mode == "RA":
-        humain = Joueur(nom_humain, c1)
-        robot = Joueur("Robot", c2)
-        return GameState(humain, robot, mode_robot="A")
-
-    if mode == "RI":
-        humain = Joueur(nom_humain, c1)
-        robot = Joueur("Robot", c2)
-        return GameState(humain, robot, mode_robot="I")
-
-    raise ValueError("Mode inconnu")
+from collections import OrderedDict
 
+from atlas import AtlasCartes
+from audio import GestionnaireAudio
+from monte_carlo import BUDGET_UI_S, RobotMonteCarlo
+from moteur import SURVEILLANT_CSV, choix_robot, creer_partie, recharger_catalogue
+from profileur import Profileur
+from rendu import CacheImages, CacheTextes, DecoupeLignes, MesureImages, ZonesModifiees
 
 # ============================================================
 # ======================= PYGAME / UI =========================
 # ============================================================
 
-# Fenêtre
+# Fenêtre (créée dans main)
 LARGEUR, HAUTEUR = 900, 600
-fenetre = pygame.display.set_mode((LARGEUR, HAUTEUR))
-pygame.display.set_caption("Défi Nature")
+fenetre = None
 
 # Couleurs
 FOND = (30, 34, 40)
@@ -339,11 +42,12 @@ BOUTON_ACTIF = (242, 201, 76)
 BLANC = (245, 245, 245)
 NOIR = (26, 26, 26)
 
-# Polices
-police_titre = pygame.font.SysFont("arial", 44, bold=True)
-police = pygame.font.SysFont("arial", 22)
-police_menu = pygame.font.SysFont("arial", 30, bold=True)
-police_petite = pygame.font.SysFont("arial", 16)
+# Polices (chargées dans main, après pygame.init)
+police_titre = None
+police = None
+police_menu = None
+police_petite = None
+police_regles = None  # repli des overlays quand le texte ne tient pas en 22 pt
 
 # Dimensions layout
 HAUT_H = 90
@@ -354,6 +58,23 @@ frame_haut = pygame.Surface((LARGEUR, HAUT_H))
 frame_gauche = pygame.Surface((GAUCHE_W, HAUTEUR - HAUT_H))
 frame_jeu = pygame.Surface((LARGEUR - GAUCHE_W, HAUTEUR - HAUT_H))
 
+# Zones de l'écran (rendu par zones : seules les zones modifiées sont envoyées à l'écran)
+ECRAN = pygame.Rect(0, 0, LARGEUR, HAUTEUR)
+ZONE_HAUT = pygame.Rect(0, 0, LARGEUR, HAUT_H)
+ZONE_GAUCHE = pygame.Rect(0, HAUT_H, GAUCHE_W, HAUTEUR - HAUT_H)
+ZONE_JEU = pygame.Rect(GAUCHE_W, HAUT_H, LARGEUR - GAUCHE_W, HAUTEUR - HAUT_H)
+zones = ZonesModifiees()
+# Fenêtre découverte, restaurée ou ré-affichée : le contenu hors des zones
+# modifiées peut être perdu, on redessine et on renvoie tout l'écran
+EVENEMENTS_EXPOSITION = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED,
+                         pygame.WINDOWSHOWN, pygame.WINDOWRESTORED)
+
+# Boucle pilotée par les événements : elle dort tant que rien ne bouge, et ne
+# tourne à IPS_ACTIF que pendant l'animation de manche ou la saisie au clavier
+IPS_ACTIF = 60
+ATTENTE_MAX_MS = 1000  # réveil de sécurité même sans événement
+mesure_images = MesureImages()
+
 # Deux zones joueurs dans frame_jeu
 frame_j1 = pygame.Surface(((frame_jeu.get_width() - 20) // 2, frame_jeu.get_height() - 150))
 frame_j2 = pygame.Surface(((frame_jeu.get_width() - 20) // 2, frame_jeu.get_height() - 150))
@@ -365,9 +86,18 @@ frame_j2 = pygame.Surface(((frame_jeu.get_width() - 20) // 2, frame_jeu.get_heig
 # AJOUT : paramètres UI simples (menu Options)
 SETTINGS = {
     "show_opponent_card": True,  # debug : montre l'adversaire (carte visible)
-    "volume": 0.8               # volume global [0.0, 1.0]
+    "profileur": False,          # debug : temps par image et par section (coin haut droit)
+    "volume": 0.8,              # volume global [0.0, 1.0]
+    "historique_profondeur": 5  # manches affichées dans le panneau Historique (molette pour défiler)
 }
 
+# Profileur (overlay de debug + export Chrome trace depuis le panneau Options)
+PROFIL = Profileur()
+FICHIER_TRACE = "profil_trace.json"
+SECTIONS_PROFIL = ("evenements", "robot", "draw_card", "overlays", "affichage", "attente")
+RECT_PROFIL = pygame.Rect(LARGEUR - 236, 4, 232, (len(SECTIONS_PROFIL) + 1) * 17 + 10)
+message_trace = ""
+
 def clamp01(x):
     try:
         return max(0.0, min(1.0, float(x)))
@@ -375,33 +105,30 @@ def clamp01(x):
         return 0.8
 
 # ============================================================
-# =========================== SONS ============================
+# ========================== ROBOTS ===========================
 # ============================================================
 
-pygame.mixer.init()
+# Robot Monte-Carlo : 50 ms par coup, simulations réparties sur quelques processus
+ROBOT_MC = RobotMonteCarlo(budget_s=BUDGET_UI_S, processus=min(4, os.cpu_count() or 1))
 
-def charger_son(path):
-    try:
-        return pygame.mixer.Sound(path)
-    except Exception:
-        return None
+# ============================================================
+# =========================== SONS ============================
+# ============================================================
 
-S_CLICK = charger_son("assets/sounds/click.wav")
-S_VICTORY = charger_son("assets/sounds/victory.wav")
+# Sons : nom du fichier dans assets/sounds/ (préchargés en arrière-plan dans main)
+AUDIO = GestionnaireAudio(volume_global=clamp01(SETTINGS.get("volume", 0.8)))
+S_CLICK = "click"
+S_VICTORY = "victory"
+S_WIN_ROUND = "win_round"
+S_LOSE_ROUND = "lose_round"
 
 def play(sound, volume=0.8):
     """
     volume attendu par pygame: float entre 0.0 et 1.0 :contentReference[oaicite:2]{index=2}
-    Ici on applique un volume global SETTINGS["volume"].
+    Le volume global SETTINGS["volume"] est appliqué par AUDIO (volume du canal).
+    Ne bloque jamais : un son pas encore chargé est ignoré.
     """
-    if sound is None:
-        return
-    try:
-        v = clamp01(volume) * clamp01(SETTINGS.get("volume", 0.8))
-        sound.set_volume(v)
-        sound.play()
-    except Exception:
-        pass
+    AUDIO.jouer(sound, clamp01(volume))
 
 victory_sound_played = False
 
@@ -479,8 +206,8 @@ apropos_texte = [
     "",
     "Robots :",
     "Robot aléatoire : choisit une caractéristique au hasard.",
-    "Robot intelligent : observe les cartes jouées, calcule une médiane",
-    "et choisit la caractéristique la plus avantageuse.",
+    "Robot intelligent : compare sa carte à la médiane des cartes jouées.",
+    "Robots probabiliste / Monte-Carlo : meilleure chance / 50 ms de simulations.",
     "",
     "Retrouvez notre projet sur github : https://github.com/AntoCheMaestro :)"
 ]
@@ -489,42 +216,56 @@ apropos_texte = [
 # ========================= UTILITAIRES =======================
 # ============================================================
 
+def fmt_val(v):
+    """Valeur de caractéristique pour l'affichage (84.0 -> "84", 4.8 -> "4.8")."""
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return str(v)
+
+# Textes déjà rendus : la plupart des libellés sont identiques d'une image à l'autre
+TEXTES = CacheTextes(capacite=512)
+
+def rendre_texte(font, texte, couleur):
+    """font.render(texte, True, couleur), via le cache TEXTES."""
+    return TEXTES.rendre(font, texte, couleur)
+
+# Retours à la ligne mémorisés (largeurs des mots par police + paragraphes)
+DECOUPE = DecoupeLignes()
+
 def wrap_lines(text, font, max_width):
-    """Utilitaires pour les textes du menu hamburger"""
-    words = text.split(" ")
-    lines, cur = [], ""
-    for w in words:
-        test = (cur + " " + w).strip()
-        if font.size(test)[0] <= max_width:
-            cur = test
-        else:
-            if cur:
-                lines.append(cur)
-            cur = w
-    if cur:
-        lines.append(cur)
-    return lines
+    """Utilitaires pour les textes du menu hamburger (tuple de lignes, mémorisé)"""
+    return DECOUPE.lignes(font, text, max_width)
 
 # ------------------------------------------------------------
 # Cache images cartes (robuste + performant)
 # ------------------------------------------------------------
-IMAGES_CACHE = {}
+# Borné en mémoire (LRU) ; une image introuvable est retentée après 30 s
+IMAGES_CACHE = CacheImages(budget_octets=64 * 1024 * 1024, ttl_negatif=30.0)
+
+# Atlas des cartes à la taille de zone_carte (préchauffé dans main)
+ATLAS = None
 
 def charger_image_carte(path, target_w, target_h):
     """
     Charge et redimensionne une image de carte pour tenir dans (target_w, target_h)
     en conservant le ratio. Retourne une Surface prête à blitter, ou None si échec.
-    Cache interne par (path, target_w, target_h).
+    Passe d'abord par l'atlas ; sinon cache interne par (path, target_w, target_h).
     """
+    if ATLAS is not None and ATLAS.taille == (target_w, target_h):
+        img = ATLAS.image(path)
+        if img is not None:
+            return img
+
     key = (path, target_w, target_h)
-    if key in IMAGES_CACHE:
-        return IMAGES_CACHE[key]
+    trouvee, img = IMAGES_CACHE.chercher(key)
+    if trouvee:
+        return img
 
     try:
         img = pygame.image.load(path).convert_alpha()
         iw, ih = img.get_width(), img.get_height()
         if iw <= 0 or ih <= 0:
-            IMAGES_CACHE[key] = None
+            IMAGES_CACHE.ajouter(key, None)
             return None
 
         scale = min(target_w / iw, target_h / ih)
@@ -532,65 +273,85 @@ def charger_image_carte(path, target_w, target_h):
         new_h = max(1, int(ih * scale))
         img_scaled = pygame.transform.smoothscale(img, (new_w, new_h))
 
-        IMAGES_CACHE[key] = img_scaled
+        IMAGES_CACHE.ajouter(key, img_scaled)
         return img_scaled
     except Exception:
-        IMAGES_CACHE[key] = None
+        IMAGES_CACHE.ajouter(key, None)
         return None
 
 def dessiner_bouton(surface, rect, texte, actif=True):
     couleur = BOUTON_ACTIF if actif else BOUTON
     pygame.draw.rect(surface, couleur, rect, border_radius=12)
-    t = police.render(texte, True, NOIR)
+    t = rendre_texte(police, texte, NOIR)
     surface.blit(t, (rect.x + 18, rect.y + 16))
 
+# ------------------------------------------------------------
+# Calques et blocs de texte précalculés (une fois par taille)
+# ------------------------------------------------------------
+_CALQUES = {}
+_BLOCS_TEXTE = {}
+
+def calque(largeur, hauteur, rgba):
+    """Surface translucide unie (SRCALPHA), créée une seule fois par taille et couleur."""
+    cle = (largeur, hauteur, rgba)
+    surf = _CALQUES.get(cle)
+    if surf is None:
+        surf = pygame.Surface((largeur, hauteur), pygame.SRCALPHA)
+        surf.fill(rgba)
+        _CALQUES[cle] = surf
+    return surf
+
+def _decouper_texte(lines, font, max_w):
+    lignes = []
+    for l in lines:
+        if not l.strip():
+            lignes.append("")
+        elif l.startswith("- "):
+            for ll in wrap_lines(l, font, max_w):
+                lignes.append("  " + ll)
+        else:
+            lignes.extend(wrap_lines(l, font, max_w))
+    return lignes
+
+def bloc_texte_overlay(lines, max_w, max_h):
+    """
+    Texte d'un overlay découpé et rendu sur une seule surface, mis en cache
+    par (texte, largeur, hauteur). Passe en 18 pt si le texte ne tient pas en 22 pt.
+    """
+    cle = (tuple(lines), max_w, max_h)
+    bloc = _BLOCS_TEXTE.get(cle)
+    if bloc is not None:
+        return bloc
+
+    font_rules, line_h = police, 20
+    lignes = _decouper_texte(lines, font_rules, max_w)
+    if len(lignes) > max_h // line_h:
+        font_rules, line_h = police_regles, 18
+        lignes = _decouper_texte(lines, font_rules, max_w)
+
+    lignes = lignes[:max_h // line_h]
+    # fond opaque aux couleurs du panneau : mêmes pixels qu'un rendu direct dans la boîte
+    bloc = pygame.Surface((max_w, max(1, len(lignes) * line_h)))
+    bloc.fill(PANEL)
+    for i, l in enumerate(lignes):
+        if l:
+            bloc.blit(font_rules.render(l, True, BLANC), (0, i * line_h))
+    _BLOCS_TEXTE[cle] = bloc
+    return bloc
+
 def draw_overlay_box(title, lines):
-    overlay = pygame.Surface((LARGEUR, HAUTEUR), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 180))
-    fenetre.blit(overlay, (0, 0))
+    fenetre.blit(calque(LARGEUR, HAUTEUR, (0, 0, 0, 180)), (0, 0))
 
     box = pygame.Rect(120, 90, LARGEUR - 240, HAUTEUR - 180)
     pygame.draw.rect(fenetre, PANEL, box, border_radius=14)
     pygame.draw.rect(fenetre, VERT_NATURE, box, 3, border_radius=14)
 
-    titre = police_menu.render(title, True, BLANC)
+    titre = rendre_texte(police_menu, title, BLANC)
     fenetre.blit(titre, (box.x + 30, box.y + 20))
 
-    max_w = box.width - 60
-    y_text = box.y + 75
-    line_h = 20
-    font_rules = police
-
-    lignes = []
-    for l in lines:
-        if not l.strip():
-            lignes.append("")
-        elif l.startswith("- "):
-            for ll in wrap_lines(l, font_rules, max_w):
-                lignes.append("  " + ll)
-        else:
-            lignes.extend(wrap_lines(l, font_rules, max_w))
+    fenetre.blit(bloc_texte_overlay(lines, box.width - 60, box.height - 120), (box.x + 30, box.y + 75))
 
-    max_lines = (box.height - 120) // line_h
-    if len(lignes) > max_lines:
-        font_rules = pygame.font.SysFont("arial", 18)
-        line_h = 18
-        lignes = []
-        for l in lines:
-            if not l.strip():
-                lignes.append("")
-            elif l.startswith("- "):
-                for ll in wrap_lines(l, font_rules, max_w):
-                    lignes.append("  " + ll)
-            else:
-                lignes.extend(wrap_lines(l, font_rules, max_w))
-
-    max_lines = (box.height - 120) // line_h
-    for l in lignes[:max_lines]:
-        fenetre.blit(font_rules.render(l, True, BLANC), (box.x + 30, y_text))
-        y_text += line_h
-
-    fermer = police_petite.render("Cliquez dans la fenêtre pour fermer", True, BOUTON_ACTIF)
+    fermer = rendre_texte(police_petite, "Cliquez dans la fenêtre pour fermer", BOUTON_ACTIF)
     fenetre.blit(fermer, (box.x + 30, box.bottom - 35))
 
     return box
@@ -600,114 +361,210 @@ def draw_overlay_box(title, lines):
 # -----------------------------
 
 def layout_options_panel():
-    panel = pygame.Rect(180, 140, LARGEUR - 360, HAUTEUR - 280)
+    panel = pygame.Rect(180, 80, LARGEUR - 360, HAUTEUR - 160)
 
-    toggle_rect = pygame.Rect(panel.x + 30, panel.y + 90, panel.width - 60, 52)
+    toggle_rect = pygame.Rect(panel.x + 30, panel.y + 80, panel.width - 60, 52)
+    profil_rect = pygame.Rect(panel.x + 30, panel.y + 142, panel.width - 60, 52)
+    trace_rect  = pygame.Rect(panel.x + 30, panel.y + 204, panel.width - 60, 52)
 
-    minus_rect = pygame.Rect(panel.x + 30, panel.y + 175, 52, 52)
-    plus_rect  = pygame.Rect(panel.right - 82, panel.y + 175, 52, 52)
-    bar_rect   = pygame.Rect(minus_rect.right + 16, panel.y + 187, panel.width - 60 - 52 - 52 - 32, 28)
+    minus_rect = pygame.Rect(panel.x + 30, panel.y + 318, 52, 52)
+    plus_rect  = pygame.Rect(panel.right - 82, panel.y + 318, 52, 52)
+    bar_rect   = pygame.Rect(minus_rect.right + 16, panel.y + 330, panel.width - 60 - 52 - 52 - 32, 28)
 
-    return panel, toggle_rect, minus_rect, plus_rect, bar_rect
+    return panel, toggle_rect, profil_rect, trace_rect, minus_rect, plus_rect, bar_rect
 
 def draw_options_overlay():
-    overlay = pygame.Surface((LARGEUR, HAUTEUR), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 180))
-    fenetre.blit(overlay, (0, 0))
+    fenetre.blit(calque(LARGEUR, HAUTEUR, (0, 0, 0, 180)), (0, 0))
 
-    panel, toggle_rect, minus_rect, plus_rect, bar_rect = layout_options_panel()
+    panel, toggle_rect, profil_rect, trace_rect, minus_rect, plus_rect, bar_rect = layout_options_panel()
 
     pygame.draw.rect(fenetre, PANEL, panel, border_radius=16)
     pygame.draw.rect(fenetre, VERT_NATURE, panel, 3, border_radius=16)
 
-    titre = police_menu.render("Options", True, BLANC)
+    titre = rendre_texte(police_menu, "Options", BLANC)
     fenetre.blit(titre, (panel.x + 30, panel.y + 25))
 
     # Toggle carte adverse (debug)
     pygame.draw.rect(fenetre, FOND, toggle_rect, border_radius=12)
     label = "Afficher la carte adverse (debug)"
     val = "ON" if SETTINGS.get("show_opponent_card", True) else "OFF"
-    t1 = police.render(label, True, BLANC)
-    t2 = police.render(val, True, BOUTON_ACTIF)
+    t1 = rendre_texte(police, label, BLANC)
+    t2 = rendre_texte(police, val, BOUTON_ACTIF)
     fenetre.blit(t1, (toggle_rect.x + 14, toggle_rect.y + 14))
     fenetre.blit(t2, (toggle_rect.right - t2.get_width() - 14, toggle_rect.y + 14))
 
+    # Toggle profileur (debug)
+    pygame.draw.rect(fenetre, FOND, profil_rect, border_radius=12)
+    val = "ON" if SETTINGS.get("profileur", False) else "OFF"
+    t2 = rendre_texte(police, val, BOUTON_ACTIF)
+    fenetre.blit(rendre_texte(police, "Profileur d'images (debug)", BLANC), (profil_rect.x + 14, profil_rect.y + 14))
+    fenetre.blit(t2, (profil_rect.right - t2.get_width() - 14, profil_rect.y + 14))
+
+    # Export de la chronologie (profileur actif uniquement)
+    dessiner_bouton(fenetre, trace_rect, f"Exporter la trace ({FICHIER_TRACE})", actif=PROFIL.actif)
+    if message_trace:
+        fenetre.blit(rendre_texte(police_petite, message_trace, BLANC), (trace_rect.x, trace_rect.bottom + 8))
+
     # Volume
     vol = clamp01(SETTINGS.get("volume", 0.8))
     vol_pct = int(round(vol * 100))
 
-    tvol = police.render("Volume sons", True, BLANC)
-    fenetre.blit(tvol, (panel.x + 30, panel.y + 140))
+    tvol = rendre_texte(police, "Volume sons", BLANC)
+    fenetre.blit(tvol, (panel.x + 30, panel.y + 285))
 
     pygame.draw.rect(fenetre, BOUTON, minus_rect, border_radius=12)
     pygame.draw.rect(fenetre, BOUTON, plus_rect, border_radius=12)
-    fenetre.blit(police_menu.render("-", True, NOIR), (minus_rect.x + 18, minus_rect.y + 4))
-    fenetre.blit(police_menu.render("+", True, NOIR), (plus_rect.x + 16, plus_rect.y + 2))
+    fenetre.blit(rendre_texte(police_menu, "-", NOIR), (minus_rect.x + 18, minus_rect.y + 4))
+    fenetre.blit(rendre_texte(police_menu, "+", NOIR), (plus_rect.x + 16, plus_rect.y + 2))
 
     pygame.draw.rect(fenetre, FOND, bar_rect, border_radius=10)
     fill_w = int(bar_rect.width * vol)
     fill_rect = pygame.Rect(bar_rect.x, bar_rect.y, fill_w, bar_rect.height)
     pygame.draw.rect(fenetre, BOUTON_ACTIF, fill_rect, border_radius=10)
 
-    tv = police.render(f"{vol_pct} %", True, BLANC)
+    tv = rendre_texte(police, f"{vol_pct} %", BLANC)
     fenetre.blit(tv, (bar_rect.centerx - tv.get_width() // 2, bar_rect.y - 2))
 
-    hint = police_petite.render("Cliquez hors du panneau pour fermer", True, BOUTON_ACTIF)
+    hint = rendre_texte(police_petite, "Cliquez hors du panneau pour fermer", BOUTON_ACTIF)
     fenetre.blit(hint, (panel.x + 30, panel.bottom - 30))
 
-    return panel, toggle_rect, minus_rect, plus_rect, bar_rect
+    return panel, toggle_rect, profil_rect, trace_rect, minus_rect, plus_rect, bar_rect
+
+def draw_profiler_overlay():
+    """Temps par image et par section (ms, moyennes glissantes) dans le coin haut droit."""
+    pygame.draw.rect(fenetre, NOIR, RECT_PROFIL, border_radius=8)
+    pygame.draw.rect(fenetre, BOUTON_ACTIF, RECT_PROFIL, 1, border_radius=8)
+    x, y = RECT_PROFIL.x + 10, RECT_PROFIL.y + 5
+    # les mesures changent à chaque image : rendues directement, hors du cache TEXTES
+    # (elles en chasseraient les textes réutilisés) ; seuls les noms de section y passent
+    entete = f"{mesure_images.ips:5.1f} IPS   image {mesure_images.temps_image_ms:6.2f} ms"
+    fenetre.blit(police_petite.render(entete, True, BOUTON_ACTIF), (x, y))
+    for nom in SECTIONS_PROFIL:
+        y += 17
+        val = police_petite.render(f"{PROFIL.moyennes_ms.get(nom, 0.0):.3f} ms", True, BLANC)
+        fenetre.blit(rendre_texte(police_petite, nom, BLANC), (x, y))
+        fenetre.blit(val, (RECT_PROFIL.right - 10 - val.get_width(), y))
 
 # -----------------------------
 # AJOUT : Historique (UI)
 # -----------------------------
 
-def draw_history_panel(surface, game_obj):
+LABELS_CARAC_COURTS = {"poids": "Pds", "longueur": "Lng", "longevite": "Vlv"}
+
+class PanneauHistorique:
     """
-    Affiche les 5 dernières manches dans frame_gauche (UI only).
-    Données = game_obj.historique_manches (moteur).
+    Panneau des dernières manches dans frame_gauche (UI only).
+    Données = game.historique_manches (moteur). Chaque manche est rendue une
+    seule fois sur sa propre surface ; le panneau n'est recomposé que si
+    game.version, la profondeur ou le défilement changent.
     """
-    if game_obj is None:
-        return
+    def __init__(self, largeur, hauteur):
+        self.box = pygame.Rect(10, 18, largeur - 20, hauteur - 36)
+        self.defilement = 0  # nombre de manches récentes sautées (molette)
+        self._partie = None
+        self._version = None
+        self._entrees = OrderedDict()  # index absolu de manche -> Surface
+        self._cle = None
+        self._surface = None
+
+    def profondeur(self):
+        return max(1, int(SETTINGS.get("historique_profondeur", 5)))
+
+    def _max_defilement(self, game_obj):
+        return max(0, game_obj.historique_manches.retenues() - self.profondeur())
+
+    def defiler(self, delta, game_obj):
+        """delta > 0 : vers les manches plus anciennes."""
+        if game_obj is None:
+            return
+        self.defilement = min(max(0, self.defilement + delta), self._max_defilement(game_obj))
 
-    # boîte
-    box = pygame.Rect(10, 18, GAUCHE_W - 20, (HAUTEUR - HAUT_H) - 36)
-    pygame.draw.rect(surface, FOND, box, border_radius=12)
-    pygame.draw.rect(surface, VERT_NATURE, box, 2, border_radius=12)
+    def _entree(self, hist, k):
+        surf = self._entrees.get(k)
+        if surf is not None:
+            self._entrees.move_to_end(k)
+            return surf
 
-    titre = police_petite.render("Historique (5)", True, BLANC)
-    surface.blit(titre, (box.x + 10, box.y + 10))
+        h = hist[k]
+        car = h.get("carac", "")
+        car_label = LABELS_CARAC_COURTS.get(car, car)
+        lignes = []
+        for l in (f"{h.get('actif', '?')} vs {h.get('passif', '?')}",
+                  f"{car_label}: {fmt_val(h.get('v_actif', '?'))} / {fmt_val(h.get('v_passif', '?'))} -> {h.get('gagnant', '?')}"):
+            lignes.extend(wrap_lines(l, police_petite, self.box.width - 20))
+
+        surf = pygame.Surface((self.box.width - 20, len(lignes) * 18 + 10))
+        surf.fill(FOND)
+        for i, ll in enumerate(lignes):
+            surf.blit(rendre_texte(police_petite, ll, BLANC), (0, i * 18))
+        self._entrees[k] = surf
+        # on garde un peu plus que la profondeur affichée pour défiler sans rien refaire
+        while len(self._entrees) > 4 * self.profondeur():
+            self._entrees.popitem(last=False)
+        return surf
+
+    def _composer(self, game_obj):
+        box = self.box
+        surf = pygame.Surface((box.width, box.height))
+        surf.fill(PANEL)
+        local = surf.get_rect()
+        pygame.draw.rect(surf, FOND, local, border_radius=12)
+        pygame.draw.rect(surf, VERT_NATURE, local, 2, border_radius=12)
+
+        profondeur = self.profondeur()
+        titre = f"Historique ({profondeur})" if not self.defilement else f"Historique (-{self.defilement})"
+        surf.blit(rendre_texte(police_petite, titre, BLANC), (10, 10))
+
+        hist = game_obj.historique_manches
+        y = 38
+        if hist.retenues():
+            # plus récent en haut
+            dernier = len(hist) - 1 - self.defilement
+            premier = max(len(hist) - hist.retenues(), dernier - profondeur + 1)
+            surf.set_clip(pygame.Rect(10, 38, box.width - 20, box.height - 50))
+            for k in range(dernier, premier - 1, -1):
+                if y > box.height - 12:
+                    break
+                entree = self._entree(hist, k)
+                surf.blit(entree, (10, y))
+                y += entree.get_height()
+            surf.set_clip(None)
+        else:
+            for l in ["Aucune manche", "jouée pour", "l'instant."]:
+                surf.blit(rendre_texte(police_petite, l, BLANC), (10, y))
+                y += 18
+        return surf
 
-    # dernières entrées
-    lignes = []
-    hist = getattr(game_obj, "historique_manches", [])
-    if hist:
-        derniers = hist[-5:][::-1]  # plus récent en haut
-        for h in derniers:
-            car = h.get("carac", "")
-            car_label = {"poids": "Pds", "longueur": "Lng", "longevite": "Vlv"}.get(car, car)
-            a = h.get("actif", "?")
-            p = h.get("passif", "?")
-            va = h.get("v_actif", "?")
-            vp = h.get("v_passif", "?")
-            g = h.get("gagnant", "?")
-            lignes.append(f"{a} vs {p}")
-            lignes.append(f"{car_label}: {va} / {vp} -> {g}")
-            lignes.append("")  # espace
-    else:
-        lignes = ["Aucune manche", "jouée pour", "l'instant."]
-
-    # rendu (wrap)
-    y = box.y + 38
-    max_w = box.width - 20
-    for l in lignes:
-        if not l:
-            y += 10
-            continue
-        for ll in wrap_lines(l, police_petite, max_w):
-            surface.blit(police_petite.render(ll, True, BLANC), (box.x + 10, y))
-            y += 18
-        if y > box.bottom - 12:
-            break
+    def dessiner(self, surface, game_obj):
+        if game_obj is None:
+            return
+        if game_obj is not self._partie:
+            self._partie = game_obj
+            self._entrees.clear()
+            self.defilement = 0
+        if game_obj.version != self._version:
+            # nouvelle manche : retour en haut (la plus récente)
+            self._version = game_obj.version
+            self.defilement = 0
+
+        cle = (game_obj, game_obj.version, self.profondeur(), self.defilement)
+        if cle != self._cle:
+            self._surface = self._composer(game_obj)
+            self._cle = cle
+        surface.blit(self._surface, self.box.topleft)
+
+    def cle(self):
+        """État affiché (pour le rendu par zones)."""
+        return self.profondeur(), self.defilement
+
+PANNEAU_HISTORIQUE = PanneauHistorique(GAUCHE_W, HAUTEUR - HAUT_H)
+
+def draw_history_panel(surface, game_obj):
+    """
+    Affiche les dernières manches dans frame_gauche (UI only).
+    Données = game_obj.historique_manches (moteur).
+    """
+    PANNEAU_HISTORIQUE.dessiner(surface, game_obj)
 
 # ============================================================
 # ========================= ETATS UI ==========================
@@ -751,14 +608,19 @@ def layout_start():
     clear_rect.width, clear_rect.height = 46, 50
 
     start_buttons.clear()
-    bw, bh = 360, 58
+    # grille de 2 colonnes
+    bw, bh = 250, 58
     bx = box.x + 70
     by = input_rect.y + 85
-    start_buttons.extend([
-        ("Joueur vs Joueur", "PVP", pygame.Rect(bx, by, bw, bh)),
-        ("Vs Robot aléatoire", "RA", pygame.Rect(bx, by + 75, bw, bh)),
-        ("Vs Robot intelligent", "RI", pygame.Rect(bx, by + 150, bw, bh)),
-    ])
+    modes = [
+        ("Joueur vs Joueur", "PVP"),
+        ("Vs Robot aléatoire", "RA"),
+        ("Vs Robot intelligent", "RI"),
+        ("Vs Robot probabiliste", "RP"),
+        ("Vs Robot Monte-Carlo", "RM"),
+    ]
+    for i, (label, mode) in enumerate(modes):
+        start_buttons.append((label, mode, pygame.Rect(bx + (i % 2) * (bw + 20), by + (i // 2) * 75, bw, bh)))
     return box
 
 def layout_victory_panel():
@@ -782,6 +644,12 @@ def start_round_animation():
         return
     anim_winner_index = 0 if game.dernier_gagnant is game.joueurs[0] else 1
 
+    # son de fin de manche : contre un robot, du point de vue de l'humain
+    if game.mode_robot is not None and game.dernier_gagnant.nom == "Robot":
+        play(S_LOSE_ROUND, 0.7)
+    else:
+        play(S_WIN_ROUND, 0.7)
+
 def ui_state_to_end():
     global ui_state
     ui_state = UI_END
@@ -805,23 +673,36 @@ def robot_joue_si_besoin():
             ui_state_to_end()
             return
 
-        if game.mode_robot == "A":
-            car = choix_robot_aleatoire()
-        else:
-            car = choix_robot_intelligent(carte, game.historique_cartes)
+        car = choix_robot(game.mode_robot, carte, game, ROBOT_MC)
 
         game.appliquer_manche(car)
 
         label = {"poids": "Poids", "longueur": "Longueur", "longevite": "Longévité"}[car]
-        message_ui = f"{label} : {game.derniere_val_actif} vs {game.derniere_val_passif} — {game.dernier_gagnant.nom} gagne"
+        message_ui = f"{label} : {fmt_val(game.derniere_val_actif)} vs {fmt_val(game.derniere_val_passif)} — {game.dernier_gagnant.nom} gagne"
 
         start_round_animation()
 
-# Répétition clavier (prénom) :contentReference[oaicite:3]{index=3}
-pygame.key.set_repeat(350, 35)
+def boucle_active():
+    """True si la boucle doit tourner sans attendre d'événement."""
+    if ui_state == UI_ANIM:
+        return True
+    if ui_state == UI_PLAY and game is not None and (game.terminee or game.actif_est_robot()):
+        return True  # le robot (ou la fin de partie) doit être traité sans clic
+    return ui_state == UI_START and prenom_actif and bool(touches_saisie)
+
+def attendre_evenements():
+    """Événements de la prochaine image : cadence fixe si la boucle est active, sinon attente."""
+    if boucle_active():
+        clock.tick(IPS_ACTIF)
+        return pygame.event.get()
+    event = pygame.event.wait(ATTENTE_MAX_MS)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
 
-clock = pygame.time.Clock()
+clock = None
 running = True
+touches_saisie = set()  # touches maintenues dans le champ prénom (répétition clavier)
 
 # ============================================================
 # ======================== DRAW CARD =========================
@@ -839,10 +720,10 @@ def draw_card(surface, joueur, est_actif, highlight=False):
 
     carte = joueur.carte_visible()
     if carte is None:
-        name = police.render(joueur.nom, True, NOIR)
+        name = rendre_texte(police, joueur.nom, NOIR)
         surface.blit(name, (30, 28))
-        surface.blit(police.render("Plus de cartes", True, NOIR), (30, 120))
-        txt_count = police_petite.render(f"Cartes : {len(joueur.cartes)}", True, BLANC)
+        surface.blit(rendre_texte(police, "Plus de cartes", NOIR), (30, 120))
+        txt_count = rendre_texte(police_petite, f"Cartes : {len(joueur.cartes)}", BLANC)
         surface.blit(txt_count, (20, surface.get_height() - 28))
         return
 
@@ -860,7 +741,7 @@ def draw_card(surface, joueur, est_actif, highlight=False):
         # dos de carte simple (aucun asset requis)
         pygame.draw.rect(surface, (180, 170, 150), zone_carte, border_radius=12)
         pygame.draw.rect(surface, NOIR, zone_carte, width=3, border_radius=12)
-        txt1 = police.render("Carte cachée", True, NOIR)
+        txt1 = rendre_texte(police, "Carte cachée", NOIR)
         surface.blit(txt1, (zone_carte.centerx - txt1.get_width() // 2, zone_carte.centery - 15))
     else:
         img = charger_image_carte(carte.path_image, zone_carte.width, zone_carte.height)
@@ -872,377 +753,500 @@ def draw_card(surface, joueur, est_actif, highlight=False):
         else:
             pygame.draw.rect(surface, CARTE_COL, zone_carte, border_radius=12)
             pygame.draw.rect(surface, NOIR, zone_carte, width=2, border_radius=12)
-            surface.blit(police.render(joueur.nom, True, NOIR), (30, 28))
-            surface.blit(police.render(carte.nom, True, NOIR), (30, 62))
-            surface.blit(police.render("Image introuvable", True, NOIR), (30, 120))
+            surface.blit(rendre_texte(police, joueur.nom, NOIR), (30, 28))
+            surface.blit(rendre_texte(police, carte.nom, NOIR), (30, 62))
+            surface.blit(rendre_texte(police, "Image introuvable", NOIR), (30, 120))
 
     # Bandeau semi-transparent (SRCALPHA) :contentReference[oaicite:4]{index=4}
-    bandeau = pygame.Surface((zone_carte.width, 30), pygame.SRCALPHA)
-    bandeau.fill((0, 0, 0, 90))
-    surface.blit(bandeau, (zone_carte.x, zone_carte.y))
-    surface.blit(police_petite.render(joueur.nom, True, BLANC), (zone_carte.x + 10, zone_carte.y + 7))
+    surface.blit(calque(zone_carte.width, 30, (0, 0, 0, 90)), (zone_carte.x, zone_carte.y))
+    surface.blit(rendre_texte(police_petite, joueur.nom, BLANC), (zone_carte.x + 10, zone_carte.y + 7))
 
     # Message debug uniquement sur la carte adverse quand elle est visible
     try:
         if (game is not None and joueur is not game.joueur_actif
             and SETTINGS.get("show_opponent_card", True)):
-            dbg = police_petite.render("(Mode debug : en vrai on ne voit pas la carte)", True, BOUTON_ACTIF)
-            dbg_bg = pygame.Surface((dbg.get_width() + 12, dbg.get_height() + 6), pygame.SRCALPHA)
-            dbg_bg.fill((0, 0, 0, 140))
+            dbg = rendre_texte(police_petite, "(Mode debug : en vrai on ne voit pas la carte)", BOUTON_ACTIF)
+            dbg_bg = calque(dbg.get_width() + 12, dbg.get_height() + 6, (0, 0, 0, 140))
             surface.blit(dbg_bg, (zone_carte.x + 10, zone_carte.y + 36))
             surface.blit(dbg, (zone_carte.x + 16, zone_carte.y + 39))
     except Exception:
         pass
 
     # Indication du nombre de cartes : en bas (hors carte)
-    txt_count = police_petite.render(f"Cartes : {len(joueur.cartes)}", True, BLANC)
+    txt_count = rendre_texte(police_petite, f"Cartes : {len(joueur.cartes)}", BLANC)
     surface.blit(txt_count, (20, surface.get_height() - 28))
 
 # ============================================================
 # ============================ BOUCLE =========================
 # ============================================================
 
-while running:
-    # robot joue automatiquement si besoin
-    robot_joue_si_besoin()
+def main():
+    """Point d'entrée de l'interface : initialise Pygame puis lance la boucle."""
+    global fenetre, police_titre, police, police_menu, police_petite, police_regles
+    global clock, running, ATLAS
+    global ui_state, game, message_ui, prenom, prenom_actif, menu_ouvert
+    global afficher_regles, afficher_apropos, afficher_options, victory_sound_played, message_trace
 
-    # fin animation -> basculer vers RESULT ou END
-    if ui_state == UI_ANIM:
-        if pygame.time.get_ticks() - anim_start_ms >= ANIM_DUREE_MS:
-            if game is not None and game.terminee:
-                ui_state_to_end()
-            else:
-                ui_state = UI_RESULT
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-        # clavier : saisie prénom
-        if ui_state == UI_START and event.type == pygame.KEYDOWN and prenom_actif and not afficher_regles and not afficher_apropos and not afficher_options:
-            if event.key == pygame.K_BACKSPACE:
-                prenom = prenom[:-1]
-            elif event.key == pygame.K_RETURN:
-                prenom_actif = False
-            else:
-                if len(prenom) < 16 and event.unicode.isprintable():
-                    if event.unicode.isalnum() or event.unicode in [" ", "-", "_"]:
-                        prenom += event.unicode
-
-        # AJOUT : raccourcis 1/2/3 en jeu (KEYDOWN) :contentReference[oaicite:5]{index=5}
-        if event.type == pygame.KEYDOWN:
-            if (ui_state == UI_PLAY and game is not None and not game.actif_est_robot()
-                and not game.terminee and not afficher_regles and not afficher_apropos and not afficher_options):
-
-                mapping = {
-                    pygame.K_1: ("Poids", "poids"),
-                    pygame.K_KP1: ("Poids", "poids"),
-                    pygame.K_2: ("Longueur", "longueur"),
-                    pygame.K_KP2: ("Longueur", "longueur"),
-                    pygame.K_3: ("Longévité", "longevite"),
-                    pygame.K_KP3: ("Longévité", "longevite"),
-                }
-                if event.key in mapping:
-                    label, key = mapping[event.key]
-                    play(S_CLICK, 0.7)
-
-                    game.appliquer_manche(key)
-                    message_ui = f"{label} : {game.derniere_val_actif} vs {game.derniere_val_passif} — {game.dernier_gagnant.nom} gagne"
-                    start_round_animation()
-
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            x, y = event.pos
-
-            # Overlay règles / à propos
-            if afficher_regles:
-                if 120 <= x <= LARGEUR - 120 and 90 <= y <= HAUTEUR - 90:
-                    afficher_regles = False
-                    play(S_CLICK, 0.6)
-                continue
-            if afficher_apropos:
-                if 120 <= x <= LARGEUR - 120 and 90 <= y <= HAUTEUR - 90:
-                    afficher_apropos = False
-                    play(S_CLICK, 0.6)
-                continue
+    pygame.init()
 
-            # AJOUT : overlay options (interaction)
-            if afficher_options:
-                panel, toggle_rect, minus_rect, plus_rect, bar_rect = layout_options_panel()
+    fenetre = pygame.display.set_mode((LARGEUR, HAUTEUR))
+    pygame.display.set_caption("Défi Nature")
 
-                # clic hors panneau -> fermer
-                if not panel.collidepoint(x, y):
-                    afficher_options = False
-                    play(S_CLICK, 0.6)
-                    continue
+    police_titre = pygame.font.SysFont("arial", 44, bold=True)
+    police = pygame.font.SysFont("arial", 22)
+    police_menu = pygame.font.SysFont("arial", 30, bold=True)
+    police_petite = pygame.font.SysFont("arial", 16)
+    police_regles = pygame.font.SysFont("arial", 18)
 
-                # clic dans panneau -> gérer boutons
-                if toggle_rect.collidepoint(x, y):
-                    SETTINGS["show_opponent_card"] = not SETTINGS.get("show_opponent_card", True)
-                    play(S_CLICK, 0.6)
-                elif minus_rect.collidepoint(x, y):
-                    SETTINGS["volume"] = clamp01(SETTINGS.get("volume", 0.8) - 0.1)
-                    play(S_CLICK, 0.6)
-                elif plus_rect.collidepoint(x, y):
-                    SETTINGS["volume"] = clamp01(SETTINGS.get("volume", 0.8) + 0.1)
-                    play(S_CLICK, 0.6)
-                else:
-                    # clic ailleurs dans le panneau : rien
-                    pass
-                continue
+    # images des cartes décodées en arrière-plan pendant l'écran d'accueil
+    ATLAS = AtlasCartes((zone_carte.width, zone_carte.height))
+    ATLAS.prechauffer()
 
-            # hamburger
-            if bouton_menu.collidepoint(x, y):
-                menu_ouvert = not menu_ouvert
-                play(S_CLICK, 0.6)
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        pass
+    AUDIO.demarrer()
 
-            # menu options (gauche)
-            if menu_ouvert:
-                lx, ly = x, y - HAUT_H
-                if 0 <= lx <= GAUCHE_W and 0 <= ly <= (HAUTEUR - HAUT_H):
-                    for i, rect in enumerate(option_rects):
-                        if rect.collidepoint(lx, ly):
-                            opt = options[i]
-                            play(S_CLICK, 0.6)
-
-                            if opt == "Quitter":
-                                running = False
-                            elif opt == "Règles":
-                                afficher_regles = True
-                            elif opt == "À propos":
-                                afficher_apropos = True
-                            elif opt == "Options":
-                                afficher_options = True
-                            elif opt == "Rejouer":
-                                ui_state = UI_START
-                                game = None
-                                message_ui = ""
-                                menu_ouvert = False
-                                prenom_actif = True
-                                victory_sound_played = False
-                            menu_ouvert = False
+    # data/animaux.csv relu à chaud quand il change (thread de scrutation)
+    SURVEILLANT_CSV.demarrer()
 
-            # START : clic champ / clear / mode
-            if ui_state == UI_START:
-                box = layout_start()
+    # Répétition clavier (prénom) :contentReference[oaicite:3]{index=3}
+    pygame.key.set_repeat(350, 35)
 
-                if input_rect.collidepoint(x, y):
-                    prenom_actif = True
-                    play(S_CLICK, 0.6)
-                elif clear_rect.collidepoint(x, y):
-                    prenom = ""
-                    prenom_actif = True
-                    play(S_CLICK, 0.6)
+    clock = pygame.time.Clock()
 
-                for label, mode, rect in start_buttons:
-                    if rect.collidepoint(x, y):
-                        play(S_CLICK, 0.7)
-                        game = creer_partie(mode, prenom=prenom)
-                        ui_state = UI_PLAY
-                        message_ui = ""
-                        menu_ouvert = False
-                        victory_sound_played = False
-                        break
+    evenements = pygame.event.get()
+    ecran_entier = True  # première image : tout l'écran est envoyé
+    while running:
+        mesure_images.debut()
 
-            # RESULT : clic pour continuer
-            elif ui_state == UI_RESULT:
-                ui_state = UI_PLAY
-                message_ui = ""
-                play(S_CLICK, 0.6)
+        # catalogue modifié : prochaines parties seulement ; on oublie les images des espèces concernées
+        diff = recharger_catalogue()
+        if diff:
+            IMAGES_CACHE.retirer_si(lambda cle: cle[0] in diff.chemins_images)
 
-            # ANIM : on ignore les clics (anti-spam)
-            elif ui_state == UI_ANIM:
-                pass
+        # robot joue automatiquement si besoin
+        t = PROFIL.debut()
+        robot_joue_si_besoin()
+        PROFIL.fin("robot", t)
 
-            # END : écran victoire dédié avec boutons directs
-            elif ui_state == UI_END:
-                panel = layout_victory_panel()
-                if victory_replay_rect.collidepoint(x, y):
-                    play(S_CLICK, 0.7)
-                    ui_state = UI_START
-                    game = None
-                    message_ui = ""
-                    menu_ouvert = False
-                    prenom_actif = True
-                    victory_sound_played = False
-                elif victory_quit_rect.collidepoint(x, y):
-                    play(S_CLICK, 0.6)
-                    running = False
-
-            # PLAY : clic carac si humain actif
-            elif ui_state == UI_PLAY and game is not None and not game.actif_est_robot() and not game.terminee:
-                local_x = x - GAUCHE_W
-                local_y = y - HAUT_H
-                for label, key, rect in boutons_carac:
-                    if rect.collidepoint(local_x, local_y):
+        # fin animation -> basculer vers RESULT ou END
+        if ui_state == UI_ANIM:
+            if pygame.time.get_ticks() - anim_start_ms >= ANIM_DUREE_MS:
+                if game is not None and game.terminee:
+                    ui_state_to_end()
+                else:
+                    ui_state = UI_RESULT
+
+        t = PROFIL.debut()
+        for event in evenements:
+            if event.type == pygame.QUIT:
+                running = False
+
+            if event.type in EVENEMENTS_EXPOSITION:
+                zones.invalider()  # "overlays" compris : l'image suivante refait tout l'écran
+                ecran_entier = True
+
+            if event.type == pygame.KEYUP:
+                touches_saisie.discard(event.key)
+
+            # molette sur le panneau Historique : manches plus anciennes / récentes
+            if (event.type == pygame.MOUSEWHEEL and ui_state != UI_START and not menu_ouvert
+                    and ZONE_GAUCHE.collidepoint(pygame.mouse.get_pos())):
+                PANNEAU_HISTORIQUE.defiler(event.y, game)
+
+            # clavier : saisie prénom
+            if ui_state == UI_START and event.type == pygame.KEYDOWN and prenom_actif and not afficher_regles and not afficher_apropos and not afficher_options:
+                touches_saisie.add(event.key)
+                if event.key == pygame.K_BACKSPACE:
+                    prenom = prenom[:-1]
+                elif event.key == pygame.K_RETURN:
+                    prenom_actif = False
+                else:
+                    if len(prenom) < 16 and event.unicode.isprintable():
+                        if event.unicode.isalnum() or event.unicode in [" ", "-", "_"]:
+                            prenom += event.unicode
+
+            # AJOUT : raccourcis 1/2/3 en jeu (KEYDOWN) :contentReference[oaicite:5]{index=5}
+            if event.type == pygame.KEYDOWN:
+                if (ui_state == UI_PLAY and game is not None and not game.actif_est_robot()
+                    and not game.terminee and not afficher_regles and not afficher_apropos and not afficher_options):
+
+                    mapping = {
+                        pygame.K_1: ("Poids", "poids"),
+                        pygame.K_KP1: ("Poids", "poids"),
+                        pygame.K_2: ("Longueur", "longueur"),
+                        pygame.K_KP2: ("Longueur", "longueur"),
+                        pygame.K_3: ("Longévité", "longevite"),
+                        pygame.K_KP3: ("Longévité", "longevite"),
+                    }
+                    if event.key in mapping:
+                        label, key = mapping[event.key]
                         play(S_CLICK, 0.7)
 
                         game.appliquer_manche(key)
-                        message_ui = f"{label} : {game.derniere_val_actif} vs {game.derniere_val_passif} — {game.dernier_gagnant.nom} gagne"
+                        message_ui = f"{label} : {fmt_val(game.derniere_val_actif)} vs {fmt_val(game.derniere_val_passif)} — {game.dernier_gagnant.nom} gagne"
                         start_round_animation()
-                        break
-
-    # ============================================================
-    # ========================= AFFICHAGE =========================
-    # ============================================================
-
-    fenetre.fill(FOND)
-
-    frame_haut.fill(VERT_NATURE)
-    frame_gauche.fill(PANEL)
-    frame_jeu.fill(PANEL)
-    frame_j1.fill(PANEL)
-    frame_j2.fill(PANEL)
-
-    # Titre
-    texte_titre = police_titre.render("Défi Nature", True, BLANC)
-    frame_haut.blit(texte_titre, (LARGEUR // 2 - texte_titre.get_width() // 2, 20))
-
-    # Hamburger
-    pygame.draw.rect(frame_haut, PANEL, bouton_menu, border_radius=8)
-    icone = police_menu.render("≡" if not menu_ouvert else "×", True, BLANC)
-    frame_haut.blit(icone, (bouton_menu.x + 13, bouton_menu.y + 4))
-
-    # Menu gauche
-    if menu_ouvert:
-        for i, rect in enumerate(option_rects):
-            pygame.draw.rect(frame_gauche, FOND, rect, border_radius=10)
-            txt = police.render(options[i], True, BLANC)
-            frame_gauche.blit(txt, (rect.x + 18, rect.y + 12))
-    else:
-        # AJOUT : Historique (quand menu fermé) pour ne pas chevaucher
-        if ui_state != UI_START and game is not None:
-            draw_history_panel(frame_gauche, game)
 
-    # START
-    if ui_state == UI_START:
-        box = layout_start()
+            # boutons 4/5 = molette (traitée avec MOUSEWHEEL), pas un clic
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button not in (4, 5):
+                x, y = event.pos
+
+                # Overlay règles / à propos
+                if afficher_regles:
+                    if 120 <= x <= LARGEUR - 120 and 90 <= y <= HAUTEUR - 90:
+                        afficher_regles = False
+                        play(S_CLICK, 0.6)
+                    continue
+                if afficher_apropos:
+                    if 120 <= x <= LARGEUR - 120 and 90 <= y <= HAUTEUR - 90:
+                        afficher_apropos = False
+                        play(S_CLICK, 0.6)
+                    continue
+
+                # AJOUT : overlay options (interaction)
+                if afficher_options:
+                    panel, toggle_rect, profil_rect, trace_rect, minus_rect, plus_rect, bar_rect = layout_options_panel()
+
+                    # clic hors panneau -> fermer
+                    if not panel.collidepoint(x, y):
+                        afficher_options = False
+                        play(S_CLICK, 0.6)
+                        continue
+
+                    # clic dans panneau -> gérer boutons
+                    if toggle_rect.collidepoint(x, y):
+                        SETTINGS["show_opponent_card"] = not SETTINGS.get("show_opponent_card", True)
+                        play(S_CLICK, 0.6)
+                    elif profil_rect.collidepoint(x, y):
+                        SETTINGS["profileur"] = not SETTINGS.get("profileur", False)
+                        PROFIL.activer(SETTINGS["profileur"])
+                        message_trace = ""
+                        play(S_CLICK, 0.6)
+                    elif trace_rect.collidepoint(x, y) and PROFIL.actif:
+                        try:
+                            n = PROFIL.exporter_trace(FICHIER_TRACE)
+                            message_trace = f"{n} événements écrits dans {FICHIER_TRACE}"
+                        except OSError as e:
+                            message_trace = f"Export impossible : {e}"
+                        play(S_CLICK, 0.6)
+                    elif minus_rect.collidepoint(x, y):
+                        SETTINGS["volume"] = clamp01(SETTINGS.get("volume", 0.8) - 0.1)
+                        AUDIO.regler_volume(SETTINGS["volume"])
+                        play(S_CLICK, 0.6)
+                    elif plus_rect.collidepoint(x, y):
+                        SETTINGS["volume"] = clamp01(SETTINGS.get("volume", 0.8) + 0.1)
+                        AUDIO.regler_volume(SETTINGS["volume"])
+                        play(S_CLICK, 0.6)
+                    else:
+                        # clic ailleurs dans le panneau : rien
+                        pass
+                    continue
 
-        fenetre.blit(frame_haut, (0, 0))
-        fenetre.blit(frame_gauche, (0, HAUT_H))
-        fenetre.blit(frame_jeu, (GAUCHE_W, HAUT_H))
+                # hamburger
+                if bouton_menu.collidepoint(x, y):
+                    menu_ouvert = not menu_ouvert
+                    play(S_CLICK, 0.6)
 
-        pygame.draw.rect(fenetre, PANEL, box, border_radius=16)
-        pygame.draw.rect(fenetre, VERT_NATURE, box, width=3, border_radius=16)
+                # menu options (gauche)
+                if menu_ouvert:
+                    lx, ly = x, y - HAUT_H
+                    if 0 <= lx <= GAUCHE_W and 0 <= ly <= (HAUTEUR - HAUT_H):
+                        for i, rect in enumerate(option_rects):
+                            if rect.collidepoint(lx, ly):
+                                opt = options[i]
+                                play(S_CLICK, 0.6)
+
+                                if opt == "Quitter":
+                                    running = False
+                                elif opt == "Règles":
+                                    afficher_regles = True
+                                elif opt == "À propos":
+                                    afficher_apropos = True
+                                elif opt == "Options":
+                                    afficher_options = True
+                                elif opt == "Rejouer":
+                                    ui_state = UI_START
+                                    game = None
+                                    message_ui = ""
+                                    menu_ouvert = False
+                                    prenom_actif = True
+                                    victory_sound_played = False
+                                menu_ouvert = False
 
-        titre = police_menu.render("Choisis un mode", True, BLANC)
-        fenetre.blit(titre, (box.x + 70, box.y + 25))
+                # START : clic champ / clear / mode
+                if ui_state == UI_START:
+                    box = layout_start()
+
+                    if input_rect.collidepoint(x, y):
+                        prenom_actif = True
+                        play(S_CLICK, 0.6)
+                    elif clear_rect.collidepoint(x, y):
+                        prenom = ""
+                        prenom_actif = True
+                        play(S_CLICK, 0.6)
+
+                    for label, mode, rect in start_buttons:
+                        if rect.collidepoint(x, y):
+                            play(S_CLICK, 0.7)
+                            game = creer_partie(mode, prenom=prenom)
+                            if mode == "RM":
+                                ROBOT_MC.demarrer(game.catalogue)  # processus prêts avant le premier coup
+                            ui_state = UI_PLAY
+                            message_ui = ""
+                            menu_ouvert = False
+                            victory_sound_played = False
+                            break
 
-        lab = police.render("Ton prénom :", True, BLANC)
-        fenetre.blit(lab, (input_rect.x, input_rect.y - 30))
+                # RESULT : clic pour continuer
+                elif ui_state == UI_RESULT:
+                    ui_state = UI_PLAY
+                    message_ui = ""
+                    play(S_CLICK, 0.6)
 
-        pygame.draw.rect(fenetre, CARTE_COL, input_rect, border_radius=12)
-        pygame.draw.rect(
-            fenetre,
-            BOUTON_ACTIF if prenom_actif else VERT_NATURE,
-            input_rect,
-            width=2,
-            border_radius=12
-        )
-        fenetre.blit(police.render(prenom, True, NOIR), (input_rect.x + 12, input_rect.y + 12))
+                # ANIM : on ignore les clics (anti-spam)
+                elif ui_state == UI_ANIM:
+                    pass
 
-        pygame.draw.rect(fenetre, BOUTON, clear_rect, border_radius=12)
-        fenetre.blit(police_menu.render("×", True, NOIR), (clear_rect.x + 14, clear_rect.y + 4))
+                # END : écran victoire dédié avec boutons directs
+                elif ui_state == UI_END:
+                    panel = layout_victory_panel()
+                    if victory_replay_rect.collidepoint(x, y):
+                        play(S_CLICK, 0.7)
+                        ui_state = UI_START
+                        game = None
+                        message_ui = ""
+                        menu_ouvert = False
+                        prenom_actif = True
+                        victory_sound_played = False
+                    elif victory_quit_rect.collidepoint(x, y):
+                        play(S_CLICK, 0.6)
+                        running = False
+
+                # PLAY : clic carac si humain actif
+                elif ui_state == UI_PLAY and game is not None and not game.actif_est_robot() and not game.terminee:
+                    local_x = x - GAUCHE_W
+                    local_y = y - HAUT_H
+                    for label, key, rect in boutons_carac:
+                        if rect.collidepoint(local_x, local_y):
+                            play(S_CLICK, 0.7)
+
+                            game.appliquer_manche(key)
+                            message_ui = f"{label} : {fmt_val(game.derniere_val_actif)} vs {fmt_val(game.derniere_val_passif)} — {game.dernier_gagnant.nom} gagne"
+                            start_round_animation()
+                            break
+
+        PROFIL.fin("evenements", t)
+
+        # ============================================================
+        # ========================= AFFICHAGE =========================
+        # ============================================================
+
+        # Rendu par zones : une zone n'est redessinée que si l'état qu'elle affiche a changé
+        version = game.version if game is not None else 0
+        overlay_actif = afficher_regles or afficher_apropos or afficher_options or ui_state == UI_END
+        cle_overlays = (afficher_regles, afficher_apropos, afficher_options, ui_state == UI_END,
+                        (tuple(SETTINGS.values()), message_trace) if afficher_options else None)
+        tout_refaire = zones.a_redessiner("overlays", cle_overlays, ECRAN)
+        if tout_refaire:
+            # ouverture / fermeture / changement d'un overlay : tout l'écran est refait
+            zones.invalider(sauf=("overlays",))
+            fenetre.fill(FOND)
+
+        # overlay inchangé : ce qui est dessous est caché, rien à refaire
+        if tout_refaire or not overlay_actif:
+            # Titre + hamburger
+            if zones.a_redessiner("haut", (menu_ouvert,), ZONE_HAUT):
+                frame_haut.fill(VERT_NATURE)
+                texte_titre = rendre_texte(police_titre, "Défi Nature", BLANC)
+                frame_haut.blit(texte_titre, (LARGEUR // 2 - texte_titre.get_width() // 2, 20))
+
+                pygame.draw.rect(frame_haut, PANEL, bouton_menu, border_radius=8)
+                icone = rendre_texte(police_menu, "≡" if not menu_ouvert else "×", BLANC)
+                frame_haut.blit(icone, (bouton_menu.x + 13, bouton_menu.y + 4))
+                fenetre.blit(frame_haut, ZONE_HAUT)
+
+            # Menu gauche
+            cle_gauche = (menu_ouvert, ui_state == UI_START, game, version, PANNEAU_HISTORIQUE.cle())
+            if zones.a_redessiner("gauche", cle_gauche, ZONE_GAUCHE):
+                frame_gauche.fill(PANEL)
+                if menu_ouvert:
+                    for i, rect in enumerate(option_rects):
+                        pygame.draw.rect(frame_gauche, FOND, rect, border_radius=10)
+                        txt = rendre_texte(police, options[i], BLANC)
+                        frame_gauche.blit(txt, (rect.x + 18, rect.y + 12))
+                else:
+                    # AJOUT : Historique (quand menu fermé) pour ne pas chevaucher
+                    if ui_state != UI_START and game is not None:
+                        draw_history_panel(frame_gauche, game)
+                fenetre.blit(frame_gauche, ZONE_GAUCHE)
+
+            # Zone de jeu
+            cle_jeu = (ui_state, game, version, message_ui, anim_winner_index,
+                       SETTINGS.get("show_opponent_card", True))
+            if ui_state == UI_START:
+                cle_jeu += (prenom, prenom_actif)
+            if zones.a_redessiner("jeu", cle_jeu, ZONE_JEU):
+                frame_jeu.fill(PANEL)
+
+                # START
+                if ui_state == UI_START:
+                    box = layout_start()
+
+                    fenetre.blit(frame_jeu, ZONE_JEU)
+
+                    pygame.draw.rect(fenetre, PANEL, box, border_radius=16)
+                    pygame.draw.rect(fenetre, VERT_NATURE, box, width=3, border_radius=16)
+
+                    titre = rendre_texte(police_menu, "Choisis un mode", BLANC)
+                    fenetre.blit(titre, (box.x + 70, box.y + 25))
+
+                    lab = rendre_texte(police, "Ton prénom :", BLANC)
+                    fenetre.blit(lab, (input_rect.x, input_rect.y - 30))
+
+                    pygame.draw.rect(fenetre, CARTE_COL, input_rect, border_radius=12)
+                    pygame.draw.rect(
+                        fenetre,
+                        BOUTON_ACTIF if prenom_actif else VERT_NATURE,
+                        input_rect,
+                        width=2,
+                        border_radius=12
+                    )
+                    fenetre.blit(rendre_texte(police, prenom, NOIR), (input_rect.x + 12, input_rect.y + 12))
+
+                    pygame.draw.rect(fenetre, BOUTON, clear_rect, border_radius=12)
+                    fenetre.blit(rendre_texte(police_menu, "×", NOIR), (clear_rect.x + 14, clear_rect.y + 4))
+
+                    for label, mode, rect in start_buttons:
+                        dessiner_bouton(fenetre, rect, label, actif=True)
+
+                    hint = rendre_texte(police_petite, "Menu ≡ : Rejouer / Options / Règles / À propos / Quitter", BLANC)
+                    fenetre.blit(hint, (box.x + 70, box.bottom - 30))
+
+                # Jeu : cartes + boutons
+                elif game is not None:
+                    frame_j1.fill(PANEL)
+                    frame_j2.fill(PANEL)
+
+                    est_actif_j1 = (game.joueur_actif is game.joueurs[0])
+                    est_actif_j2 = (game.joueur_actif is game.joueurs[1])
+
+                    highlight_j1 = (ui_state == UI_ANIM and anim_winner_index == 0)
+                    highlight_j2 = (ui_state == UI_ANIM and anim_winner_index == 1)
+
+                    t = PROFIL.debut()
+                    draw_card(frame_j1, game.joueurs[0], est_actif_j1, highlight=highlight_j1)
+                    draw_card(frame_j2, game.joueurs[1], est_actif_j2, highlight=highlight_j2)
+                    PROFIL.fin("draw_card", t)
+
+                    frame_jeu.blit(frame_j1, (0, 0))
+                    frame_jeu.blit(frame_j2, (frame_j1.get_width() + 20, 0))
+
+                    # Bandeau tour
+                    pygame.draw.rect(frame_jeu, FOND, tour_bar_rect, border_radius=12)
+                    info = f"Tour de : {game.joueur_actif.nom}"
+                    if game.actif_est_robot():
+                        info += " (Robot)"
+                    txt_info = rendre_texte(police, info, BLANC)
+                    frame_jeu.blit(txt_info, (tour_bar_rect.x + 14, tour_bar_rect.y + 6))
+
+                    # Boutons carac : désactivés pendant ANIM/RESULT/END ou robot
+                    boutons_actifs = (ui_state == UI_PLAY and not game.actif_est_robot() and not game.terminee)
+                    for label, key, rect in boutons_carac:
+                        couleur = BOUTON_ACTIF if boutons_actifs else BOUTON
+                        pygame.draw.rect(frame_jeu, couleur, rect, border_radius=10)
+                        t = rendre_texte(police, label, NOIR)
+                        frame_jeu.blit(t, (rect.x + 20, rect.y + 12))
+
+                    # Message
+                    if message_ui:
+                        txt_msg = rendre_texte(police_petite, message_ui, BLANC)
+                        frame_jeu.blit(txt_msg, (20, frame_jeu.get_height() - 20))
+
+                    if ui_state == UI_RESULT:
+                        txt = rendre_texte(police_petite, "Clique pour continuer…", BOUTON_ACTIF)
+                        frame_jeu.blit(txt, (frame_jeu.get_width() - 210, frame_jeu.get_height() - 20))
+
+                    fenetre.blit(frame_jeu, ZONE_JEU)
 
-        for label, mode, rect in start_buttons:
-            dessiner_bouton(fenetre, rect, label, actif=True)
+                else:
+                    fenetre.blit(frame_jeu, ZONE_JEU)
 
-        hint = police_petite.render("Menu ≡ : Rejouer / Options / Règles / À propos / Quitter", True, BLANC)
-        fenetre.blit(hint, (box.x + 70, box.bottom - 30))
+            # ===================== OVERLAYS =====================
+            t = PROFIL.debut()
+            if afficher_regles:
+                draw_overlay_box("Règles du jeu", regles_texte)
 
-    else:
-        # Jeu : cartes + boutons
-        if game is not None:
-            est_actif_j1 = (game.joueur_actif is game.joueurs[0])
-            est_actif_j2 = (game.joueur_actif is game.joueurs[1])
-
-            highlight_j1 = (ui_state == UI_ANIM and anim_winner_index == 0)
-            highlight_j2 = (ui_state == UI_ANIM and anim_winner_index == 1)
-
-            draw_card(frame_j1, game.joueurs[0], est_actif_j1, highlight=highlight_j1)
-            draw_card(frame_j2, game.joueurs[1], est_actif_j2, highlight=highlight_j2)
-
-            frame_jeu.blit(frame_j1, (0, 0))
-            frame_jeu.blit(frame_j2, (frame_j1.get_width() + 20, 0))
-
-            # Bandeau tour
-            pygame.draw.rect(frame_jeu, FOND, tour_bar_rect, border_radius=12)
-            info = f"Tour de : {game.joueur_actif.nom}"
-            if game.actif_est_robot():
-                info += " (Robot)"
-            txt_info = police.render(info, True, BLANC)
-            frame_jeu.blit(txt_info, (tour_bar_rect.x + 14, tour_bar_rect.y + 6))
-
-            # Boutons carac : désactivés pendant ANIM/RESULT/END ou robot
-            boutons_actifs = (ui_state == UI_PLAY and not game.actif_est_robot() and not game.terminee)
-            for label, key, rect in boutons_carac:
-                couleur = BOUTON_ACTIF if boutons_actifs else BOUTON
-                pygame.draw.rect(frame_jeu, couleur, rect, border_radius=10)
-                t = police.render(label, True, NOIR)
-                frame_jeu.blit(t, (rect.x + 20, rect.y + 12))
-
-            # Message
-            if message_ui:
-                txt_msg = police_petite.render(message_ui, True, BLANC)
-                frame_jeu.blit(txt_msg, (20, frame_jeu.get_height() - 20))
-
-            if ui_state == UI_RESULT:
-                txt = police_petite.render("Clique pour continuer…", True, BOUTON_ACTIF)
-                frame_jeu.blit(txt, (frame_jeu.get_width() - 210, frame_jeu.get_height() - 20))
-
-        # blit principal
-        fenetre.blit(frame_haut, (0, 0))
-        fenetre.blit(frame_gauche, (0, HAUT_H))
-        fenetre.blit(frame_jeu, (GAUCHE_W, HAUT_H))
-
-    # ===================== OVERLAYS =====================
-    if afficher_regles:
-        draw_overlay_box("Règles du jeu", regles_texte)
-
-    if afficher_apropos:
-        draw_overlay_box("À propos / Robots", apropos_texte)
-
-    if afficher_options:
-        draw_options_overlay()
-
-    # ===================== ECRAN VICTOIRE DEDIE =====================
-    if ui_state == UI_END:
-        if game is not None and game.terminee and (not victory_sound_played):
-            play(S_VICTORY, 0.9)
-            victory_sound_played = True
-
-        overlay = pygame.Surface((LARGEUR, HAUTEUR), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        fenetre.blit(overlay, (0, 0))
-
-        panel = layout_victory_panel()
-        pygame.draw.rect(fenetre, PANEL, panel, border_radius=18)
-        pygame.draw.rect(fenetre, VERT_NATURE, panel, 3, border_radius=18)
-
-        titre = police_menu.render("Victoire !", True, BLANC)
-        fenetre.blit(titre, (panel.x + 30, panel.y + 25))
-
-        if game is not None and game.gagnant is not None:
-            msg = f"🏆 {game.gagnant.nom} a gagné la partie"
-            tmsg = police.render(msg, True, BOUTON_ACTIF)
-            fenetre.blit(tmsg, (panel.x + 30, panel.y + 80))
-
-            j1, j2 = game.joueurs[0], game.joueurs[1]
-            s1 = police.render(f"{j1.nom} : {len(j1.cartes)} cartes", True, BLANC)
-            s2 = police.render(f"{j2.nom} : {len(j2.cartes)} cartes", True, BLANC)
-            fenetre.blit(s1, (panel.x + 30, panel.y + 125))
-            fenetre.blit(s2, (panel.x + 30, panel.y + 155))
-        else:
-            tmsg = police.render("Partie terminée", True, BOUTON_ACTIF)
-            fenetre.blit(tmsg, (panel.x + 30, panel.y + 80))
+            if afficher_apropos:
+                draw_overlay_box("À propos / Robots", apropos_texte)
 
-        dessiner_bouton(fenetre, victory_replay_rect, "Rejouer", actif=True)
-        dessiner_bouton(fenetre, victory_quit_rect, "Quitter", actif=False)
+            if afficher_options:
+                draw_options_overlay()
 
-        hint = police_petite.render("Astuce : Menu ≡ fonctionne aussi", True, BLANC)
-        fenetre.blit(hint, (panel.x + 30, panel.bottom - 30))
+            # ===================== ECRAN VICTOIRE DEDIE =====================
+            if ui_state == UI_END:
+                if game is not None and game.terminee and (not victory_sound_played):
+                    play(S_VICTORY, 0.9)
+                    victory_sound_played = True
 
-    pygame.display.flip()
-    clock.tick(60)
+                fenetre.blit(calque(LARGEUR, HAUTEUR, (0, 0, 0, 180)), (0, 0))
 
-pygame.quit()
-sys.exit()
+                panel = layout_victory_panel()
+                pygame.draw.rect(fenetre, PANEL, panel, border_radius=18)
+                pygame.draw.rect(fenetre, VERT_NATURE, panel, 3, border_radius=18)
+
+                titre = rendre_texte(police_menu, "Victoire !", BLANC)
+                fenetre.blit(titre, (panel.x + 30, panel.y + 25))
+
+                if game is not None and game.gagnant is not None:
+                    msg = f"🏆 {game.gagnant.nom} a gagné la partie"
+                    tmsg = rendre_texte(police, msg, BOUTON_ACTIF)
+                    fenetre.blit(tmsg, (panel.x + 30, panel.y + 80))
+
+                    j1, j2 = game.joueurs[0], game.joueurs[1]
+                    s1 = rendre_texte(police, f"{j1.nom} : {len(j1.cartes)} cartes", BLANC)
+                    s2 = rendre_texte(police, f"{j2.nom} : {len(j2.cartes)} cartes", BLANC)
+                    fenetre.blit(s1, (panel.x + 30, panel.y + 125))
+                    fenetre.blit(s2, (panel.x + 30, panel.y + 155))
+                else:
+                    tmsg = rendre_texte(police, "Partie terminée", BOUTON_ACTIF)
+                    fenetre.blit(tmsg, (panel.x + 30, panel.y + 80))
+
+                dessiner_bouton(fenetre, victory_replay_rect, "Rejouer", actif=True)
+                dessiner_bouton(fenetre, victory_quit_rect, "Quitter", actif=False)
+
+                hint = rendre_texte(police_petite, "Astuce : Menu ≡ fonctionne aussi", BLANC)
+                fenetre.blit(hint, (panel.x + 30, panel.bottom - 30))
+            PROFIL.fin("overlays", t)
+
+        # Profileur : par-dessus tout, redessiné si ses valeurs ou ce qui est dessous ont changé
+        if PROFIL.actif:
+            recouvert = zones.touche(RECT_PROFIL)
+            cle_profil = (round(mesure_images.temps_image_ms, 2),
+                          tuple(round(PROFIL.moyennes_ms.get(n, 0.0), 3) for n in SECTIONS_PROFIL))
+            if zones.a_redessiner("profileur", cle_profil, RECT_PROFIL) or recouvert:
+                draw_profiler_overlay()
+
+        t = PROFIL.debut()
+        rects = zones.rects_modifies()
+        if ecran_entier:
+            pygame.display.flip()
+            ecran_entier = False
+        elif rects:
+            pygame.display.update(rects)
+        PROFIL.fin("affichage", t)
+        mesure_images.fin()
+        PROFIL.fin_image()
+
+        t = PROFIL.debut()
+        evenements = attendre_evenements()
+        PROFIL.fin("attente", t)
+
+    ROBOT_MC.arreter()
+    pygame.quit()
+    sys.exit()
+
+
+if __name__ == "__main__":
+    main()
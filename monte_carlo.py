@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+Robot M : recherche Monte-Carlo à temps borné (sans Pygame, sans dépendance).
+
+À son tour, le robot évalue chaque caractéristique en simulant la suite de la
+partie (jusqu'à la fin ou manches_max manches, notée alors à la part de
+cartes). Il ne lit que l'information publique (GameState.cartes_vues) : sa
+carte visible, la taille des paquets et le détenteur des cartes déjà jouées.
+Chaque simulation tire les paquets cachés (cartes vues chez leur détenteur,
+cartes jamais jouées réparties au hasard), puis les deux joueurs suivent une
+politique rapide (rang de la valeur dans le catalogue). Pour chaque tirage,
+les trois caractéristiques sont simulées avec les mêmes nombres aléatoires ;
+celle qui a le meilleur score moyen est jouée.
+
+- anytime : l'échéance (budget_s) part dès l'appel ; la recherche s'arrête
+  à l'échéance ou après rollouts_max simulations, et a toujours une réponse ;
+- une décision ne copie pas les paquets : les cartes vues et un échantillon
+  d'au plus ECHANTILLON_NON_VUES cartes jamais jouées suffisent, car une
+  simulation ne tire que le haut des paquets (manches_max + 1 cartes) et le
+  nombre de cartes dessous, qu'elle n'atteint jamais. Le coût dépend du
+  nombre de cartes vues, pas de la taille du catalogue ;
+- processus > 1 : des processus (ProcessPoolExecutor) explorent en même
+  temps que le processus appelant, chacun avec ses tirages ; les compteurs
+  sont additionnés. Un processus en retard est simplement ignoré. Un
+  catalogue projeté (mmap) n'est pas copié : chaque processus projette le
+  même cache.
+"""
+
+import multiprocessing
+import random
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from catalogue import projeter_cache
+from moteur import CARACTERISTIQUES
+
+BUDGET_UI_S = 0.05         # interface : 50 ms par décision
+ROLLOUTS_SIMULATION = 300  # simulations en lot : nombre fixe (parties rejouables)
+MANCHES_MAX_ROLLOUT = 16   # horizon : au-delà, une simulation est notée à la part de cartes
+ECHANTILLON_NON_VUES = 512  # cartes jamais jouées tirées par décision, où puisent les simulations
+
+
+def _colonnes(catalogue):
+    """Colonnes des caractéristiques et leurs valeurs distinctes triées (politique rapide)."""
+    return ([catalogue.colonne(c) for c in CARACTERISTIQUES],
+            [catalogue.valeurs_triees(c) for c in CARACTERISTIQUES])
+
+
+def _choix_rapide(carte, colonnes, domaines):
+    """Caractéristique (indice) où la carte a le meilleur rang relatif dans le catalogue."""
+    meilleur, score_max = 0, -1.0
+    for i, (colonne, valeurs) in enumerate(zip(colonnes, domaines)):
+        score = bisect_left(valeurs, colonne[carte]) / len(valeurs)
+        if score > score_max:
+            meilleur, score_max = i, score
+    return meilleur
+
+
+def _situation(game, rng, taille_echantillon):
+    """
+    Ce que sait le joueur actif : (sa carte visible, ses cartes vues, taille de son
+    paquet caché, cartes vues de l'adversaire, taille du paquet adverse, échantillon
+    de cartes jamais jouées). Seuls les tailles et le haut du paquet actif sont lus.
+    """
+    if game.cartes_vues is None:
+        raise ValueError("Robot M : partie créée sans cartes_vues=True")
+    i_actif = 0 if game.joueur_actif is game.joueurs[0] else 1
+    carte = game.joueur_actif.cartes[-1]
+    vues = [c for c in game.cartes_vues[i_actif] if c != carte]
+    return (carte, vues, len(game.joueur_actif.cartes) - 1,
+            list(game.cartes_vues[1 - i_actif]), len(game.joueur_passif.cartes),
+            game.tirer_non_vues(taille_echantillon, rng, exclue=carte))
+
+
+def _tirer_paquet(vues, n_cartes, non_vues, k, rng):
+    """
+    Paquet caché tiré au hasard : haut de paquet (k cartes au plus) + nombre de cartes
+    dessous. Une position tirée parmi les len(vues) premières est une carte vue, les
+    autres prennent des cartes jamais jouées (non_vues, déjà mélangées).
+    """
+    k = min(k, n_cartes)
+    haut = [vues[i] if i < len(vues) else non_vues.pop()
+            for i in rng.sample(range(n_cartes), k)]
+    return haut, n_cartes - k
+
+
+def _inserer(paquet, reste, carte, alea):
+    """Réinsertion à une position uniforme parmi len + 1 ; renvoie le nouveau nombre de cartes dessous."""
+    pos = int(alea() * (len(paquet) + reste + 1))
+    if pos < reste:
+        return reste + 1  # sous le haut du paquet : hors de portée de la simulation
+    paquet.insert(pos - reste, carte)
+    return reste
+
+
+def _simuler(situation, c0, colonnes, domaines, politique, rng, manches_max):
+    """
+    Joue la fin de la partie (le robot actif commence avec la caractéristique c0).
+    Renvoie 1 si le robot gagne, 0 s'il perd, sa part des cartes à manches_max.
+    Mêmes règles que GameState.appliquer_manche (égalité perdue par l'actif,
+    réinsertion à une position uniforme, tour alterné).
+    """
+    carte_robot, vues_robot, n_robot, vues_adverses, n_adverse, echantillon = situation
+    # chaque paquet perd au plus une carte de son haut par manche :
+    # manches_max + 1 cartes suffisent, le dessous n'est jamais atteint
+    k = manches_max + 1
+    non_vues = rng.sample(echantillon, min(len(echantillon), 2 * k))
+    haut_robot, reste_robot = _tirer_paquet(vues_robot, n_robot, non_vues, k, rng)
+    haut_robot.append(carte_robot)
+    paquets = [haut_robot, None]
+    paquets[1], reste_adverse = _tirer_paquet(vues_adverses, n_adverse, non_vues, k, rng)
+    restes = [reste_robot, reste_adverse]
+    alea = rng.random
+
+    actif, c = 0, c0
+    for manche in range(manches_max):
+        passif = 1 - actif
+        if manche:
+            carte = paquets[actif][-1]
+            c = politique.get(carte)
+            if c is None:
+                c = politique[carte] = _choix_rapide(carte, colonnes, domaines)
+        colonne = colonnes[c]
+        if colonne[paquets[actif][-1]] > colonne[paquets[passif][-1]]:
+            gagnant, perdant = actif, passif
+        else:
+            gagnant, perdant = passif, actif
+
+        paquet = paquets[gagnant]
+        restes[gagnant] = _inserer(paquet, restes[gagnant], paquets[perdant].pop(), alea)
+        restes[gagnant] = _inserer(paquet, restes[gagnant], paquet.pop(), alea)
+
+        if not paquets[perdant] and not restes[perdant]:
+            return 1.0 if gagnant == 0 else 0.0
+        actif = passif
+
+    n_robot = len(paquets[0]) + restes[0]
+    return n_robot / (n_robot + len(paquets[1]) + restes[1])
+
+
+def _explorer(situation, colonnes, domaines, politique, echeance, rollouts_max, graine, manches_max):
+    """
+    Tirages successifs de l'ordre caché ; pour chaque tirage, les trois
+    caractéristiques sont simulées avec les mêmes nombres aléatoires (échantillons
+    appariés : seule la caractéristique de départ diffère). Renvoie (visites, sommes).
+    """
+    rng = random.Random(graine)
+    n = len(CARACTERISTIQUES)
+    visites, sommes = [0] * n, [0.0] * n
+    total = 0
+    # au moins un tirage, même si le budget est déjà écoulé
+    while total == 0 or ((rollouts_max is None or total < rollouts_max)
+                         and (echeance is None or time.perf_counter() < echeance)):
+        graine_tirage = rng.getrandbits(64)
+        for c in range(n):
+            sommes[c] += _simuler(situation, c, colonnes, domaines, politique,
+                                  random.Random(graine_tirage), manches_max)
+            visites[c] += 1
+        total += n
+    return visites, sommes
+
+
+# processus de l'ensemble : catalogue reçu une fois, à la création
+_COLONNES_PROCESSUS = None
+_POLITIQUE_PROCESSUS = {}
+
+
+def _initialiser_processus(source, catalogue):
+    """source : Catalogue.source d'un catalogue projeté (reprojeté ici), sinon catalogue copié."""
+    global _COLONNES_PROCESSUS
+    if source is not None:
+        catalogue = projeter_cache(source)
+    # valeurs triées calculées dès la création, pas pendant le premier coup
+    _COLONNES_PROCESSUS = _colonnes(catalogue) if catalogue is not None else None
+    _POLITIQUE_PROCESSUS.clear()
+
+
+def _explorer_processus(situation, budget_s, rollouts_max, graine, manches_max):
+    if _COLONNES_PROCESSUS is None:
+        return None  # cache remplacé entre-temps : ce processus ne participe pas
+    colonnes, domaines = _COLONNES_PROCESSUS
+    echeance = None if budget_s is None else time.perf_counter() + budget_s
+    return _explorer(situation, colonnes, domaines, _POLITIQUE_PROCESSUS,
+                     echeance, rollouts_max, graine, manches_max)
+
+
+def _rien():
+    return None
+
+
+class RobotMonteCarlo:
+    """
+    Robot M. budget_s (secondes) et/ou rollouts_max bornent chaque décision ;
+    avec budget_s=None et une graine de partie fixée, les choix sont reproductibles.
+    """
+    def __init__(self, budget_s=BUDGET_UI_S, rollouts_max=None, processus=1,
+                 manches_max=MANCHES_MAX_ROLLOUT):
+        if budget_s is None and rollouts_max is None:
+            raise ValueError("Robot M : il faut un budget_s ou un rollouts_max")
+        self.budget_s = budget_s
+        self.rollouts_max = rollouts_max
+        self.processus = max(1, int(processus))
+        self.manches_max = manches_max
+        self.derniere_decision = None  # {caracteristique: (simulations, score moyen)} du dernier choix
+        self._politique = {}  # carte -> caractéristique de la politique rapide (par catalogue)
+        self._catalogue_politique = None
+        self._pool = None
+        self._catalogue_pool = None
+
+    def __getstate__(self):
+        # envoyé à un autre processus (simulation) : sans l'ensemble de processus
+        etat = self.__dict__.copy()
+        etat["_pool"] = etat["_catalogue_pool"] = etat["_catalogue_politique"] = None
+        etat["_politique"] = {}
+        return etat
+
+    def demarrer(self, catalogue):
+        """Crée l'ensemble de processus pour ce catalogue et le réveille (appel non bloquant)."""
+        if self.processus <= 1:
+            return
+        if self._pool is not None and self._catalogue_pool is catalogue:
+            return
+        self.arreter()
+        # catalogue projeté : les processus projettent le même cache (pages partagées)
+        source = catalogue.source if catalogue.projete else None
+        # "spawn" : pas de fork d'un processus qui a déjà des threads (interface, audio...)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.processus - 1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialiser_processus,
+            initargs=(source, None if source is not None else catalogue),
+        )
+        self._catalogue_pool = catalogue
+        for _ in range(self.processus - 1):
+            self._pool.submit(_rien)
+
+    def arreter(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+        self._catalogue_pool = None
+
+    def choisir(self, game):
+        """
+        Caractéristique jouée par le joueur actif de game (qui n'est pas modifié).
+        La partie doit suivre les cartes vues (GameState(..., cartes_vues=True)).
+        """
+        echeance = None if self.budget_s is None else time.perf_counter() + self.budget_s
+        # une seule valeur tirée du générateur de la partie, quel que soit le nombre de simulations
+        graine = game.rng.getrandbits(64)
+        rng = random.Random(graine)
+        situation = _situation(game, rng, max(ECHANTILLON_NON_VUES, 2 * (self.manches_max + 1)))
+        graine = rng.getrandbits(64)
+        colonnes, domaines = _colonnes(game.catalogue)
+        if self._catalogue_politique is not game.catalogue:
+            self._politique = {}
+            self._catalogue_politique = game.catalogue
+
+        futures = []
+        rollouts = self.rollouts_max
+        if self.processus > 1:
+            self.demarrer(game.catalogue)
+            if rollouts is not None:
+                rollouts = -(-rollouts // self.processus)
+            # marge pour renvoyer les compteurs avant l'échéance
+            budget = None if self.budget_s is None else 0.8 * self.budget_s
+            futures = [self._pool.submit(_explorer_processus, situation, budget, rollouts,
+                                         graine + i + 1, self.manches_max)
+                       for i in range(self.processus - 1)]
+
+        visites, sommes = _explorer(situation, colonnes, domaines, self._politique,
+                                    echeance, rollouts, graine, self.manches_max)
+
+        if futures:
+            timeout = None if echeance is None else max(0.0, echeance - time.perf_counter())
+            finis, _ = wait(futures, timeout=timeout)
+            for f in finis:
+                if f.exception() is None and f.result() is not None:
+                    v, s = f.result()
+                    visites = [a + b for a, b in zip(visites, v)]
+                    sommes = [a + b for a, b in zip(sommes, s)]
+
+        moyennes = [s / v if v else 0.0 for v, s in zip(visites, sommes)]
+        self.derniere_decision = dict(zip(CARACTERISTIQUES, zip(visites, moyennes)))
+        return CARACTERISTIQUES[max(range(len(CARACTERISTIQUES)), key=moyennes.__getitem__)]
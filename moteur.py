@@ -0,0 +1,702 @@
+# -*- coding: utf-8 -*-
+"""
+Moteur du jeu Défi Nature (règles, joueurs, robots, données).
+
+Ce module n'importe pas Pygame : il peut être utilisé seul (simulations,
+robots, outils) sans ouvrir de fenêtre ni de périphérique audio.
+L'interface graphique se trouve dans main.py.
+"""
+
+import copy
+import hashlib
+import random
+import warnings
+from array import array
+from collections import deque
+
+# AJOUT (cerveau / données) : CSV animaux
+from pathlib import Path
+
+from catalogue import Animaux, Catalogue, SurveillantCSV, charger_csv
+from historique import HistoriqueManches
+from paquet import SEUIL_PAQUET, Paquet
+from statistiques import IndexRangs, MedianeCourante
+
+CARACTERISTIQUES = ("poids", "longueur", "longevite")
+
+# ============================================================
+# ======================= CERVEAU DU JEU ======================
+# ============================================================
+
+# Les cartes (Animaux) et le catalogue sont dans catalogue.py :
+# une carte est un indice dans le catalogue, Animaux en est une vue.
+
+class Joueur:
+    """
+    Joueur : nom + pile d'indices de cartes (la carte visible est la dernière),
+    array('I') de 4 octets par carte (distribuer_cartes).
+    Pour les grands catalogues, la pile est un Paquet (paquet.py) :
+    réinsertion aléatoire en O(log n) au lieu de O(n) pour une liste.
+    """
+    def __init__(self, nom, cartes, catalogue, rng=None):
+        self.nom = nom
+        # générateur aléatoire de la partie (fixé par GameState)
+        self.rng = rng if rng is not None else random
+        if len(catalogue) >= SEUIL_PAQUET and not isinstance(cartes, Paquet):
+            cartes = Paquet(cartes)
+        self.cartes = cartes
+        self.catalogue = catalogue
+
+    def carte_visible(self):
+        # Sécurité : évite tout crash si le joueur n'a plus de cartes
+        if not self.cartes:
+            return None
+        return Animaux(self.catalogue, self.cartes[-1])
+
+    def enlever_carte(self):
+        return self.cartes.pop()
+
+    def ajouter_carte(self, carte):
+        # Réinsertion aléatoire (renvoie la position, pour le hash de GameState)
+        position = self.rng.randint(0, len(self.cartes))
+        self.cartes.insert(position, carte)
+        return position
+
+    def est_vaincu(self):
+        return len(self.cartes) == 0
+
+
+def distribuer_cartes(catalogue, rng=None):
+    """Mélange puis distribue la moitié des cartes (indices) à chaque joueur."""
+    if rng is None:
+        rng = random
+    cartes = array("I", range(len(catalogue)))
+    rng.shuffle(cartes)
+    milieu = len(cartes) // 2
+    return cartes[:milieu], cartes[milieu:]
+
+
+def choix_robot_aleatoire(rng=None):
+    """Robot A : choix d'une caractéristique au hasard."""
+    if rng is None:
+        rng = random
+    return rng.choice(["poids", "longueur", "longevite"])
+
+
+def choix_robot_intelligent(carte, medianes, rng=None):
+    """
+    Robot I : compare sa carte à une valeur de référence (médiane) issue
+    des cartes déjà jouées, et choisit la caractéristique la plus "forte" relativement.
+    medianes : dict caractéristique -> MedianeCourante (tenu à jour par GameState),
+    la lecture des trois médianes est donc en O(1).
+    """
+    if not len(medianes["poids"]):
+        return choix_robot_aleatoire(rng)
+
+    poids_m = medianes["poids"].valeur
+    longueur_m = medianes["longueur"].valeur
+    longevite_m = medianes["longevite"].valeur
+
+    scores = {
+        "poids": carte.poids / poids_m if poids_m > 0 else 0,
+        "longueur": carte.longueur / longueur_m if longueur_m > 0 else 0,
+        "longevite": carte.longevite / longevite_m if longevite_m > 0 else 0
+    }
+    return max(scores, key=scores.get)
+
+
+def choix_robot_probabiliste(carte, game):
+    """
+    Robot P : choisit la caractéristique qui a la plus forte probabilité de battre
+    la carte visible de l'adversaire (GameState.probabilites_victoire, O(log n)).
+    """
+    probabilites = game.probabilites_victoire(carte.index)
+    return max(probabilites, key=probabilites.get)
+
+
+MODES_ROBOT = ("A", "I", "P", "M")
+
+# Politiques de vérification des invariants (cf. GameState) :
+# - "complet" : vérification totale après chaque manche (O(n), pour déboguer) ;
+# - "echantillon" : vérification totale toutes les periode_invariants manches ;
+# - "incremental" : compteur + propriétaire de chaque carte, mis à jour à chaque transfert (O(1)) ;
+# - "aucun" : pas de vérification.
+INVARIANTS = ("complet", "echantillon", "incremental", "aucun")
+INVARIANTS_DEFAUT = "incremental"
+
+# Nombre de manches gardées en mémoire par l'historique (None = toutes)
+RETENTION_HISTORIQUE = 1000
+
+# Issue d'une partie arrêtée avant la fin (max_manches ou répétition d'état) :
+# "nul" (pas de gagnant) ou "cartes" (le joueur qui a le plus de cartes gagne).
+ISSUES_PLAFOND = ("nul", "cartes")
+
+# Répétitions d'état (repetitions_max) : nombre de manches récentes dont l'état est
+# retenu quand max_manches n'est pas fixé (sinon la fenêtre est max_manches)
+FENETRE_REPETITIONS = 50_000
+
+# Clé de Zobrist de la paire « dessus posée juste sur dessous » : hash((dessous, dessus)),
+# calculé en C (mélange xxHash des tuples, 64 bits, sans sel pour des entiers)
+_CLE_TOUR = hash((-1, -1))  # joueur 2 actif
+
+
+def choix_robot(mode, carte, game, robot_mc=None):
+    """
+    Choix du robot selon son mode ("A" aléatoire, "I" intelligent, "P" probabiliste,
+    "M" Monte-Carlo). robot_mc : monte_carlo.RobotMonteCarlo à utiliser pour "M"
+    (défaut : budget de l'interface, sans processus supplémentaire).
+    """
+    if mode == "A":
+        return choix_robot_aleatoire(game.rng)
+    if mode == "I":
+        if not game.medianes:
+            raise ValueError("Robot I : partie créée sans medianes=True")
+        return choix_robot_intelligent(carte, game.medianes, game.rng)
+    if mode == "P":
+        if game.index_rangs is None:
+            raise ValueError("Robot P : partie créée sans index_rangs=True")
+        return choix_robot_probabiliste(carte, game)
+    if mode == "M":
+        if robot_mc is None:
+            robot_mc = _robot_mc_defaut()
+        return robot_mc.choisir(game)
+    raise ValueError("Mode robot inconnu")
+
+
+_ROBOT_MC = None
+
+
+def _robot_mc_defaut():
+    global _ROBOT_MC
+    if _ROBOT_MC is None:
+        # import tardif : monte_carlo importe moteur
+        from monte_carlo import RobotMonteCarlo
+        _ROBOT_MC = RobotMonteCarlo()
+    return _ROBOT_MC
+
+
+class GameState:
+    """
+    Moteur du jeu (aucun affichage ici).
+
+    Règles :
+    - Deux joueurs possèdent chacun un ensemble de cartes (Animal).
+    - À chaque manche, le joueur actif choisit une caractéristique.
+    - La valeur strictement la plus élevée gagne la manche.
+    - En cas d'égalité, le joueur actif perd (règle strict >).
+    - Le gagnant récupère la carte adverse et les cartes sont réinsérées aléatoirement.
+    - La partie se termine lorsqu'un joueur n'a plus de cartes.
+    - Optionnel (simulations) : arrêt après max_manches manches, ou quand le même
+      état (paquets + joueur actif) revient repetitions_max fois ; l'issue suit
+      issue_plafond (ISSUES_PLAFOND). raison_fin vaut alors "plafond" ou "repetition".
+    - Optionnel (robot I) : medianes=True tient les médianes des cartes jouées.
+    - Optionnel (robots P et M) : cartes_vues=True suit l'information publique,
+      c'est-à-dire qui détient chaque carte déjà jouée (index_rangs=True l'implique).
+
+    Invariant :
+    - Aucune carte ne doit être perdue ou dupliquée (vérification interne,
+      selon la politique `invariants`, voir INVARIANTS).
+    """
+    def __init__(self, joueur1, joueur2, mode_robot=None,
+                 invariants=INVARIANTS_DEFAUT, periode_invariants=100,
+                 retention_historique=RETENTION_HISTORIQUE, fichier_historique=None,
+                 rng=None, max_manches=None, repetitions_max=None, issue_plafond="nul",
+                 index_rangs=False, cartes_vues=False, medianes=False):
+        self.joueurs = [joueur1, joueur2]
+        self.joueur_actif = joueur1
+        self.joueur_passif = joueur2
+
+        # None (PVP), "A" (robot aléatoire), "I" (robot intelligent), "P" (robot probabiliste),
+        # "M" (robot Monte-Carlo)
+        self.mode_robot = mode_robot
+
+        # générateur propre à la partie : deux parties ne se perturbent pas
+        # et une partie graine fixée se rejoue à l'identique
+        self.rng = rng if rng is not None else random.Random()
+        for j in self.joueurs:
+            j.rng = self.rng
+
+        self.catalogue = joueur1.catalogue
+        self.cartes_initiales = array("I", joueur1.cartes)
+        self.cartes_initiales.extend(joueur2.cartes)
+
+        # médianes courantes des cartes jouées (robot intelligent, sinon vide)
+        # (partie complète : valeurs possibles partagées par catalogue, pas recalculées)
+        self.medianes = {}
+        partie_complete = len(self.cartes_initiales) == len(self.catalogue)
+        for c in (CARACTERISTIQUES if medianes else ()):
+            if partie_complete:
+                self.medianes[c] = MedianeCourante(self.catalogue.valeurs_triees(c), triees=True)
+            else:
+                colonne = self.catalogue.colonne(c)
+                self.medianes[c] = MedianeCourante(colonne[i] for i in self.cartes_initiales)
+
+        # cartes vues : une carte jouée reste chez le gagnant de la manche jusqu'à
+        # ce qu'elle soit rejouée ; cartes_vues[i] = cartes vues que détient le joueur i
+        self._connue = None
+        self.cartes_vues = None
+        if cartes_vues or index_rangs:
+            self._connue = bytearray(len(self.catalogue))  # 0 = jamais jouée, sinon 1 + indice du détenteur
+            self.cartes_vues = ([], [])
+            self._position_vue = {}  # carte vue -> position dans cartes_vues[détenteur]
+
+        # index de rangs (robot P) : par caractéristique, cartes jamais jouées (groupe 0)
+        # et cartes jouées dont on sait qui les détient (groupe 1 + indice du joueur)
+        self.index_rangs = None
+        if index_rangs:
+            self._construire_index_rangs(partie_complete)
+
+        if invariants not in INVARIANTS:
+            raise ValueError(f"Politique d'invariants inconnue : {invariants}")
+        self.invariants = invariants
+        self.periode_invariants = max(1, int(periode_invariants))
+        self.n_manches = 0
+        # incrémenté à chaque modification de l'état (manche jouée, fin de partie) :
+        # l'UI ne redessine que si la version a changé
+        self.version = 0
+
+        # mode incrémental : nombre total de cartes + propriétaire de chaque carte
+        # (octet par indice du catalogue : 0 = absente, 1 = joueur 1, 2 = joueur 2)
+        self._total_cartes = len(self.cartes_initiales)
+        self._proprietaire = None
+        if invariants == "incremental":
+            self._proprietaire = bytearray(len(self.catalogue))
+            for i, j in enumerate(self.joueurs):
+                for c in j.cartes:
+                    assert not self._proprietaire[c], "ERREUR: duplication de cartes détectée"
+                    self._proprietaire[c] = i + 1
+
+        self.terminee = False
+        self.gagnant = None
+        self.raison_fin = None  # "victoire", "plafond" ou "repetition"
+
+        # garde-fous contre les parties sans fin
+        if issue_plafond not in ISSUES_PLAFOND:
+            raise ValueError(f"Issue de plafond inconnue : {issue_plafond}")
+        self.max_manches = max_manches
+        self.repetitions_max = repetitions_max
+        self.issue_plafond = issue_plafond
+        # la réinsertion étant aléatoire, un état répété n'est pas un vrai cycle :
+        # on compte les répétitions comme la règle des 3 répétitions aux échecs.
+        # L'état est résumé par un hash de Zobrist tenu à jour en O(1) par manche :
+        # XOR des clés des paires de cartes voisines de chaque paquet, entre deux
+        # sentinelles par paquet (bas, sommet), cf. _zobrist_deplacer.
+        # Les répétitions ne sont pas confirmées sur l'état réel (il faudrait le garder) :
+        # deux états différents de même hash 64 bits compteraient pour une répétition.
+        # Avec F états dans la fenêtre, ce risque est au plus F² / 2**65 par partie
+        # (moins de 1e-10 pour F = 100 000), et il faut repetitions_max - 1 telles
+        # collisions sur le même hash pour arrêter la partie à tort.
+        self._zobrist = None
+        if repetitions_max is not None:
+            n = len(self.catalogue)
+            self._bas, self._sommet = (n, n + 2), (n + 1, n + 3)
+            self._zobrist = self._hash_paquet(0) ^ self._hash_paquet(1)
+            # compteur par hash sur les `fenetre` derniers états seulement
+            self._fenetre = max_manches if max_manches is not None else FENETRE_REPETITIONS
+            self._etats_recents = deque([self._zobrist])
+            self._etats_vus = {self._zobrist: 1}
+
+        # infos de manche (pour UI)
+        self.derniere_carac = None
+        self.derniere_val_actif = None
+        self.derniere_val_passif = None
+        self.dernier_gagnant = None
+
+        # AJOUT : historique des manches (moteur)
+        # Stockage compact (historique.py) ; chaque entrée lue est un
+        # dict(actif, passif, carac, v_actif, v_passif, gagnant)
+        self.historique_manches = HistoriqueManches(
+            (joueur1.nom, joueur2.nom), self.catalogue, CARACTERISTIQUES,
+            retention=retention_historique, fichier=fichier_historique,
+        )
+
+    def _construire_index_rangs(self, partie_complete):
+        self.index_rangs = {}
+        for c in CARACTERISTIQUES:
+            if partie_complete:
+                valeurs, comptes = self.catalogue.valeurs_triees(c), self.catalogue.comptes_valeurs(c)
+            else:
+                colonne = self.catalogue.colonne(c)
+                compte = {}
+                for i in self.cartes_initiales:
+                    compte[colonne[i]] = compte.get(colonne[i], 0) + 1
+                valeurs = sorted(compte)
+                comptes = [compte[v] for v in valeurs]
+            self.index_rangs[c] = IndexRangs(valeurs, comptes, 1 + len(self.joueurs))
+
+    def _reveler(self, cartes, gagnant):
+        """Les cartes de la manche sont vues : elles passent dans le groupe de leur nouveau détenteur."""
+        i_gagnant = self.joueurs.index(gagnant)
+        groupe = 1 + i_gagnant
+        for carte in cartes:
+            avant = self._connue[carte]
+            if avant == groupe:
+                continue
+            if self.index_rangs is not None:
+                for c, index in self.index_rangs.items():
+                    index.deplacer(self.catalogue.colonne(c)[carte], avant, groupe)
+            if avant:
+                # retrait en O(1) : la dernière carte vue de l'ancien détenteur prend sa place
+                vues = self.cartes_vues[avant - 1]
+                position = self._position_vue[carte]
+                derniere = vues.pop()
+                if derniere != carte:
+                    vues[position] = derniere
+                    self._position_vue[derniere] = position
+            self._position_vue[carte] = len(self.cartes_vues[i_gagnant])
+            self.cartes_vues[i_gagnant].append(carte)
+            self._connue[carte] = groupe
+
+    def tirer_non_vues(self, k, rng, exclue=None):
+        """
+        k cartes de la partie jamais jouées (sauf exclue) tirées au hasard, sans remise
+        (moins si elles sont moins nombreuses). Nécessite cartes_vues=True ; O(k) en
+        moyenne tant que la moitié des cartes n'a pas été jouée (tirage avec rejet).
+        """
+        cartes, connue = self.cartes_initiales, self._connue
+        n_non_vues = (len(cartes) - len(self.cartes_vues[0]) - len(self.cartes_vues[1])
+                      - (exclue is not None and not connue[exclue]))
+        k = min(k, n_non_vues)
+        if 2 * n_non_vues < len(cartes):
+            return rng.sample([c for c in cartes if not connue[c] and c != exclue], k)
+        tirees = {}  # dict : ordre d'insertion, donc tirage reproductible
+        while len(tirees) < k:
+            c = cartes[rng.randrange(len(cartes))]
+            if not connue[c] and c != exclue:
+                tirees[c] = None
+        return list(tirees)
+
+    def probabilites_victoire(self, carte):
+        """
+        Probabilité, par caractéristique, que la carte `carte` (indice) du joueur actif
+        batte la carte visible de l'adversaire. Une carte déjà jouée est chez son
+        détenteur connu ; les cartes jamais jouées (sauf `carte`) sont supposées
+        réparties au hasard. Nécessite index_rangs=True ; O(log n) par caractéristique.
+        """
+        groupe = 1 + self.joueurs.index(self.joueur_passif)
+        n_adverse = len(self.joueur_passif.cartes)
+        tailles = self.index_rangs[CARACTERISTIQUES[0]].tailles
+        non_vues = tailles[0] - (self._connue[carte] == 0)
+        # part des cartes jamais jouées qui sont chez l'adversaire
+        part = max(0, n_adverse - tailles[groupe]) / non_vues if non_vues else 0.0
+
+        probabilites = {}
+        for c, index in self.index_rangs.items():
+            v = self.catalogue.colonne(c)[carte]
+            battues = index.inferieures(v, groupe) + part * index.inferieures(v, 0)
+            probabilites[c] = battues / n_adverse if n_adverse else 0.0
+        return probabilites
+
+    def actif_est_robot(self):
+        return self.mode_robot is not None and self.joueur_actif.nom == "Robot"
+
+    def appliquer_manche(self, caracteristique):
+        if self.terminee:
+            return
+
+        # sécurité
+        if not self.joueur_actif.cartes or not self.joueur_passif.cartes:
+            return
+
+        carte_active = self.joueur_actif.cartes[-1]
+        carte_adverse = self.joueur_passif.cartes[-1]
+
+        colonne = self.catalogue.colonne(caracteristique)
+        v1 = colonne[carte_active]
+        v2 = colonne[carte_adverse]
+
+        # règle : strictement supérieur pour gagner, sinon actif perd
+        if v1 > v2:
+            gagnant, perdant = self.joueur_actif, self.joueur_passif
+        else:
+            gagnant, perdant = self.joueur_passif, self.joueur_actif
+
+        # transfert + réinsertion aléatoire
+        carte_perdue = perdant.enlever_carte()
+        position = gagnant.ajouter_carte(carte_perdue)
+        if self._zobrist is not None:
+            self._zobrist_deplacer(perdant, gagnant, carte_perdue, position)
+
+        carte_jouee = gagnant.enlever_carte()
+        position = gagnant.ajouter_carte(carte_jouee)
+        if self._zobrist is not None:
+            self._zobrist_deplacer(gagnant, gagnant, carte_jouee, position)
+
+        for c, mediane in self.medianes.items():
+            colonne = self.catalogue.colonne(c)
+            mediane.ajouter(colonne[carte_active])
+            mediane.ajouter(colonne[carte_adverse])
+        if self._connue is not None:
+            self._reveler((carte_active, carte_adverse), gagnant)
+        self.n_manches += 1
+        self._verifier_manche(gagnant, perdant, carte_perdue, carte_jouee)
+
+        self.derniere_carac = caracteristique
+        self.derniere_val_actif = v1
+        self.derniere_val_passif = v2
+        self.dernier_gagnant = gagnant
+
+        # AJOUT : log de manche (avant le swap de tour)
+        i_actif = 0 if self.joueur_actif is self.joueurs[0] else 1
+        self.historique_manches.ajouter(
+            carte_active,
+            carte_adverse,
+            CARACTERISTIQUES.index(caracteristique),
+            i_actif,
+            i_actif if gagnant is self.joueur_actif else 1 - i_actif,
+        )
+        self.version += 1
+
+        if perdant.est_vaincu():
+            self._terminer(gagnant, "victoire")
+            return
+
+        # on change le tour du joueur
+        self.joueur_actif, self.joueur_passif = self.joueur_passif, self.joueur_actif
+
+        if self.max_manches is not None and self.n_manches >= self.max_manches:
+            self._terminer_sans_vainqueur("plafond")
+        elif self.repetitions_max is not None:
+            self._compter_etat()
+
+    def _hash_paquet(self, j):
+        """Hash de Zobrist du paquet du joueur j, recalculé en entier (O(n))."""
+        h = 0
+        dessous = self._bas[j]
+        for carte in self.joueurs[j].cartes:
+            h ^= hash((dessous, carte))
+            dessous = carte
+        return h ^ hash((dessous, self._sommet[j]))
+
+    def _zobrist_deplacer(self, source, cible, carte, position):
+        """Carte prise au sommet de source puis insérée à `position` dans cible : mise à jour O(1)."""
+        cartes = cible.cartes
+        n = len(cartes)
+        if source is cible and position == n - 1:
+            return  # reposée au sommet : paquet inchangé
+        j = 0 if source is self.joueurs[0] else 1
+        # retrait du sommet : (dessous, carte, sommet) -> (dessous, sommet)
+        dessous = source.cartes[-1] if source.cartes else self._bas[j]
+        sommet = self._sommet[j]
+        h = hash((dessous, carte)) ^ hash((carte, sommet)) ^ hash((dessous, sommet))
+        # insertion : (gauche, droite) -> (gauche, carte, droite)
+        j = 0 if cible is self.joueurs[0] else 1
+        gauche = cartes[position - 1] if position else self._bas[j]
+        droite = cartes[position + 1] if position < n - 1 else self._sommet[j]
+        h ^= hash((gauche, droite)) ^ hash((gauche, carte)) ^ hash((carte, droite))
+        self._zobrist ^= h
+
+    def hash_etat(self):
+        """Hash 64 bits de cle_etat() (Zobrist), tenu à jour si repetitions_max est fixé."""
+        return self._zobrist ^ (_CLE_TOUR if self.joueur_actif is self.joueurs[1] else 0)
+
+    def _compter_etat(self):
+        """Compte l'état courant dans la fenêtre ; arrêt à repetitions_max occurrences."""
+        cle = self.hash_etat()
+        recents = self._etats_recents
+        recents.append(cle)
+        if len(recents) > self._fenetre:
+            ancienne = recents.popleft()
+            reste = self._etats_vus[ancienne] - 1
+            if reste:
+                self._etats_vus[ancienne] = reste
+            else:
+                del self._etats_vus[ancienne]
+        vu = self._etats_vus.get(cle, 0) + 1
+        self._etats_vus[cle] = vu
+        if vu >= self.repetitions_max:
+            self._terminer_sans_vainqueur("repetition")
+
+    def _terminer(self, gagnant, raison):
+        self.terminee = True
+        self.gagnant = gagnant
+        self.raison_fin = raison
+        self.historique_manches.fermer()
+
+    def _terminer_sans_vainqueur(self, raison):
+        """Arrêt forcé : match nul ou victoire au nombre de cartes (issue_plafond)."""
+        gagnant = None
+        if self.issue_plafond == "cartes":
+            n1, n2 = len(self.joueurs[0].cartes), len(self.joueurs[1].cartes)
+            if n1 != n2:
+                gagnant = self.joueurs[0] if n1 > n2 else self.joueurs[1]
+        self._terminer(gagnant, raison)
+
+    def copier(self):
+        """
+        Copie indépendante de la partie (paquets = listes d'entiers) ;
+        le catalogue et les valeurs possibles des médianes, immuables, sont partagés.
+        """
+        memo = {id(self.catalogue): self.catalogue}
+        for mediane in self.medianes.values():
+            memo[id(mediane.valeurs)] = mediane.valeurs
+        for index in (self.index_rangs or {}).values():
+            memo[id(index.valeurs)] = index.valeurs
+        return copy.deepcopy(self, memo)
+
+    def cle_etat(self):
+        """Clé hachable de l'état : (paquet joueur 1, paquet joueur 2, index du joueur actif)."""
+        i_actif = 0 if self.joueur_actif is self.joueurs[0] else 1
+        return tuple(self.joueurs[0].cartes), tuple(self.joueurs[1].cartes), i_actif
+
+    def _verifier_manche(self, gagnant, perdant, carte_perdue, carte_jouee):
+        """Applique la politique d'invariants après une manche."""
+        if self.invariants == "incremental":
+            i_gagnant = 1 if gagnant is self.joueurs[0] else 2
+            i_perdant = 3 - i_gagnant
+            assert self._proprietaire[carte_perdue] == i_perdant, (
+                "ERREUR: carte disparue ou carte inconnue apparue"
+            )
+            self._proprietaire[carte_perdue] = i_gagnant
+            assert self._proprietaire[carte_jouee] == i_gagnant, (
+                "ERREUR: carte disparue ou carte inconnue apparue"
+            )
+            assert len(gagnant.cartes) + len(perdant.cartes) == self._total_cartes, (
+                "ERREUR: nombre total de cartes a changé"
+            )
+        elif self.invariants == "complet":
+            self._verifier_invariants()
+        elif self.invariants == "echantillon":
+            if self.n_manches % self.periode_invariants == 0:
+                self._verifier_invariants()
+
+    def _verifier_invariants(self):
+        """Vérification complète (O(n)) : toujours disponible pour déboguer."""
+        toutes = []
+        for j in self.joueurs:
+            toutes.extend(j.cartes)
+
+        assert len(toutes) == len(self.cartes_initiales), "ERREUR: nombre total de cartes a changé"
+        assert len(set(toutes)) == len(toutes), "ERREUR: duplication de cartes détectée"
+        assert set(toutes) == set(self.cartes_initiales), (
+            "ERREUR: carte disparue ou carte inconnue apparue"
+        )
+
+
+# -------------------------------------------------------------------
+# AJOUT (cerveau / données) : chargement CSV robuste + fallback
+# -------------------------------------------------------------------
+
+def _trouver_racine_projet():
+    """
+    Retourne un Path de base pour retrouver /data même si on exécute depuis ailleurs.
+    - si __file__ existe : dossier du script
+    - sinon : dossier courant
+    """
+    try:
+        return Path(__file__).resolve().parent
+    except Exception:
+        return Path.cwd()
+
+
+def charger_animaux_csv(path_csv):
+    """
+    Charge des animaux depuis un CSV (catalogue.charger_csv).
+    - Délimiteur ';', ',' ou tabulation, détecté sur l'en-tête.
+    - En-tête attendu : nom, poids, longueur, longevite.
+    - Les lignes invalides sont comptées dans RAPPORT_CSV (et signalées), pas ignorées en silence.
+    - Cache binaire à côté du CSV (data/animaux.csv.bin), reconstruit si le CSV change.
+    Retourne un Catalogue (vide si échec).
+    """
+    global RAPPORT_CSV
+    catalogue, RAPPORT_CSV = charger_csv(path_csv)
+    if RAPPORT_CSV.rejetees:
+        warnings.warn(str(RAPPORT_CSV), stacklevel=2)
+    return catalogue if catalogue is not None else Catalogue([], [], [], [])
+
+
+# Catalogue par défaut (colonnes, cf. catalogue.py), remplacé par data/animaux.csv s'il existe
+LISTE_ANIMAUX = Catalogue.depuis_lignes([
+    ("aigle_royal", 4.8, 84, 25),
+    ("cobra_royal", 10, 400, 22),
+    ("corail_rouge", 2, 40, 60),
+    ("dragon_de_komodo", 165, 310, 53),
+    ("elephant_d_afrique", 5000, 600, 65),
+    ("lion_d_afrique", 189, 210, 18),
+    ("loup_rouge", 25, 110, 13),
+    ("merou_golfe", 90, 198, 48),
+    ("panda_geant", 97, 170, 22),
+    ("panda_roux", 5, 57, 10),
+    ("protee_anguillard", 0.02, 25, 69),
+    ("raie_manta", 1500, 550, 19),
+    ("requin_marteau_halicorne", 152, 330, 35),
+    ("tapir", 200, 212, 30),
+    ("tigre_de_siberie", 300, 230, 17),
+    ("tortue_verte", 175, 100, 70),
+])
+
+_RACINE = _trouver_racine_projet()
+_CSV_PATH = _RACINE / "data" / "animaux.csv"
+RAPPORT_CSV = None  # bilan du dernier chargement CSV (catalogue.RapportChargement)
+_animaux_csv = charger_animaux_csv(_CSV_PATH) if _CSV_PATH.exists() else None
+if _animaux_csv:
+    LISTE_ANIMAUX = _animaux_csv
+
+# rechargement à chaud de data/animaux.csv (cf. recharger_catalogue)
+SURVEILLANT_CSV = SurveillantCSV(_CSV_PATH, LISTE_ANIMAUX)
+
+
+def recharger_catalogue():
+    """
+    Si data/animaux.csv a changé : LISTE_ANIMAUX est remplacé pour les parties
+    créées ensuite (les parties en cours gardent leur catalogue).
+    Renvoie le DiffCatalogue appliqué, ou None.
+    """
+    global LISTE_ANIMAUX, RAPPORT_CSV
+    resultat = SURVEILLANT_CSV.verifier()
+    if resultat is None:
+        return None
+    LISTE_ANIMAUX, RAPPORT_CSV, diff = resultat
+    if RAPPORT_CSV.rejetees:
+        warnings.warn(str(RAPPORT_CSV), stacklevel=2)
+    return diff
+
+
+def graine_enfant(graine, i):
+    """
+    Graine de la i-ème partie d'une série de graine `graine` : ne dépend
+    que de (graine, i), pas du découpage en lots ni du nombre de processus.
+    """
+    h = hashlib.blake2b(f"{graine}:{i}".encode(), digest_size=8)
+    return int.from_bytes(h.digest(), "little")
+
+
+def creer_partie(mode, prenom="Humain", seed=None, **options):
+    """
+    Crée une partie ("PVP", "RA", "RI", "RP" ou "RM").
+    seed : graine du générateur de la partie (None = aléatoire).
+    options : paramètres transmis à GameState (invariants, retention_historique, ...).
+    """
+    rng = random.Random(seed)
+    options["rng"] = rng
+    c1, c2 = distribuer_cartes(LISTE_ANIMAUX, rng)
+
+    if mode == "PVP":
+        j1 = Joueur("Joueur 1", c1, LISTE_ANIMAUX)
+        j2 = Joueur("Joueur 2", c2, LISTE_ANIMAUX)
+        return GameState(j1, j2, mode_robot=None, **options)
+
+    nom_humain = prenom.strip() if prenom.strip() else "Humain"
+
+    if mode == "RA":
+        humain = Joueur(nom_humain, c1, LISTE_ANIMAUX)
+        robot = Joueur("Robot", c2, LISTE_ANIMAUX)
+        return GameState(humain, robot, mode_robot="A", **options)
+
+    if mode == "RI":
+        humain = Joueur(nom_humain, c1, LISTE_ANIMAUX)
+        robot = Joueur("Robot", c2, LISTE_ANIMAUX)
+        return GameState(humain, robot, mode_robot="I", medianes=True, **options)
+
+    if mode == "RP":
+        humain = Joueur(nom_humain, c1, LISTE_ANIMAUX)
+        robot = Joueur("Robot", c2, LISTE_ANIMAUX)
+        return GameState(humain, robot, mode_robot="P", index_rangs=True, **options)
+
+    if mode == "RM":
+        humain = Joueur(nom_humain, c1, LISTE_ANIMAUX)
+        robot = Joueur("Robot", c2, LISTE_ANIMAUX)
+        return GameState(humain, robot, mode_robot="M", cartes_vues=True, **options)
+
+    raise ValueError("Mode inconnu")
+
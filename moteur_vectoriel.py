@@ -0,0 +1,545 @@
+# -*- coding: utf-8 -*-
+"""
+Moteur vectorisé (NumPy) : joue un lot de parties robot contre robot en parallèle.
+
+Mêmes règles que GameState (moteur.py), mais toutes les parties avancent
+d'une manche à la fois sous forme de tableaux. Toutes les parties en cours en
+sont à la même manche, donc au même joueur actif.
+
+Catalogues d'au plus CARTES_COMPACTES cartes (LISTE_ANIMAUX) : paquets compacts.
+- chaque paquet tient dans un entier de 64 bits, 4 bits par carte, le fond dans
+  les bits de poids faible ; les deux réinsertions d'une manche sont des
+  décalages de bits ;
+- la victoire de l'actif est lue dans une table indexée par (caractéristique,
+  carte de l'actif, carte de l'adversaire), comptée par un seul histogramme ;
+- robot intelligent : par partie et par caractéristique, S[j] = cartes jouées
+  de rang <= j, rangé en voies de 16 (ou 32) bits ; les rangs des deux valeurs
+  centrales se comptent par comparaison aux seuils et le score se lit dans une
+  table (caractéristique, carte, rang bas, rang haut) ;
+- une manche se joue par blocs de BLOC_PARTIES parties, dans des tampons
+  alloués une fois pour toute la série.
+
+Autres catalogues : paquets en tableau (parties * 2, cartes), réinsertion qui ne
+décale que les cartes au-dessus de la position tirée, et un arbre de Fenwick par
+partie et par caractéristique pour les médianes (O(log cartes) par manche).
+
+Les tirages suivent la même loi que le moteur objet (caractéristique du robot
+aléatoire, réinsertion de la carte gagnée puis de la carte jouée), donc les
+résultats sont identiques en distribution, pas partie par partie. Les paquets
+compacts tirent les trois valeurs d'une manche d'un seul entier de 32 bits
+(chaîne de restes) : écart à la loi uniforme inférieur à 2^-20.
+
+Débit : python bench_moteur_vectoriel.py
+"""
+
+import numpy as np
+
+import moteur
+from moteur import CARACTERISTIQUES
+
+MODES_VECTORIELS = ("A", "I")
+
+
+def matrice_stats(catalogue):
+    """Matrice (n, 3) float64 : poids, longueur, longévité de chaque carte (colonnes du catalogue)."""
+    return np.column_stack([np.asarray(catalogue.colonne(c), dtype=np.float64) for c in CARACTERISTIQUES])
+
+
+def _inserer(plat, debuts, longueurs, positions, cartes):
+    """
+    Insère cartes[i] à positions[i] dans la pile i, en place : seules les cartes
+    de positions[i] au sommet (longueurs[i] cartes en jeu) montent d'un cran.
+    plat : paquets à plat ; debuts : indice (dans plat) du fond de chaque pile.
+    """
+    n_decales = longueurs - positions
+    total = int(n_decales.sum())
+    if total:
+        # cases à décaler, pile après pile : debut + position ... debut + longueur - 1
+        origines = np.repeat(debuts + positions - (np.cumsum(n_decales) - n_decales), n_decales)
+        source = origines + np.arange(total)
+        plat[source + 1] = plat[source]
+    plat[debuts + positions] = cartes
+
+
+# Arbres de Fenwick du robot intelligent, rangés nœud par nœud : arbres[nœud, ligne],
+# ligne = c * parties + partie. Les nœuds vont de 1 à une puissance de deux >= cartes
+# (la descente n'a pas à tester les bornes) ; le nœud suivant absorbe les mises à
+# jour qui sortent de l'arbre, et le nœud 0 est inutilisé.
+
+def _fenwick_ajouter(arbres, lignes, rangs):
+    """Compte une carte de rang rangs[i] dans l'arbre lignes[i] (lignes distinctes)."""
+    taille = arbres.shape[0] - 2
+    n_lignes = arbres.shape[1]
+    plat = arbres.reshape(-1)
+    i = rangs + 1
+    for _ in range(taille.bit_length()):
+        plat[i * n_lignes + lignes] += 1
+        i += i & -i
+        np.minimum(i, taille + 1, out=i)
+
+
+def _fenwick_kieme(arbres, lignes, k):
+    """Rang de la (k + 1)-ième plus petite carte comptée dans chaque arbre lignes[i]."""
+    n_lignes = arbres.shape[1]
+    plat = arbres.reshape(-1)
+    pos = np.zeros(len(lignes), dtype=np.int64)
+    reste = k + 1
+    # le nœud de la taille totale compte toutes les cartes : la descente part de la moitié
+    pas = (arbres.shape[0] - 2) // 2
+    while pas:
+        somme = plat[(pos + pas) * n_lignes + lignes]
+        avance = somme < reste
+        pos += avance * pas
+        reste -= avance * somme
+        pas //= 2
+    return pos
+
+
+def _medianes(arbres, valeurs_triees, parties, total):
+    """
+    Médiane des cartes déjà jouées, par partie et par caractéristique
+    (même convention que np.median : moyenne des deux valeurs centrales).
+    Les deux valeurs centrales des trois caractéristiques sont cherchées d'un coup.
+    """
+    lignes = (np.arange(3)[:, None] * (arbres.shape[1] // 3) + parties).ravel()
+    k = np.concatenate([np.tile((total - 1) // 2, 3), np.tile(total // 2, 3)])
+    rangs = _fenwick_kieme(arbres, np.concatenate([lignes, lignes]), k).reshape(2, 3, -1)
+    c = np.arange(3)[:, None]
+    return ((valeurs_triees[c, rangs[0]] + valeurs_triees[c, rangs[1]]) / 2).T
+
+
+def _choix_intelligent(stats, cartes, med):
+    """Version vectorisée de moteur.choix_robot_intelligent (argmax = premier maximum)."""
+    valeurs = stats[cartes]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(med > 0, valeurs / med, 0.0)
+    return np.argmax(scores, axis=1)
+
+
+# Paquets compacts : 4 bits par carte dans un entier de 64 bits, le fond en bits de
+# poids faible. E = position (en bits) du sommet = 4 * (longueur - 1).
+CARTES_COMPACTES = 16
+BLOC_PARTIES = 8192  # parties par opération NumPy : les tampons restent en cache
+
+_U = np.uint64
+_M32 = _U(0xFFFFFFFF)
+_SANS_2_BITS = _U(~3 & 0xFFFFFFFFFFFFFFFF)
+_TOUT = _U(0xFFFFFFFFFFFFFFFF)
+# caractéristique 3 (inexistante) : manches des parties finies, hors des comptes
+_CAR_FINIE = _U(3 << 8)
+
+
+def _distribuer_compact(bg, n_parties, n_cartes):
+    """
+    Paquets de départ (2, n_parties) : mélange uniforme (la carte i est insérée à
+    une position uniforme parmi les i + 1 possibles), coupé comme distribuer_cartes.
+    """
+    milieu = n_cartes // 2
+    D = np.zeros(n_parties, dtype=_U)
+    tirages = bg.random_raw((n_parties * (n_cartes - 1) + 1) // 2).view(np.uint32)
+    pos = np.empty(n_parties, dtype=_U)
+    bas = np.empty(n_parties, dtype=_U)
+    for i in range(1, n_cartes):
+        np.multiply(tirages[(i - 1) * n_parties:i * n_parties], _U(4 * (i + 1)), out=pos)
+        pos >>= _U(32)
+        pos &= _SANS_2_BITS
+        np.left_shift(_U(1), pos, out=bas)
+        bas -= _U(1)
+        bas &= D
+        D ^= bas
+        D <<= _U(4)
+        D |= bas
+        np.left_shift(_U(i), pos, out=bas)
+        D |= bas
+    paquets = np.empty((2, n_parties), dtype=_U)
+    np.bitwise_and(D, _U((1 << (4 * milieu)) - 1), out=paquets[0])
+    np.right_shift(D, _U(4 * milieu), out=paquets[1])
+    return paquets
+
+
+class _MedianesCompactes:
+    """
+    Choix du robot intelligent sur paquets compacts.
+
+    S[k, c, partie] : mot k des compteurs de la caractéristique c, S[j] = cartes
+    jouées de rang <= j, m voies de b bits par mot. Après 2r cartes jouées, les
+    deux valeurs centrales ont pour rangs #(S[j] < r) et #(S[j] < r + 1).
+    """
+
+    def __init__(self, stats, n_parties, bloc, max_manches):
+        n = len(stats)
+        # S[j] <= 2 * max_manches : voies de 16 bits quand le plafond le permet
+        b = 16 if max_manches is not None and 2 * max_manches < 2 ** 16 - 1 else 32
+        m = 64 // b
+        K = -(-n // m)
+        self.t_voie = np.uint16 if b == 16 else np.uint32
+        self.t_groupe = np.dtype(f"u{m}")
+        self.somme_octets = self.t_groupe.type(sum(1 << (8 * i) for i in range(m)))
+        self.decale_haut = self.t_groupe.type(8 * (m - 1))
+        self.decale_bas = self.t_groupe.type(8 * (m - 1) - 4)
+        self.masque_bas = self.t_groupe.type(0xF0)
+        self.K, self.m = K, m
+
+        tris = np.argsort(stats, axis=0, kind="stable").T
+        valeurs_triees = np.take_along_axis(stats.T, tris, axis=1)
+        rangs = np.empty((3, n), dtype=np.int64)
+        np.put_along_axis(rangs, tris, np.arange(n)[None, :], axis=1)
+
+        # inc[(k, c), (x << 4) | y] : ajout au mot k de S quand les cartes x et y sont jouées
+        voie = np.arange(K * m)
+        poids_voie = _U(b) * np.arange(m, dtype=_U)
+        compte = (rangs[:, :, None] <= voie) & (voie < n)
+        unite = (compte.reshape(3, n, K, m).astype(_U) << poids_voie).sum(axis=3, dtype=_U)
+        unite = np.concatenate([unite, np.zeros((3, 16 - n, K), dtype=_U)], axis=1)
+        paires = (unite[:, :, None] + unite[:, None, :]).reshape(3, 256, K)
+        self.inc = np.ascontiguousarray(paires.transpose(2, 0, 1)).reshape(3 * K, 256)
+        # voies au-delà de la dernière carte : au maximum, jamais sous le seuil
+        vide = (voie >= n).reshape(K, m).astype(_U) * _U((1 << b) - 1)
+        s0 = (vide << poids_voie).sum(axis=1, dtype=_U)
+        self.S = np.empty((K, 3, n_parties), dtype=_U)
+        self.S[:] = s0[:, None, None]
+
+        # scores[c, carte, bas, haut] : valeur / médiane, comme choix_robot_intelligent
+        mediane = (valeurs_triees[:, :, None] + valeurs_triees[:, None, :]) / 2
+        scores = np.zeros((3, 16, 16, 16))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores[:, :n, :n, :n] = np.where(mediane[:, None] > 0,
+                                             stats.T[:, :, None, None] / mediane[:, None], 0.0)
+        self.scores = scores.reshape(-1)
+        self.cle_car = (np.arange(3, dtype=_U) << _U(12))[:, None]
+
+        B = min(bloc, n_parties)
+        self._inf = np.empty(K * 3 * m * B, dtype=bool)
+        self._somme = np.empty(3 * B, dtype=self.t_groupe)
+        self._cle = np.empty(3 * B, dtype=np.int64)
+        self._score = np.empty(3 * B, dtype=np.float64)
+        self._mieux = np.empty((2, B), dtype=bool)
+        self._ajout = np.empty(K * 3 * B, dtype=_U)
+
+    def choisir(self, lo, hi, carte, r, car8, tampon):
+        """car8 = caractéristique << 8 choisie pour les parties lo .. hi - 1 (carte en jeu)."""
+        w = hi - lo
+        K = self.K
+        voies = self.S[:, :, lo:hi].view(self.t_voie)
+        inf = self._inf[:K * 3 * self.m * w].reshape(K, 3, self.m * w)
+        somme = self._somme[:3 * w].reshape(3, w)
+        cle = self._cle[:3 * w].reshape(3, w)
+        np.left_shift(carte, _U(8), out=tampon)
+        np.bitwise_or(self.cle_car, tampon, out=cle, casting="unsafe")
+        # clé de scores : rang bas dans les bits 4 à 7, rang haut dans les bits 0 à 3
+        for seuil, decale in ((r, self.decale_bas), (r + 1, self.decale_haut)):
+            np.less(voies, self.t_voie(seuil), out=inf)
+            octets = inf.view(self.t_groupe)  # (K, 3, w) : un octet par voie
+            np.copyto(somme, octets[0])
+            for k in range(1, K):
+                somme += octets[k]
+            # total des octets dans l'octet de poids fort
+            somme *= self.somme_octets
+            somme >>= decale
+            if decale is self.decale_bas:
+                somme &= self.masque_bas
+            np.bitwise_or(cle, somme, out=cle)
+        score = np.take(self.scores, cle, out=self._score[:3 * w].reshape(3, w), mode="wrap")
+        # premier maximum, dans l'ordre de CARACTERISTIQUES
+        m1, m2 = self._mieux[0, :w], self._mieux[1, :w]
+        np.greater(score[1], score[0], out=m1)
+        np.maximum(score[0], score[1], out=score[0])
+        np.greater(score[2], score[0], out=m2)
+        np.multiply(m1, _U(1 << 8), out=car8)
+        np.bitwise_xor(car8, _U(2 << 8), out=tampon)
+        tampon *= m2
+        car8 ^= tampon
+
+    def ajouter(self, lo, hi, paire):
+        """Compte les deux cartes jouées, paire = (carte actif << 4) | carte adversaire."""
+        w = hi - lo
+        ajout = self._ajout[:self.K * 3 * w]
+        np.take(self.inc, paire.view(np.int64), axis=1, out=ajout.reshape(3 * self.K, w), mode="wrap")
+        S = self.S[:, :, lo:hi]
+        S += ajout.reshape(self.K, 3, w)
+
+    def garder(self, garde):
+        """Compactage : ne garde que les parties d'indices garde."""
+        self.S = np.take(self.S, garde, axis=2)
+
+
+def _jouer_parties_compactes(n_parties, stats, intelligent, rng, max_manches, issue_plafond,
+                             bloc=BLOC_PARTIES):
+    """jouer_parties pour un catalogue de 2 à CARTES_COMPACTES cartes."""
+    bg = rng.bit_generator
+    n = len(stats)
+    milieu = n // 2
+
+    # bat[(car << 8) | (carte actif << 4) | carte adversaire] : tout à 1 si l'actif gagne
+    bat = np.zeros((4, 16, 16), dtype=_U)
+    bat[:3, :n, :n] = (stats.T[:, :, None] > stats.T[:, None, :]) * _TOUT
+    bat = bat.reshape(-1)
+    histo = np.zeros((2, 1024), dtype=np.int64)
+
+    W = n_parties
+    paquets = _distribuer_compact(bg, W, n)
+    depart = np.array([[4 * milieu - 4], [4 * (n - milieu) - 4]], dtype=_U)
+    E = np.repeat(depart, W, axis=1)
+    plein = _U(4 * n - 8)  # sommet du gagnant avant la manche qui lui donne toutes les cartes
+    medianes = _MedianesCompactes(stats, W, bloc, max_manches) if any(intelligent) else None
+
+    B = min(bloc, W)
+    tampons = np.empty((6, B), dtype=_U)
+    sommets = np.empty((2, B), dtype=_U)
+    vues = {}
+    fin = np.empty(W, dtype=bool)
+
+    def manche(lo, hi, a, r, finies):
+        w = hi - lo
+        pq = paquets[:, lo:hi]
+        e = E[:, lo:hi]
+        A, P = pq[a], pq[1 - a]
+        ea, ep = e[a], e[1 - a]
+        T = np.right_shift(pq, e, out=sommets[:, :w])
+        T &= _U(15)
+        ta, tp = T[a], T[1 - a]
+        if w not in vues:
+            vues[w] = [tampons[i, :w] for i in range(len(tampons))]
+        # chaque tampon sert successivement à plusieurs valeurs (noms séparés par /)
+        paire, x, idx, gm, s1, D = vues[w]
+        np.left_shift(ta, _U(4), out=paire)
+        paire |= tp
+
+        # un tirage de 32 bits par partie : caractéristique du robot A, puis positions
+        u = bg.random_raw((w + 1) // 2).view(np.uint32)[:w]
+        if intelligent[a] and r:
+            medianes.choisir(lo, hi, ta, r, idx, x)
+            x[:] = u
+        else:
+            np.multiply(u, _U(3), out=x)
+            np.right_shift(x, _U(24), out=idx)
+            idx &= _U(3 << 8)  # car << 8
+            x &= _M32          # reste : tirage de la première position
+        idx |= paire
+        np.take(bat, idx.view(np.int64), out=gm, mode="wrap")
+        if finies is not None:
+            idx |= finies[lo:hi]
+        histo[a] += np.bincount(idx.view(np.int64), minlength=1024)
+        if medianes is not None:
+            medianes.ajouter(lo, hi, paire)
+
+        c = paire
+        np.bitwise_xor(ta, tp, out=c)
+        c &= gm
+        c ^= ta        # carte perdue
+        Wd = idx
+        np.bitwise_xor(A, P, out=Wd)
+        Wd &= gm
+        Wd ^= P        # paquet du gagnant
+        Ew, lw4 = ta, tp
+        np.bitwise_xor(ea, ep, out=Ew)
+        Ew &= gm
+        Ew ^= ep       # position de son sommet
+        np.add(Ew, _U(8), out=lw4)  # 4 * (longueur + 1)
+        x *= lw4
+        np.right_shift(x, _U(32), out=s1)
+        s1 &= _SANS_2_BITS
+        x &= _M32
+        x *= lw4
+        s2 = lw4
+        np.right_shift(x, _U(32), out=s2)
+        s2 &= _SANS_2_BITS
+        # insertion de v en s : les cartes à partir de s montent de 4 bits,
+        # D + 15 * haut == bas | (haut << 4)
+        f = x
+        # la carte perdue est insérée en s1
+        np.left_shift(_TOUT, s1, out=f)
+        f &= Wd
+        f *= _U(15)
+        np.add(Wd, f, out=D)
+        np.left_shift(c, s1, out=f)
+        D |= f
+        # puis la carte jouée (le nouveau sommet) est réinsérée en s2
+        y = s1
+        np.add(Ew, _U(4), out=y)
+        np.right_shift(D, y, out=y)
+        y &= _U(15)
+        np.left_shift(_TOUT, s2, out=f)
+        f &= D
+        f *= _U(15)
+        D += f
+        np.left_shift(y, s2, out=f)
+        D |= f
+        D ^= Wd        # différence à appliquer au paquet du gagnant
+        np.bitwise_and(D, gm, out=f)
+        A ^= f
+        D ^= f
+        P ^= D
+        np.bitwise_and(gm, _U(8), out=f)
+        f -= _U(4)     # +4 bits pour le gagnant, -4 pour le perdant
+        ea += f
+        ep -= f
+        np.equal(Ew, plein, out=fin[lo:hi])
+
+    gagnant = np.full(n_parties, -1, dtype=np.int8)
+    manches = np.zeros(n_parties, dtype=np.int64)
+    ids = np.arange(n_parties)
+    vivant = np.ones(W, dtype=bool)
+    finies = None  # _CAR_FINIE pour les parties finies, encore jouées jusqu'au compactage
+    n_finies = 0
+    r = 0
+    while W and (max_manches is None or r < max_manches):
+        a = r & 1
+        for lo in range(0, W, bloc):
+            manche(lo, min(lo + bloc, W), a, r, finies)
+        k = np.flatnonzero(fin[:W])
+        if k.size:
+            j = k[vivant[k]]
+            if j.size:
+                i = ids[j]
+                gagnant[i] = E[1, j] == plein + _U(4)  # le joueur 2 a toutes les cartes
+                manches[i] = r + 1
+                vivant[j] = False
+                if finies is None:
+                    finies = np.zeros(W, dtype=_U)
+                finies[j] = _CAR_FINIE
+                n_finies += j.size
+            E[:, k] = depart
+        r += 1
+        if n_finies * 4 > W:
+            garde = np.flatnonzero(vivant)
+            paquets = np.take(paquets, garde, axis=1)
+            E = np.take(E, garde, axis=1)
+            if medianes is not None:
+                medianes.garder(garde)
+            ids = ids[garde]
+            W = len(garde)
+            vivant = np.ones(W, dtype=bool)
+            finies = None
+            n_finies = 0
+
+    manches[ids[vivant]] = r
+    arretee = gagnant < 0
+    if issue_plafond == "cartes":
+        k = ids[vivant]
+        n1, n2 = E[:, vivant] >> _U(2)
+        gagnant[k] = np.where(n1 > n2, 0, np.where(n2 > n1, 1, -1))
+
+    h = histo[:, :768].reshape(2, 3, 256)
+    choix = h.sum(axis=2)
+    gains = (h * (bat[:768].reshape(3, 256) & _U(1)).astype(np.int64)).sum(axis=2)
+    return {"gagnant": gagnant, "arretee": arretee, "manches": manches, "choix": choix, "gains": gains}
+
+
+def jouer_parties(n_parties, mode_a, mode_b, seed=None, catalogue=None, max_manches=None,
+                  issue_plafond="nul"):
+    """
+    Joue n_parties parties simultanément, robot A (joueur 1) contre robot B (joueur 2).
+    Une partie qui atteint max_manches s'arrête avec l'issue issue_plafond
+    ("nul" ou "cartes", comme GameState).
+
+    Retourne un dict de tableaux :
+    - "gagnant" : (n_parties,) 0 ou 1, -1 pour un match nul ;
+    - "arretee" : (n_parties,) True si la partie a atteint max_manches ;
+    - "manches" : (n_parties,) nombre de manches jouées ;
+    - "choix" / "gains" : (2, 3) caractéristiques choisies / manches gagnées, par robot.
+    """
+    for mode in (mode_a, mode_b):
+        if mode not in MODES_VECTORIELS:
+            raise ValueError(f"Mode robot non vectorisé : {mode}")
+
+    if catalogue is None:
+        catalogue = moteur.LISTE_ANIMAUX
+    rng = np.random.default_rng(seed)
+
+    stats = matrice_stats(catalogue)
+    n_cartes = len(stats)
+    milieu = n_cartes // 2
+    intelligent = (mode_a == "I", mode_b == "I")
+    if 2 <= n_cartes <= CARTES_COMPACTES:
+        return _jouer_parties_compactes(n_parties, stats, intelligent, rng, max_manches, issue_plafond)
+
+    tris = [np.argsort(stats[:, c], kind="stable") for c in range(3)]
+    valeurs_triees = np.stack([stats[tris[c], c] for c in range(3)])
+    intelligent = np.array(intelligent)
+    # rang de chaque carte dans l'ordre de chaque caractéristique
+    rangs = np.empty((3, n_cartes), dtype=np.int64)
+    for c in range(3):
+        rangs[c, tris[c]] = np.arange(n_cartes)
+
+    # distribution : même découpage que distribuer_cartes
+    melange = rng.permuted(np.tile(np.arange(n_cartes, dtype=np.int32), (n_parties, 1)), axis=1)
+    paquets = np.zeros((n_parties * 2, n_cartes), dtype=np.int32)
+    paquets[0::2, :milieu] = melange[:, :milieu]
+    paquets[1::2, :n_cartes - milieu] = melange[:, milieu:]
+    plat = paquets.reshape(-1)
+    longueurs = np.tile(np.array([milieu, n_cartes - milieu], dtype=np.int64), (n_parties, 1))
+
+    actif = np.zeros(n_parties, dtype=np.int64)
+    gagnant = np.full(n_parties, -1, dtype=np.int8)
+    manches = np.zeros(n_parties, dtype=np.int64)
+    arbres = None
+    if intelligent.any():
+        taille = 1 << max(0, n_cartes - 1).bit_length()
+        arbres = np.zeros((taille + 2, 3 * n_parties), dtype=np.int32)
+    choix = np.zeros((2, 3), dtype=np.int64)
+    gains = np.zeros((2, 3), dtype=np.int64)
+
+    en_cours = np.flatnonzero((longueurs > 0).all(axis=1))
+    while en_cours.size:
+        g = en_cours
+        a = actif[g]
+        p = 1 - a
+        la = longueurs[g, a]
+        lp = longueurs[g, p]
+        carte_a = paquets[2 * g + a, la - 1]
+        carte_p = paquets[2 * g + p, lp - 1]
+
+        # choix de la caractéristique par le robot actif
+        car = rng.integers(0, 3, size=g.size)
+        if intelligent.any():
+            total = 2 * manches[g]
+            robot_i = intelligent[a] & (total > 0)
+            if robot_i.any():
+                sel = np.flatnonzero(robot_i)
+                med = _medianes(arbres, valeurs_triees, g[sel], total[sel])
+                car[sel] = _choix_intelligent(stats, carte_a[sel], med)
+
+        v1 = stats[carte_a, car]
+        v2 = stats[carte_p, car]
+        actif_gagne = v1 > v2
+        w = np.where(actif_gagne, a, p)
+        l = 1 - w
+
+        choix += np.bincount(a * 3 + car, minlength=6).reshape(2, 3)
+        gains += np.bincount(a[actif_gagne] * 3 + car[actif_gagne], minlength=6).reshape(2, 3)
+
+        # transfert : la carte du perdant est réinsérée au hasard chez le gagnant
+        ll = longueurs[g, l] - 1
+        carte_perdue = paquets[2 * g + l, ll]
+        longueurs[g, l] = ll
+        debuts = (2 * g + w) * n_cartes
+        lw = longueurs[g, w]
+        _inserer(plat, debuts, lw, (rng.random(g.size) * (lw + 1)).astype(np.int64), carte_perdue)
+
+        # puis la carte du sommet du gagnant est retirée et réinsérée au hasard
+        carte_jouee = plat[debuts + lw]
+        _inserer(plat, debuts, lw, (rng.random(g.size) * (lw + 1)).astype(np.int64), carte_jouee)
+        longueurs[g, w] = lw + 1
+
+        if arbres is not None:
+            lignes = (np.arange(3)[:, None] * n_parties + g).ravel()
+            _fenwick_ajouter(arbres, lignes, rangs[:, carte_a].ravel())
+            _fenwick_ajouter(arbres, lignes, rangs[:, carte_p].ravel())
+        manches[g] += 1
+
+        fini = ll == 0
+        gagnant[g[fini]] = w[fini]
+        actif[g] = p
+
+        continuer = ~fini
+        if max_manches is not None:
+            continuer &= manches[g] < max_manches
+        en_cours = g[continuer]
+
+    arretee = gagnant < 0
+    if issue_plafond == "cartes":
+        n1, n2 = longueurs[arretee, 0], longueurs[arretee, 1]
+        gagnant[arretee] = np.where(n1 > n2, 0, np.where(n2 > n1, 1, -1))
+
+    return {"gagnant": gagnant, "arretee": arretee, "manches": manches, "choix": choix, "gains": gains}
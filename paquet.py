@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Paquet de cartes en blocs (sans dépendance).
+
+Remplace la liste Python de Joueur.cartes : même interface utile
+(len, p[-1], p[i], pop(), insert(i, x), itération) mais l'insertion à une
+position aléatoire ne déplace qu'un bloc d'au plus 2 * TAILLE_BLOC cartes.
+Un arbre de Fenwick sur la taille des blocs retrouve le bloc d'une position
+en O(log n). Le sommet (dernière carte) reste en O(1).
+
+Tant que le paquet tient dans un seul bloc, il se comporte comme une liste.
+Les blocs sont des array('I') : 4 octets par carte.
+Pour les petits catalogues, une simple liste reste plus rapide (cf. bench_paquet.py) :
+Joueur n'utilise un Paquet qu'à partir de SEUIL_PAQUET cartes au total.
+"""
+
+from array import array
+
+from statistiques import ArbreFenwick
+
+TAILLE_BLOC = 512
+SEUIL_PAQUET = 8192
+
+
+class Paquet:
+    """Pile de cartes : la carte visible est la dernière."""
+    def __init__(self, cartes=()):
+        cartes = array("I", cartes)
+        self._n = len(cartes)
+        self._blocs = [cartes[i:i + TAILLE_BLOC] for i in range(0, len(cartes), TAILLE_BLOC)] or [array("I")]
+        self._tailles = None
+        self._reindexer()
+
+    def _reindexer(self):
+        # l'arbre n'est utile qu'à partir de deux blocs
+        if len(self._blocs) > 1:
+            self._tailles = ArbreFenwick.depuis_valeurs(len(b) for b in self._blocs)
+        else:
+            self._tailles = None
+
+    def _localiser(self, i):
+        """(indice du bloc, position dans le bloc) de la carte i (0 <= i < n)."""
+        b = self._tailles.kieme(i + 1)
+        return b, i - self._tailles.somme_prefixe(b)
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        for bloc in self._blocs:
+            yield from bloc
+
+    def __getitem__(self, i):
+        if self._tailles is None:
+            return self._blocs[0][i]
+        if i == -1:
+            return self._blocs[-1][-1]
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError("position hors du paquet")
+        b, j = self._localiser(i)
+        return self._blocs[b][j]
+
+    def __repr__(self):
+        return f"Paquet({list(self)!r})"
+
+    def pop(self):
+        """Retire et renvoie la carte du sommet."""
+        blocs = self._blocs
+        carte = blocs[-1].pop()
+        self._n -= 1
+        if self._tailles is not None:
+            if blocs[-1]:
+                self._tailles.ajouter(len(blocs) - 1, -1)
+            else:
+                blocs.pop()
+                self._reindexer()
+        return carte
+
+    def insert(self, i, carte):
+        """Insère carte à la position i (0 = dessous, len = sommet)."""
+        blocs = self._blocs
+        if self._tailles is None:
+            # un seul bloc : comme une liste
+            bloc = blocs[0]
+            bloc.insert(i, carte)
+            self._n += 1
+            if len(bloc) > 2 * TAILLE_BLOC:
+                blocs[:] = [bloc[:TAILLE_BLOC], bloc[TAILLE_BLOC:]]
+                self._reindexer()
+            return
+
+        if i < 0:
+            i = max(0, i + self._n)
+        i = min(i, self._n)
+        if i == self._n:
+            b, j = len(blocs) - 1, len(blocs[-1])
+        else:
+            b, j = self._localiser(i)
+
+        bloc = blocs[b]
+        bloc.insert(j, carte)
+        self._n += 1
+
+        if len(bloc) > 2 * TAILLE_BLOC:
+            blocs[b:b + 1] = [bloc[:TAILLE_BLOC], bloc[TAILLE_BLOC:]]
+            self._reindexer()
+        else:
+            self._tailles.ajouter(b, 1)
+
+    def append(self, carte):
+        self.insert(self._n, carte)
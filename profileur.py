@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Profileur de la boucle d'affichage (sans dépendance).
+
+Chaque section chronométrée (événements, robot, draw_card, overlays,
+affichage...) est cumulée sur l'image en cours ; fin_image() met à jour une
+moyenne glissante par section (ms par image). Si le profileur est actif, une
+chronologie bornée est aussi gardée et peut être exportée au format
+Chrome trace (chrome://tracing, Perfetto) :
+
+    PROFIL.exporter_trace("profil_trace.json")
+
+Inactif, debut() renvoie None et fin() ne fait rien : le coût est négligeable.
+"""
+
+import json
+import time
+from collections import deque
+
+
+class Profileur:
+    def __init__(self, lissage=0.1, max_evenements=100000):
+        self.actif = False
+        self.lissage = lissage
+        self.moyennes_ms = {}  # section -> ms par image (moyenne glissante)
+        self.images = 0
+        self._image_ns = {}
+        self._origine = time.perf_counter_ns()
+        self._chronologie = deque(maxlen=max_evenements)
+
+    def activer(self, actif=True):
+        self.actif = actif
+        if not actif:
+            self.moyennes_ms.clear()
+            self._image_ns.clear()
+
+    def debut(self):
+        return time.perf_counter_ns() if self.actif else None
+
+    def fin(self, nom, debut):
+        if debut is None:
+            return
+        maintenant = time.perf_counter_ns()
+        self._image_ns[nom] = self._image_ns.get(nom, 0) + maintenant - debut
+        # événement "complet" de la chronologie (temps en µs)
+        self._chronologie.append((nom, (debut - self._origine) // 1000, (maintenant - debut) // 1000))
+
+    def fin_image(self):
+        """Clôt l'image : les sections non exécutées comptent pour 0 ms."""
+        if not self.actif:
+            return
+        self.images += 1
+        for nom in set(self.moyennes_ms) | set(self._image_ns):
+            ms = self._image_ns.get(nom, 0) / 1e6
+            ancien = self.moyennes_ms.get(nom)
+            self.moyennes_ms[nom] = ms if ancien is None else ancien + self.lissage * (ms - ancien)
+        self._image_ns.clear()
+
+    def exporter_trace(self, chemin):
+        """Écrit la chronologie au format Chrome trace (JSON) ; renvoie le nombre d'événements."""
+        evenements = [
+            {"name": nom, "ph": "X", "ts": ts, "dur": duree, "pid": 1, "tid": 1}
+            for nom, ts, duree in self._chronologie
+        ]
+        with open(chemin, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": evenements, "displayTimeUnit": "ms"}, f)
+        return len(evenements)
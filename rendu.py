@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+"""
+Caches de rendu de l'interface (sans import de Pygame : on ne manipule
+que les objets police / Surface qu'on nous donne).
+
+- CacheTextes : surfaces de texte déjà rastérisées, clé (police, texte, couleur,
+  antialias), éviction LRU. Les libellés fixes (titre, menu, boutons, règles...)
+  ne sont rendus qu'une fois au lieu d'une fois par image.
+- DecoupeLignes : retour à la ligne mot par mot, largeurs des mots mises en
+  cache par police, coupures trouvées par bisection sur les largeurs cumulées,
+  paragraphes mémorisés par (police, texte, largeur max).
+- CacheImages : images de cartes redimensionnées, LRU borné en octets
+  (largeur x hauteur x octets par pixel) ; les échecs de chargement sont
+  gardés ttl_negatif secondes seulement.
+- ZonesModifiees : rendu « retenu » par zones. Chaque zone de l'écran est
+  associée à une clé (tuple de l'état qu'elle affiche) ; elle n'est redessinée
+  que si la clé change, et seuls ses rectangles sont envoyés à l'écran.
+- MesureImages : images par seconde et temps d'image mesurés par la boucle.
+"""
+
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+
+
+class CacheTextes:
+    """
+    Cache LRU des surfaces renvoyées par police.render.
+    Les surfaces renvoyées sont partagées : ne pas dessiner dessus.
+    """
+    def __init__(self, capacite=512):
+        self.capacite = capacite
+        self._surfaces = OrderedDict()
+        self.touches = 0
+        self.echecs = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def rendre(self, police, texte, couleur, antialias=True):
+        # la police fait partie de la clé (par identité) : deux tailles, deux entrées
+        cle = (police, texte, tuple(couleur), antialias)
+        surf = self._surfaces.get(cle)
+        if surf is not None:
+            self._surfaces.move_to_end(cle)
+            self.touches += 1
+            return surf
+
+        self.echecs += 1
+        surf = police.render(texte, antialias, couleur)
+        self._surfaces[cle] = surf
+        if len(self._surfaces) > self.capacite:
+            self._surfaces.popitem(last=False)
+            self.evictions += 1
+        return surf
+
+    def vider(self):
+        self._surfaces.clear()
+
+    def stats(self):
+        total = self.touches + self.echecs
+        return {
+            "entrees": len(self._surfaces),
+            "touches": self.touches,
+            "echecs": self.echecs,
+            "evictions": self.evictions,
+            "taux_touches": self.touches / total if total else 0.0,
+        }
+
+
+class DecoupeLignes:
+    """
+    Découpe un texte en lignes d'au plus max_width pixels (coupure aux espaces ;
+    un mot trop long reste seul sur sa ligne). Les coupures sont estimées par
+    les largeurs cumulées des mots, puis vérifiées sur la ligne rendue.
+    """
+    def __init__(self, capacite=1024):
+        self.capacite = capacite
+        self._largeurs = {}  # police -> {mot: largeur}
+        self._paragraphes = OrderedDict()
+        self.touches = 0
+        self.echecs = 0
+
+    def _largeur(self, police, mot):
+        largeurs = self._largeurs.setdefault(police, {})
+        w = largeurs.get(mot)
+        if w is None:
+            w = largeurs[mot] = police.size(mot)[0]
+        return w
+
+    def lignes(self, police, texte, max_width):
+        cle = (police, texte, max_width)
+        lignes = self._paragraphes.get(cle)
+        if lignes is not None:
+            self._paragraphes.move_to_end(cle)
+            self.touches += 1
+            return lignes
+
+        self.echecs += 1
+        lignes = self._couper(police, texte, max_width)
+        self._paragraphes[cle] = lignes
+        if len(self._paragraphes) > self.capacite:
+            self._paragraphes.popitem(last=False)
+        return lignes
+
+    def _couper(self, police, texte, max_width):
+        mots = [m for m in texte.split(" ") if m]
+        espace = self._largeur(police, " ")
+        # cumul[k] = largeur des k premiers mots, chacun suivi d'une espace
+        cumul = [0]
+        for m in mots:
+            cumul.append(cumul[-1] + self._largeur(police, m) + espace)
+
+        lignes = []
+        i, n = 0, len(mots)
+        while i < n:
+            # plus grand j tel que les mots i..j-1 tiennent (sans l'espace finale)
+            j = max(i + 1, bisect_right(cumul, cumul[i] + max_width + espace, i + 1) - 1)
+            # la somme des mots peut différer de quelques pixels du rendu réel
+            # (crénage) : on vérifie la ligne choisie et on corrige d'un mot si besoin
+            ligne = " ".join(mots[i:j])
+            while j > i + 1 and police.size(ligne)[0] > max_width:
+                j -= 1
+                ligne = " ".join(mots[i:j])
+            while j < n and police.size(ligne + " " + mots[j])[0] <= max_width:
+                ligne += " " + mots[j]
+                j += 1
+            lignes.append(ligne)
+            i = j
+        return tuple(lignes)
+
+    def vider(self):
+        self._largeurs.clear()
+        self._paragraphes.clear()
+
+
+class CacheImages:
+    """
+    Cache LRU de surfaces borné par un budget mémoire (octets de pixels).
+    chercher(cle) -> (trouvée, surface) ; une entrée négative (surface None,
+    image absente ou illisible) expire après ttl_negatif secondes.
+    """
+    def __init__(self, budget_octets=64 * 1024 * 1024, ttl_negatif=30.0, max_entrees=4096,
+                 horloge=time.monotonic):
+        self.budget_octets = budget_octets
+        self.ttl_negatif = ttl_negatif
+        self.max_entrees = max_entrees
+        self.horloge = horloge
+        self._entrees = OrderedDict()  # cle -> (surface ou None, octets, expiration)
+        self.octets = 0
+        self.touches = 0
+        self.echecs = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entrees)
+
+    def __contains__(self, cle):
+        return self.chercher(cle, compter=False)[0]
+
+    @staticmethod
+    def taille_octets(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def chercher(self, cle, compter=True):
+        entree = self._entrees.get(cle)
+        if entree is not None and entree[2] is not None and self.horloge() >= entree[2]:
+            # échec trop ancien : on retentera le chargement
+            self.retirer(cle)
+            entree = None
+        if entree is None:
+            if compter:
+                self.echecs += 1
+            return False, None
+        self._entrees.move_to_end(cle)
+        if compter:
+            self.touches += 1
+        return True, entree[0]
+
+    def ajouter(self, cle, surface):
+        self.retirer(cle)
+        if surface is None:
+            octets, expiration = 0, self.horloge() + self.ttl_negatif
+        else:
+            octets, expiration = self.taille_octets(surface), None
+            if octets > self.budget_octets:
+                return  # plus grande que tout le budget : jamais gardée
+        self._entrees[cle] = (surface, octets, expiration)
+        self.octets += octets
+        while self.octets > self.budget_octets or len(self._entrees) > self.max_entrees:
+            _, (_, o, _) = self._entrees.popitem(last=False)
+            self.octets -= o
+            self.evictions += 1
+
+    def retirer(self, cle):
+        entree = self._entrees.pop(cle, None)
+        if entree is not None:
+            self.octets -= entree[1]
+
+    def retirer_si(self, predicat):
+        """Retire les entrées dont la clé vérifie predicat ; renvoie leur nombre."""
+        cles = [cle for cle in self._entrees if predicat(cle)]
+        for cle in cles:
+            self.retirer(cle)
+        return len(cles)
+
+    def vider(self):
+        self._entrees.clear()
+        self.octets = 0
+
+    def stats(self):
+        total = self.touches + self.echecs
+        return {
+            "entrees": len(self._entrees),
+            "negatives": sum(1 for e in self._entrees.values() if e[0] is None),
+            "octets": self.octets,
+            "budget_octets": self.budget_octets,
+            "touches": self.touches,
+            "echecs": self.echecs,
+            "evictions": self.evictions,
+            "taux_touches": self.touches / total if total else 0.0,
+        }
+
+
+_ABSENTE = object()
+
+
+class ZonesModifiees:
+    """Suivi des zones à redessiner et des rectangles à passer à pygame.display.update."""
+    def __init__(self):
+        self._cles = {}
+        self._rects = []
+
+    def a_redessiner(self, nom, cle, rect):
+        """True (et rect noté comme modifié) si l'état affiché par la zone a changé."""
+        if self._cles.get(nom, _ABSENTE) == cle:
+            return False
+        self._cles[nom] = cle
+        self._rects.append(rect)
+        return True
+
+    def invalider(self, sauf=()):
+        """Force le prochain rendu de toutes les zones, sauf celles nommées (ex : fermeture d'un overlay)."""
+        self._cles = {nom: cle for nom, cle in self._cles.items() if nom in sauf}
+
+    def touche(self, rect):
+        """True si un rectangle déjà modifié pendant cette image recouvre rect."""
+        return rect.collidelist(self._rects) != -1
+
+    def rects_modifies(self):
+        """Rectangles modifiés depuis le dernier appel (la liste est remise à zéro)."""
+        rects, self._rects = self._rects, []
+        return rects
+
+
+class MesureImages:
+    """
+    IPS réellement obtenues et temps de travail par image (ms), en moyennes
+    glissantes exponentielles. La boucle appelle debut() au réveil et fin()
+    une fois l'image envoyée à l'écran.
+    """
+    def __init__(self, lissage=0.1):
+        self.lissage = lissage
+        self.images = 0
+        self.temps_image_ms = 0.0
+        self.intervalle_ms = 0.0
+        self._debut = None
+        self._derniere = None
+
+    @property
+    def ips(self):
+        return 1000.0 / self.intervalle_ms if self.intervalle_ms else 0.0
+
+    def _lisser(self, moyenne, valeur):
+        return valeur if self.images <= 1 else moyenne + self.lissage * (valeur - moyenne)
+
+    def debut(self):
+        self._debut = time.perf_counter()
+
+    def fin(self):
+        maintenant = time.perf_counter()
+        self.images += 1
+        if self._debut is not None:
+            self.temps_image_ms = self._lisser(self.temps_image_ms, (maintenant - self._debut) * 1000)
+        if self._derniere is not None:
+            self.intervalle_ms = self._lisser(self.intervalle_ms, (maintenant - self._derniere) * 1000)
+        self._derniere = maintenant
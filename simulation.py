@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+"""
+Simulation de parties robot contre robot (sans interface).
+
+Utilise le moteur (creer_partie / GameState.appliquer_manche) et répartit
+les parties sur plusieurs processus.
+
+Chaque partie i d'une série reçoit sa propre graine graine_enfant(graine, i) :
+les résultats ne dépendent ni du nombre de processus ni du découpage, et
+une partie précise peut être rejouée (éventuellement sous profileur).
+
+Exemple :
+    python simulation.py -n 100000 -a I -b A --graine 42
+    python simulation.py -n 1000000 --moteur vectoriel
+    python simulation.py -a I -b I --graine 42 --rejouer 1234 --profiler
+    python simulation.py -n 200 -a M -b I --graine 42 --rollouts-mc 128
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from moteur import (
+    CARACTERISTIQUES,
+    INVARIANTS,
+    ISSUES_PLAFOND,
+    MODES_ROBOT,
+    choix_robot,
+    creer_partie,
+    graine_enfant,
+)
+from monte_carlo import ROLLOUTS_SIMULATION, RobotMonteCarlo
+
+MOTEURS = ("objet", "vectoriel")
+
+# Aucune partie de simulation ne dépasse ce nombre de manches (débit prévisible)
+MAX_MANCHES_DEFAUT = 10000
+
+# Parties par lot : le moteur vectoriel n'amortit le coût fixe d'une manche
+# (quelques dizaines d'appels NumPy) que sur de grands lots
+TAILLE_LOT_OBJET = 2000
+TAILLE_LOT_VECTORIEL = 100000
+
+
+# ============================================================
+# ========================= UNE PARTIE ========================
+# ============================================================
+
+def jouer_partie(mode_a, mode_b, graine=None, robot_mc=None, **options):
+    """
+    Joue une partie complète entre deux robots (graine : graine de la partie).
+    Le robot A tient le paquet du joueur 1, le robot B celui du joueur 2.
+    robot_mc : RobotMonteCarlo des robots "M" (défaut : ROLLOUTS_SIMULATION simulations par choix).
+    options : paramètres de GameState (invariants, max_manches, repetitions_max, issue_plafond).
+    Retourne (index du gagnant 0/1 ou None, nombre de manches, choix, arrêtée), où choix
+    est une liste de (index du joueur actif, caractéristique, manche gagnée) et
+    arrêtée indique une partie stoppée par max_manches ou repetitions_max.
+    """
+    options.setdefault("invariants", "aucun")
+    modes = (mode_a, mode_b)
+    # le robot I lit les médianes, le robot P les index de rangs, le robot M les cartes vues
+    options.setdefault("medianes", "I" in modes)
+    options.setdefault("index_rangs", "P" in modes)
+    options.setdefault("cartes_vues", "M" in modes)
+    if robot_mc is None and "M" in modes:
+        robot_mc = RobotMonteCarlo(budget_s=None, rollouts_max=ROLLOUTS_SIMULATION)
+    # l'historique n'est pas relu : seul le nombre de manches est gardé
+    game = creer_partie("PVP", seed=graine, retention_historique=0, **options)
+    choix = []
+
+    while not game.terminee:
+        i_actif = 0 if game.joueur_actif is game.joueurs[0] else 1
+        carte = game.joueur_actif.carte_visible()
+        if carte is None:
+            break
+
+        car = choix_robot(modes[i_actif], carte, game, robot_mc)
+        actif = game.joueur_actif
+        game.appliquer_manche(car)
+        choix.append((i_actif, car, game.dernier_gagnant is actif))
+
+    gagnant = None
+    if game.gagnant is not None:
+        gagnant = 0 if game.gagnant is game.joueurs[0] else 1
+    arretee = game.raison_fin in ("plafond", "repetition")
+    return gagnant, len(game.historique_manches), choix, arretee
+
+
+# ============================================================
+# ======================= STATISTIQUES ========================
+# ============================================================
+
+def _stats_vides():
+    return {
+        "parties": 0,
+        "victoires": [0, 0],
+        "arretees": 0,  # parties stoppées par le plafond ou les répétitions
+        "manches_total": 0,
+        "manches_min": None,
+        "manches_max": None,
+        "partie_max": None,  # index de la partie la plus longue (à rejouer)
+        # par robot (A, B) puis par caractéristique : [choisie, gagnée]
+        "caracteristiques": [{c: [0, 0] for c in CARACTERISTIQUES} for _ in range(2)],
+    }
+
+
+def _ajouter_partie(stats, index, gagnant, manches, choix, arretee):
+    stats["parties"] += 1
+    if gagnant is not None:
+        stats["victoires"][gagnant] += 1
+    if arretee:
+        stats["arretees"] += 1
+    stats["manches_total"] += manches
+    if stats["manches_min"] is None or manches < stats["manches_min"]:
+        stats["manches_min"] = manches
+    if stats["manches_max"] is None or manches > stats["manches_max"]:
+        stats["manches_max"] = manches
+        stats["partie_max"] = index
+    for i_actif, car, gagnee in choix:
+        compteur = stats["caracteristiques"][i_actif][car]
+        compteur[0] += 1
+        if gagnee:
+            compteur[1] += 1
+
+
+def _fusionner(total, partiel):
+    total["parties"] += partiel["parties"]
+    total["arretees"] += partiel["arretees"]
+    for i in range(2):
+        total["victoires"][i] += partiel["victoires"][i]
+        for c in CARACTERISTIQUES:
+            total["caracteristiques"][i][c][0] += partiel["caracteristiques"][i][c][0]
+            total["caracteristiques"][i][c][1] += partiel["caracteristiques"][i][c][1]
+    total["manches_total"] += partiel["manches_total"]
+    if partiel["manches_min"] is not None:
+        if total["manches_min"] is None or partiel["manches_min"] < total["manches_min"]:
+            total["manches_min"] = partiel["manches_min"]
+    if partiel["manches_max"] is not None:
+        if total["manches_max"] is None or partiel["manches_max"] > total["manches_max"]:
+            total["manches_max"] = partiel["manches_max"]
+            total["partie_max"] = partiel["partie_max"]
+
+
+def _resume(stats, mode_a, mode_b, graine, duree):
+    n = stats["parties"]
+    resume = {
+        "parties": n,
+        "graine": graine,
+        "mode_a": mode_a,
+        "mode_b": mode_b,
+        "victoires_a": stats["victoires"][0],
+        "victoires_b": stats["victoires"][1],
+        "taux_victoire_a": stats["victoires"][0] / n if n else 0.0,
+        "taux_victoire_b": stats["victoires"][1] / n if n else 0.0,
+        "nuls": n - stats["victoires"][0] - stats["victoires"][1],
+        "arretees": stats["arretees"],
+        "manches_moyenne": stats["manches_total"] / n if n else 0.0,
+        "manches_min": stats["manches_min"],
+        "manches_max": stats["manches_max"],
+        "partie_max": stats["partie_max"],
+        "caracteristiques": {},
+        "duree_s": duree,
+        "parties_par_s": n / duree if duree > 0 else 0.0,
+    }
+    for i, cote in enumerate(("a", "b")):
+        resume["caracteristiques"][cote] = {
+            c: {
+                "choisie": choisie,
+                "gagnee": gagnee,
+                "taux_victoire": gagnee / choisie if choisie else 0.0,
+            }
+            for c, (choisie, gagnee) in stats["caracteristiques"][i].items()
+        }
+    return resume
+
+
+# ============================================================
+# ====================== LOTS / PROCESSUS =====================
+# ============================================================
+
+def _jouer_lot(mode_a, mode_b, debut, n_parties, graine, moteur, options):
+    """Joue les parties debut .. debut + n_parties - 1 de la série (travail d'un worker)."""
+    if moteur == "vectoriel":
+        return _jouer_lot_vectoriel(mode_a, mode_b, debut, n_parties, graine, options)
+
+    stats = _stats_vides()
+    for i in range(debut, debut + n_parties):
+        _ajouter_partie(stats, i, *jouer_partie(mode_a, mode_b, graine_enfant(graine, i), **options))
+    return stats
+
+
+def _jouer_lot_vectoriel(mode_a, mode_b, debut, n_parties, graine, options):
+    """
+    Même lot, joué d'un bloc par le moteur NumPy (moteur_vectoriel).
+    Le lot entier partage une graine : les résultats dépendent ici du découpage.
+    """
+    import moteur_vectoriel
+
+    res = moteur_vectoriel.jouer_parties(
+        n_parties, mode_a, mode_b, seed=graine_enfant(graine, debut),
+        max_manches=options["max_manches"], issue_plafond=options["issue_plafond"],
+    )
+    stats = _stats_vides()
+    stats["parties"] = n_parties
+    stats["arretees"] = int(res["arretee"].sum())
+    for i in range(2):
+        stats["victoires"][i] = int((res["gagnant"] == i).sum())
+        for j, c in enumerate(CARACTERISTIQUES):
+            stats["caracteristiques"][i][c] = [int(res["choix"][i, j]), int(res["gains"][i, j])]
+    if n_parties:
+        stats["manches_total"] = int(res["manches"].sum())
+        stats["manches_min"] = int(res["manches"].min())
+        stats["manches_max"] = int(res["manches"].max())
+        stats["partie_max"] = debut + int(res["manches"].argmax())
+    return stats
+
+
+def _decouper(n_parties, n_lots):
+    taille, reste = divmod(n_parties, n_lots)
+    return [taille + (1 if i < reste else 0) for i in range(n_lots) if taille or i < reste]
+
+
+def simulate(n_games, mode_a, mode_b, seed=None, processus=None, taille_lot=None, moteur="objet",
+             invariants="aucun", max_manches=MAX_MANCHES_DEFAUT, repetitions_max=None,
+             issue_plafond="nul", rollouts_mc=ROLLOUTS_SIMULATION, budget_mc=None):
+    """
+    Joue n_games parties robot A contre robot B et renvoie les statistiques
+    agrégées (taux de victoire, longueur des parties, caractéristiques).
+
+    - mode_a / mode_b : "A" (aléatoire), "I" (intelligent), "P" (probabiliste) ou "M" (Monte-Carlo).
+    - seed : graine maîtresse (None = tirée au hasard, renvoyée dans le résumé) ;
+      la partie i joue avec graine_enfant(seed, i), quel que soit le découpage.
+    - processus : nombre de processus (None = tous les coeurs, 1 = sans pool).
+    - taille_lot : parties par lot (None = TAILLE_LOT_OBJET ou TAILLE_LOT_VECTORIEL).
+    - moteur : "objet" (GameState) ou "vectoriel" (NumPy, lots joués en parallèle).
+    - invariants : politique de vérification de GameState (moteur.INVARIANTS).
+    - max_manches / repetitions_max / issue_plafond : garde-fous de GameState
+      contre les parties trop longues (repetitions_max : moteur objet seulement).
+    - rollouts_mc / budget_mc : robot "M", nombre de simulations par choix (reproductible)
+      ou, si budget_mc est donné, temps par choix en secondes.
+    """
+    for mode in (mode_a, mode_b):
+        if mode not in MODES_ROBOT:
+            raise ValueError(f"Mode robot inconnu : {mode}")
+    if moteur not in MOTEURS:
+        raise ValueError(f"Moteur inconnu : {moteur}")
+    if invariants not in INVARIANTS:
+        raise ValueError(f"Politique d'invariants inconnue : {invariants}")
+    if issue_plafond not in ISSUES_PLAFOND:
+        raise ValueError(f"Issue de plafond inconnue : {issue_plafond}")
+    if moteur == "vectoriel" and repetitions_max is not None:
+        raise ValueError("repetitions_max n'est pas disponible avec le moteur vectoriel")
+    options = {
+        "invariants": invariants,
+        "max_manches": max_manches,
+        "repetitions_max": repetitions_max,
+        "issue_plafond": issue_plafond,
+    }
+    if "M" in (mode_a, mode_b):
+        if budget_mc is not None:
+            options["robot_mc"] = RobotMonteCarlo(budget_s=budget_mc)
+        else:
+            options["robot_mc"] = RobotMonteCarlo(budget_s=None, rollouts_max=rollouts_mc)
+
+    if processus is None:
+        processus = os.cpu_count() or 1
+    if taille_lot is None:
+        taille_lot = TAILLE_LOT_VECTORIEL if moteur == "vectoriel" else TAILLE_LOT_OBJET
+    n_lots = max(processus, -(-n_games // max(1, taille_lot)))
+    tailles = _decouper(n_games, n_lots)
+
+    debuts = [sum(tailles[:i]) for i in range(len(tailles))]
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(63)
+
+    debut = time.perf_counter()
+    total = _stats_vides()
+    if processus <= 1:
+        for d, taille in zip(debuts, tailles):
+            _fusionner(total, _jouer_lot(mode_a, mode_b, d, taille, seed, moteur, options))
+    else:
+        with ProcessPoolExecutor(max_workers=processus) as pool:
+            lots = [pool.submit(_jouer_lot, mode_a, mode_b, d, taille, seed, moteur, options)
+                    for d, taille in zip(debuts, tailles)]
+            for lot in lots:
+                _fusionner(total, lot.result())
+    duree = time.perf_counter() - debut
+
+    return _resume(total, mode_a, mode_b, seed, duree)
+
+
+def rejouer_partie(mode_a, mode_b, seed, index, **options):
+    """
+    Rejoue à l'identique la partie `index` d'une série de graine `seed` (moteur objet).
+    options : mêmes garde-fous que la série d'origine (max_manches, ...).
+    """
+    gagnant, manches, _, _ = jouer_partie(mode_a, mode_b, graine_enfant(seed, index), **options)
+    return gagnant, manches
+
+
+# ============================================================
+# ============================ CLI ============================
+# ============================================================
+
+def _afficher(resume):
+    print(f"Parties : {resume['parties']}  ({resume['parties_par_s']:.0f} parties/s, "
+          f"graine {resume['graine']})")
+    print(f"Robot A ({resume['mode_a']}) : {resume['victoires_a']} victoires "
+          f"({resume['taux_victoire_a']:.1%})")
+    print(f"Robot B ({resume['mode_b']}) : {resume['victoires_b']} victoires "
+          f"({resume['taux_victoire_b']:.1%})")
+    print(f"Nuls : {resume['nuls']}  (parties arrêtées par les garde-fous : {resume['arretees']})")
+    print(f"Manches : moyenne {resume['manches_moyenne']:.1f}, "
+          f"min {resume['manches_min']}, max {resume['manches_max']} "
+          f"(partie n° {resume['partie_max']})")
+    for cote in ("a", "b"):
+        print(f"Caractéristiques robot {cote.upper()} :")
+        for c, s in resume["caracteristiques"][cote].items():
+            print(f"  {c:<10} choisie {s['choisie']:>9}  gagnée {s['taux_victoire']:.1%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulation Défi Nature robot contre robot")
+    parser.add_argument("-n", "--parties", type=int, default=10000, help="nombre de parties")
+    parser.add_argument("-a", "--mode-a", default="I", choices=MODES_ROBOT, help="mode du robot A")
+    parser.add_argument("-b", "--mode-b", default="A", choices=MODES_ROBOT, help="mode du robot B")
+    parser.add_argument("--graine", type=int, default=None, help="graine maîtresse")
+    parser.add_argument("-p", "--processus", type=int, default=None,
+                        help="nombre de processus (défaut : tous les coeurs)")
+    parser.add_argument("--moteur", default="objet", choices=MOTEURS,
+                        help="moteur de jeu (vectoriel : NumPy, bien plus rapide)")
+    parser.add_argument("--invariants", default="aucun", choices=INVARIANTS,
+                        help="vérification des invariants du moteur objet")
+    parser.add_argument("--max-manches", type=int, default=MAX_MANCHES_DEFAUT,
+                        help="nombre maximal de manches par partie")
+    parser.add_argument("--repetitions", type=int, default=None,
+                        help="arrête une partie quand un même état revient N fois (moteur objet)")
+    parser.add_argument("--issue-plafond", default="nul", choices=ISSUES_PLAFOND,
+                        help="issue d'une partie arrêtée : nul ou victoire au nombre de cartes")
+    parser.add_argument("--rollouts-mc", type=int, default=ROLLOUTS_SIMULATION,
+                        help="robot M : simulations par choix (parties rejouables)")
+    parser.add_argument("--budget-mc", type=float, default=None, metavar="MS",
+                        help="robot M : temps par choix en millisecondes (remplace --rollouts-mc)")
+    parser.add_argument("--taille-lot", type=int, default=None,
+                        help=f"parties par lot (défaut : {TAILLE_LOT_OBJET}, "
+                             f"{TAILLE_LOT_VECTORIEL} en vectoriel)")
+    parser.add_argument("--json", action="store_true", help="sortie JSON")
+    parser.add_argument("--rejouer", type=int, default=None, metavar="INDEX",
+                        help="rejoue seulement la partie INDEX de la série (--graine obligatoire)")
+    parser.add_argument("--profiler", action="store_true", help="avec --rejouer : profil cProfile")
+    args = parser.parse_args(argv)
+
+    budget_mc = None if args.budget_mc is None else args.budget_mc / 1000
+    if args.rejouer is not None:
+        if args.graine is None:
+            parser.error("--rejouer nécessite --graine")
+        profil = cProfile.Profile() if args.profiler else None
+        if profil is not None:
+            profil.enable()
+        gagnant, manches = rejouer_partie(args.mode_a, args.mode_b, args.graine, args.rejouer,
+                                          invariants=args.invariants, max_manches=args.max_manches,
+                                          repetitions_max=args.repetitions,
+                                          issue_plafond=args.issue_plafond,
+                                          robot_mc=RobotMonteCarlo(budget_s=budget_mc,
+                                                                   rollouts_max=None if budget_mc else args.rollouts_mc))
+        if profil is not None:
+            profil.disable()
+            profil.print_stats("cumulative")
+        vainqueur = "match nul" if gagnant is None else f"gagnant robot {'AB'[gagnant]}"
+        print(f"Partie n° {args.rejouer} : {manches} manches, {vainqueur}")
+        return
+
+    resume = simulate(args.parties, args.mode_a, args.mode_b, seed=args.graine,
+                      processus=args.processus, taille_lot=args.taille_lot, moteur=args.moteur,
+                      invariants=args.invariants, max_manches=args.max_manches,
+                      repetitions_max=args.repetitions, issue_plafond=args.issue_plafond,
+                      rollouts_mc=args.rollouts_mc, budget_mc=budget_mc)
+    if args.json:
+        print(json.dumps(resume, indent=2, ensure_ascii=False))
+    else:
+        _afficher(resume)
+
+
+if __name__ == "__main__":
+    main()
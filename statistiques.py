@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Structures statistiques incrémentales utilisées par le moteur (sans dépendance).
+
+- ArbreFenwick : sommes préfixes et k-ième élément en O(log n).
+- MedianeCourante : médiane d'un multiensemble de valeurs connues d'avance
+  (les caractéristiques des cartes d'une partie), mise à jour en O(log n)
+  et lue en O(1).
+- IndexRangs : valeurs d'un domaine fixe réparties en groupes (ex : cartes non
+  vues / connues de chaque joueur) ; nombre de valeurs < v d'un groupe en O(log n).
+"""
+
+from array import array
+from bisect import bisect_left
+
+
+class ArbreFenwick:
+    """
+    Arbre de Fenwick (binary indexed tree) sur des compteurs entiers positifs, indices 0..n-1.
+    Nœuds en array('I') : 4 octets par compteur (une partie en crée un par caractéristique).
+    """
+    def __init__(self, n):
+        self.n = n
+        self.arbre = array("I", bytes(4 * (n + 1)))
+        self._pas = 1 << max(0, n.bit_length() - 1) if n else 0
+
+    @classmethod
+    def depuis_valeurs(cls, valeurs):
+        """Construction en O(n) à partir des compteurs initiaux."""
+        valeurs = array("I", valeurs)
+        fw = cls(len(valeurs))
+        arbre = fw.arbre
+        arbre[1:] = valeurs
+        for i in range(1, fw.n + 1):
+            parent = i + (i & -i)
+            if parent <= fw.n:
+                arbre[parent] += arbre[i]
+        return fw
+
+    def ajouter(self, i, delta=1):
+        i += 1
+        arbre = self.arbre
+        while i <= self.n:
+            arbre[i] += delta
+            i += i & -i
+
+    def somme_prefixe(self, i):
+        """Somme des compteurs d'indices < i."""
+        s = 0
+        arbre = self.arbre
+        while i > 0:
+            s += arbre[i]
+            i -= i & -i
+        return s
+
+    def kieme(self, k):
+        """Indice du k-ième élément (k >= 1) dans l'ordre des indices."""
+        pos = 0
+        pas = self._pas
+        arbre = self.arbre
+        while pas:
+            suivant = pos + pas
+            if suivant <= self.n and arbre[suivant] < k:
+                pos = suivant
+                k -= arbre[suivant]
+            pas >>= 1
+        return pos
+
+
+class MedianeCourante:
+    """
+    Médiane courante d'un multiensemble de valeurs.
+    Les valeurs possibles sont fixées à la création (ex : caractéristiques
+    des cartes de la partie) ; la mémoire ne dépend donc pas du nombre d'ajouts.
+    Même convention que np.median : moyenne des deux valeurs centrales.
+    ajouter() est en O(log n) ; valeur n'est recalculée qu'à la lecture.
+    """
+    def __init__(self, valeurs_possibles, triees=False):
+        # triees=True : valeurs déjà distinctes et triées (ex : Catalogue.valeurs_triees),
+        # partagées sans copie entre les parties
+        self.valeurs = valeurs_possibles if triees else sorted(set(valeurs_possibles))
+        self.arbre = ArbreFenwick(len(self.valeurs))
+        self.n = 0
+        self._valeur = None
+        self._n_valeur = 0  # n au dernier calcul de _valeur
+
+    def __len__(self):
+        return self.n
+
+    def ajouter(self, v):
+        self.arbre.ajouter(bisect_left(self.valeurs, v))
+        self.n += 1
+
+    @property
+    def valeur(self):
+        """Médiane des valeurs ajoutées (None si aucune)."""
+        if self._n_valeur != self.n:
+            bas = self.arbre.kieme((self.n + 1) // 2)
+            haut = self.arbre.kieme(self.n // 2 + 1)
+            self._valeur = (self.valeurs[bas] + self.valeurs[haut]) / 2
+            self._n_valeur = self.n
+        return self._valeur
+
+
+class IndexRangs:
+    """
+    Multiensembles de valeurs d'un domaine fixe (valeurs distinctes triées),
+    répartis en n_groupes groupes. Le groupe 0 part de comptes (nombre
+    d'exemplaires de chaque valeur du domaine), les autres sont vides.
+    Un arbre de Fenwick par groupe, indexé par rang de valeur.
+    """
+    def __init__(self, valeurs, comptes, n_groupes):
+        self.valeurs = valeurs
+        self.arbres = [ArbreFenwick.depuis_valeurs(comptes)]
+        self.arbres += [ArbreFenwick(len(valeurs)) for _ in range(n_groupes - 1)]
+        self.tailles = [sum(comptes)] + [0] * (n_groupes - 1)
+
+    def deplacer(self, v, de, vers):
+        """Une valeur v passe du groupe de au groupe vers."""
+        r = bisect_left(self.valeurs, v)
+        self.arbres[de].ajouter(r, -1)
+        self.arbres[vers].ajouter(r, 1)
+        self.tailles[de] -= 1
+        self.tailles[vers] += 1
+
+    def inferieures(self, v, groupe):
+        """Nombre de valeurs du groupe strictement inférieures à v."""
+        return self.arbres[groupe].somme_prefixe(bisect_left(self.valeurs, v))
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Cache binaire du catalogue (catalogue.py) : aller-retour CSV -> cache -> Catalogue."""
+
+import pytest
+
+import catalogue as module_catalogue
+from catalogue import NomsProjetes, charger_csv, chemin_cache
+
+LIGNES = [("Éléphant d'Afrique", 6000.0, 7.5, 70.0),
+          ("Ours polaire", 450.0, 2.5, 25.0),
+          ("Colibri", 0.003, 0.08, 5.0),
+          ("Baleine bleue", 150000.0, 30.0, 90.0),
+          ("Léopard des neiges", 55.0, 1.3, 18.0)]
+
+
+@pytest.fixture
+def csv_animaux(tmp_path):
+    chemin = tmp_path / "animaux.csv"
+    contenu = "nom;poids;longueur;longevite\n" + "".join(
+        f"{nom};{p};{l};{v}\n" for nom, p, l, v in LIGNES)
+    chemin.write_text(contenu, encoding="utf-8")
+    return chemin
+
+
+@pytest.mark.parametrize("projeter", [True, False])
+def test_aller_retour_cache(csv_animaux, projeter):
+    ecrit, rapport = charger_csv(csv_animaux, projeter=projeter)
+    assert not rapport.depuis_cache
+    relu, rapport = charger_csv(csv_animaux, projeter=projeter)
+    assert rapport.depuis_cache and rapport.acceptees == len(LIGNES)
+    for catalogue in (ecrit, relu):
+        assert list(catalogue.noms) == [ligne[0] for ligne in LIGNES]
+        for j, carac in enumerate(("poids", "longueur", "longevite"), start=1):
+            assert list(catalogue.colonne(carac)) == [ligne[j] for ligne in LIGNES]
+    assert isinstance(relu.noms, NomsProjetes) == projeter
+
+
+def test_noms_projetes_indices(csv_animaux):
+    charger_csv(csv_animaux)
+    catalogue, _ = charger_csv(csv_animaux)
+    noms = catalogue.noms
+    assert isinstance(noms, NomsProjetes)
+    n = len(LIGNES)
+    assert noms[0] == LIGNES[0][0] and noms[-1] == LIGNES[-1][0]
+    assert noms[-n] == LIGNES[0][0]
+    assert noms[1:4] == [ligne[0] for ligne in LIGNES[1:4]]
+    assert noms[::-2] == [ligne[0] for ligne in LIGNES[::-2]]
+    for i in (n, n + 3, -n - 1, -2 * n):
+        with pytest.raises(IndexError):
+            noms[i]
+
+
+def test_cache_perime(csv_animaux):
+    charger_csv(csv_animaux)
+    with open(csv_animaux, "a", encoding="utf-8") as f:
+        f.write("Loutre;10;1.2;15\n")
+    catalogue, rapport = charger_csv(csv_animaux)
+    assert not rapport.depuis_cache
+    assert catalogue.noms[-1] == "Loutre" and len(catalogue) == len(LIGNES) + 1
+    assert (csv_animaux.parent / chemin_cache(csv_animaux.name)).exists()
+
+
+def test_renommage_refuse(csv_animaux, monkeypatch):
+    def refuser(source, cible):
+        raise PermissionError(cible)
+    monkeypatch.setattr(module_catalogue.os, "replace", refuser)
+    catalogue, rapport = charger_csv(csv_animaux)
+    assert list(catalogue.noms) == [ligne[0] for ligne in LIGNES]
+    assert not rapport.depuis_cache
+    # ni cache, ni fichier temporaire abandonné dans le dossier
+    assert sorted(p.name for p in csv_animaux.parent.iterdir()) == [csv_animaux.name]
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""HistoriqueManches (historique.py) : tampon circulaire, débordement sur disque et rejouer()."""
+
+import random
+
+import pytest
+
+from catalogue import Catalogue
+import historique as module_historique
+from historique import HistoriqueManches
+
+CARACTERISTIQUES = ("poids", "longueur", "longevite")
+CATALOGUE = Catalogue.depuis_lignes([(f"espece_{i}", i + 0.5, 10 * i, 100 - i) for i in range(20)])
+
+
+def manches_aleatoires(n, graine=0):
+    rng = random.Random(graine)
+    return [(rng.randrange(20), rng.randrange(20), rng.randrange(3), rng.randrange(2), rng.randrange(2))
+            for _ in range(n)]
+
+
+def entree(ia, ip, c, a, g):
+    noms = ("A", "B")
+    carac = CARACTERISTIQUES[c]
+    return {"actif": noms[a], "passif": noms[1 - a], "carac": carac,
+            "v_actif": getattr(CATALOGUE[ia], carac), "v_passif": getattr(CATALOGUE[ip], carac),
+            "gagnant": noms[g]}
+
+
+@pytest.mark.parametrize("retention", [0, 1, 7, 64])
+def test_debordement_et_rejouer(tmp_path, retention):
+    manches = manches_aleatoires(150, retention)
+    historique = HistoriqueManches(("A", "B"), CATALOGUE, CARACTERISTIQUES,
+                                   retention=retention, fichier=tmp_path / "manches.bin")
+    for m in manches:
+        historique.ajouter(*m)
+
+    attendu = [entree(*m) for m in manches]
+    assert len(historique) == len(manches)
+    assert historique.retenues() == min(retention, len(manches))
+    # en mémoire : les dernières manches seulement
+    assert list(historique) == attendu[len(manches) - historique.retenues():]
+    if retention:
+        assert historique[-1] == attendu[-1]
+        assert historique[-retention:] == attendu[-retention:]
+    with pytest.raises(IndexError):
+        historique.brut(len(manches) - historique.retenues() - 1)
+
+    # replay complet : fichier de débordement puis tampon, avant et après fermeture
+    assert list(historique.rejouer()) == attendu
+    historique.fermer()
+    assert list(historique.rejouer()) == attendu
+
+
+def test_rejouer_par_blocs(tmp_path, monkeypatch):
+    # débordement de plusieurs blocs, le dernier incomplet ; lecture bloc par bloc
+    manches = manches_aleatoires(3 * module_historique.BLOC_REJEU + 123, 5)
+    historique = HistoriqueManches(("A", "B"), CATALOGUE, CARACTERISTIQUES,
+                                   retention=10, fichier=tmp_path / "manches.bin")
+    for m in manches:
+        historique.ajouter(*m)
+
+    lectures = []
+    ouvrir = open
+
+    class Fichier:
+        def __init__(self, f):
+            self.f = f
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self.f.close()
+
+        def read(self, n):
+            lectures.append(n)
+            return self.f.read(n)
+
+    monkeypatch.setattr(module_historique, "open", lambda *a, **k: Fichier(ouvrir(*a, **k)), raising=False)
+    rejeu = historique.rejouer()
+    assert next(rejeu) == entree(*manches[0])
+    assert lectures == [module_historique.BLOC_REJEU * module_historique._ENREGISTREMENT.size]  # un seul bloc lu pour la première manche
+    assert [entree(*manches[0])] + list(rejeu) == [entree(*m) for m in manches]
+    assert max(lectures) == module_historique.BLOC_REJEU * module_historique._ENREGISTREMENT.size
+
+
+def test_sans_retention_tout_en_memoire():
+    manches = manches_aleatoires(50)
+    historique = HistoriqueManches(("A", "B"), CATALOGUE, CARACTERISTIQUES)
+    for m in manches:
+        historique.ajouter(*m)
+    assert historique.retenues() == 50
+    assert [historique.brut(i) for i in range(50)] == manches
+    assert list(historique.rejouer()) == [entree(*m) for m in manches]
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""GameState (moteur.py) : hash de Zobrist incrémental et arrêt sur répétition d'état."""
+
+import random
+from collections import Counter, deque
+
+import pytest
+
+import moteur
+from catalogue import Catalogue
+from moteur import CARACTERISTIQUES, GameState, Joueur, distribuer_cartes
+from paquet import SEUIL_PAQUET, Paquet
+
+
+def catalogue_de(n, egalites=False):
+    """Valeurs toutes égales avec egalites=True : l'actif perd toujours, la partie boucle."""
+    if egalites:
+        return Catalogue.depuis_lignes([(f"espece_{i}", 1, 1, 1) for i in range(n)])
+    return Catalogue.depuis_lignes([(f"espece_{i}", (i * 7) % 11, (i * 5) % 13, i % 17) for i in range(n)])
+
+
+def partie(catalogue, graine, **options):
+    rng = random.Random(graine)
+    c1, c2 = distribuer_cartes(catalogue, rng)
+    return GameState(Joueur("A", c1, catalogue), Joueur("B", c2, catalogue),
+                     rng=rng, invariants="aucun", **options)
+
+
+def jouer(game, graine, n_max):
+    choix = random.Random(graine + 1)
+    while not game.terminee and game.n_manches < n_max:
+        game.appliquer_manche(choix.choice(CARACTERISTIQUES))
+        yield game
+
+
+@pytest.mark.parametrize("n_cartes", [6, 40, SEUIL_PAQUET])
+def test_hash_incremental_egal_au_recalcul(n_cartes):
+    catalogue = catalogue_de(n_cartes)
+    for graine in range(3 if n_cartes < SEUIL_PAQUET else 1):
+        game = partie(catalogue, graine, repetitions_max=10 ** 9)
+        assert isinstance(game.joueurs[0].cartes, Paquet) == (n_cartes >= SEUIL_PAQUET)
+        for game in jouer(game, graine, 300 if n_cartes < SEUIL_PAQUET else 60):
+            assert game._zobrist == game._hash_paquet(0) ^ game._hash_paquet(1)
+
+
+def test_hash_ne_depend_que_de_l_etat():
+    catalogue = catalogue_de(6)
+    hashs = {}
+    for graine in range(20):
+        for game in jouer(partie(catalogue, graine, repetitions_max=10 ** 9), graine, 200):
+            if not game.terminee:
+                assert hashs.setdefault(game.cle_etat(), game.hash_etat()) == game.hash_etat()
+    assert len(set(hashs.values())) == len(hashs)  # aucune collision sur ces états
+
+
+@pytest.mark.parametrize("fenetre", [None, 8])
+def test_repetitions_comptees_sur_la_fenetre(monkeypatch, fenetre):
+    if fenetre is not None:
+        monkeypatch.setattr(moteur, "FENETRE_REPETITIONS", fenetre)
+    catalogue = catalogue_de(6, egalites=True)
+    arrets = 0
+    for graine in range(30):
+        game = partie(catalogue, graine, repetitions_max=3)
+        # référence exacte : compteur des cle_etat() sur la même fenêtre
+        recents = deque([game.cle_etat()])
+        vus = Counter(recents)
+        for game in jouer(game, graine, 10 ** 4):
+            if game.raison_fin == "victoire":
+                break
+            recents.append(game.cle_etat())
+            vus[recents[-1]] += 1
+            if fenetre is not None and len(recents) > fenetre:
+                vus[recents.popleft()] -= 1
+            assert (game.raison_fin == "repetition") == (vus[recents[-1]] >= 3)
+            assert len(game._etats_recents) == len(recents)
+            assert sum(game._etats_vus.values()) == len(recents)
+        arrets += game.raison_fin == "repetition"
+    assert arrets
+
+
+def test_fenetre_max_manches():
+    game = partie(catalogue_de(6), 0, repetitions_max=3, max_manches=50)
+    assert game._fenetre == 50
+    assert partie(catalogue_de(6), 0, repetitions_max=3)._fenetre == moteur.FENETRE_REPETITIONS
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""moteur_vectoriel.py : même loi que le moteur objet (simulate), sur paquets compacts et en tableau."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import moteur_vectoriel
+from catalogue import Catalogue
+from moteur import CARACTERISTIQUES
+from simulation import simulate
+
+PARTIES_OBJET = 1500
+PARTIES_VECTORIEL = 60000
+
+
+def proportions(choix):
+    return choix / choix.sum()
+
+
+@pytest.mark.parametrize("modes", ["AA", "IA", "II"])
+def test_meme_loi_que_le_moteur_objet(modes):
+    objet = simulate(PARTIES_OBJET, *modes, seed=3, processus=1)
+    res = moteur_vectoriel.jouer_parties(PARTIES_VECTORIEL, *modes, seed=3,
+                                         max_manches=10000)
+    # écarts tolérés : environ 5 écarts-types de la différence des deux estimations
+    marge = 5 * np.sqrt(1 / PARTIES_OBJET + 1 / PARTIES_VECTORIEL)
+    for i, cote in enumerate("ab"):
+        assert abs(objet[f"taux_victoire_{cote}"] - (res["gagnant"] == i).mean()) < marge * 0.5
+        choisies = np.array([objet["caracteristiques"][cote][c]["choisie"] for c in CARACTERISTIQUES])
+        # les choix d'une même partie sont corrélés : marge doublée
+        assert np.abs(proportions(choisies) - proportions(res["choix"][i])).max() < marge
+    ecart_type = res["manches"].std()
+    assert abs(objet["manches_moyenne"] - res["manches"].mean()) < marge * ecart_type
+
+
+@pytest.mark.parametrize("max_manches, issue_plafond", [(None, "nul"), (30, "cartes")])
+def test_paquets_compacts_meme_loi_que_le_tableau(monkeypatch, max_manches, issue_plafond):
+    # 7 cartes, valeurs nulles et égalités : médianes nulles et manches perdues par l'actif
+    catalogue = Catalogue.depuis_lignes([(f"espece_{i}", i % 3, (i * 5) % 4, 0) for i in range(7)])
+    options = {"catalogue": catalogue, "max_manches": max_manches, "issue_plafond": issue_plafond}
+    n = 40000
+    compact = moteur_vectoriel.jouer_parties(n, "I", "A", seed=1, **options)
+    monkeypatch.setattr(moteur_vectoriel, "CARTES_COMPACTES", 1)
+    tableau = moteur_vectoriel.jouer_parties(n, "I", "A", seed=2, **options)
+    marge = 5 * np.sqrt(2 / n)
+    for g in (-1, 0, 1):
+        assert abs((compact["gagnant"] == g).mean() - (tableau["gagnant"] == g).mean()) < marge * 0.5
+    for i in range(2):
+        assert np.abs(proportions(compact["choix"][i]) - proportions(tableau["choix"][i])).max() < marge
+    ecart_type = tableau["manches"].std()
+    assert abs(compact["manches"].mean() - tableau["manches"].mean()) < marge * ecart_type
+
+
+@pytest.mark.parametrize("n_cartes", [2, 3, 9, 16, 20])
+def test_resultats_coherents(n_cartes):
+    catalogue = Catalogue.depuis_lignes([(f"espece_{i}", (i * 7) % 11, (i * 5) % 13, i % 17)
+                                         for i in range(n_cartes)])
+    res = moteur_vectoriel.jouer_parties(3000, "I", "I", seed=0, catalogue=catalogue,
+                                         max_manches=50, issue_plafond="cartes")
+    assert res["gagnant"].shape == res["arretee"].shape == res["manches"].shape == (3000,)
+    assert res["choix"].shape == res["gains"].shape == (2, 3)
+    assert (res["manches"] <= 50).all()
+    assert (res["manches"][res["arretee"]] == 50).all()
+    # le robot A joue les manches paires, le robot B les impaires
+    assert res["choix"].sum() == res["manches"].sum()
+    assert res["choix"][0].sum() == ((res["manches"] + 1) // 2).sum()
+    assert (res["gains"] <= res["choix"]).all()
+    assert set(np.unique(res["gagnant"])) <= {-1, 0, 1}
+    assert (res["gagnant"][~res["arretee"]] >= 0).all()
+
+
+def test_aucune_partie():
+    res = moteur_vectoriel.jouer_parties(0, "I", "A", seed=0)
+    assert res["gagnant"].shape == (0,)
+    assert res["choix"].sum() == 0
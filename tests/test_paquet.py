@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Paquet (paquet.py) comparé à une liste Python sur des suites d'opérations aléatoires."""
+
+import random
+
+import pytest
+
+from paquet import TAILLE_BLOC, Paquet
+
+
+def verifier(paquet, liste):
+    assert len(paquet) == len(liste)
+    assert list(paquet) == liste
+    if liste:
+        assert paquet[-1] == liste[-1]
+
+
+@pytest.mark.parametrize("n", [0, 10, 3 * TAILLE_BLOC + 7])
+def test_operations_aleatoires(n):
+    rng = random.Random(n)
+    liste = list(range(n))
+    paquet = Paquet(liste)
+    suivante = n
+    for etape in range(5000):
+        op = rng.random()
+        if op < 0.4 and liste:
+            assert paquet.pop() == liste.pop()
+        elif op < 0.8:
+            i = rng.randint(-len(liste) - 2, len(liste) + 2)
+            paquet.insert(i, suivante)
+            liste.insert(i, suivante)
+            suivante += 1
+        elif op < 0.85:
+            paquet.append(suivante)
+            liste.append(suivante)
+            suivante += 1
+        elif liste:
+            i = rng.randrange(-len(liste), len(liste))
+            assert paquet[i] == liste[i]
+        if etape % 500 == 0:
+            verifier(paquet, liste)
+    verifier(paquet, liste)
+
+
+def test_vider_puis_remplir():
+    # passage par un seul bloc (sans arbre) puis retour à plusieurs blocs
+    liste = list(range(4 * TAILLE_BLOC))
+    paquet = Paquet(liste)
+    while liste:
+        assert paquet.pop() == liste.pop()
+    verifier(paquet, liste)
+    rng = random.Random(1)
+    for carte in range(5 * TAILLE_BLOC):
+        i = rng.randint(0, len(liste))
+        paquet.insert(i, carte)
+        liste.insert(i, carte)
+    verifier(paquet, liste)
+
+
+def test_position_hors_du_paquet():
+    paquet = Paquet(range(3 * TAILLE_BLOC))
+    with pytest.raises(IndexError):
+        paquet[3 * TAILLE_BLOC]
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""MedianeCourante (statistiques.py) comparée à la médiane d'une liste triée."""
+
+import random
+import statistics
+
+import pytest
+
+from statistiques import MedianeCourante
+
+
+@pytest.mark.parametrize("n_valeurs", [1, 2, 7, 300])
+def test_mediane_courante(n_valeurs):
+    rng = random.Random(n_valeurs)
+    possibles = [rng.choice([0.02, 1.5, 10, 97.3, 5000]) * rng.randint(1, 50) for _ in range(n_valeurs)]
+    mediane = MedianeCourante(possibles)
+    ajoutees = []
+    for _ in range(1000):
+        v = rng.choice(possibles)
+        mediane.ajouter(v)
+        ajoutees.append(v)
+        assert len(mediane) == len(ajoutees)
+        assert mediane.valeur == statistics.median(ajoutees)
+
+
+def test_valeurs_triees_partagees():
+    valeurs = [1.0, 2.0, 4.0, 8.0]
+    mediane = MedianeCourante(valeurs, triees=True)
+    assert mediane.valeurs is valeurs
+    for v in (8.0, 1.0, 4.0):
+        mediane.ajouter(v)
+    assert mediane.valeur == 4.0
+    mediane.ajouter(2.0)
+    assert mediane.valeur == 3.0